@@ -0,0 +1,150 @@
+"""
+Local stand-in for the Claude engine, for load tests.
+
+- FakeAnthropicClient: in-process client with the messages.create() subset
+  claude_sentiment_scorer uses (install with set_anthropic_client).
+- FakeClaudeServer: the same behaviour over HTTP as POST /v1/messages, for
+  an API running in another process. Start that process with
+  ANTHROPIC_BASE_URL=<server.url> (needs the anthropic SDK there).
+
+Scores are a deterministic function of the prompt; each call sleeps
+`latency_ms` (+/- jitter) and fails with probability `error_rate`, so the
+circuit breaker and degraded-mode paths see realistic traffic.
+"""
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Optional
+
+
+FAKE_MODEL = "fake-claude"
+
+
+class FakeClaudeError(Exception):
+    pass
+
+
+class FakeClaude:
+    """
+    Shared behaviour: latency, failures and the score for a prompt.
+    """
+
+    def __init__(self, latency_ms: float = 150.0, jitter_ms: float = 50.0,
+                 error_rate: float = 0.0, seed: int = 0) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.calls = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def settings(self) -> dict:
+        return {"latency_ms": self.latency_ms, "jitter_ms": self.jitter_ms, "error_rate": self.error_rate}
+
+    def reply(self, prompt: str) -> str:
+        """
+        Sleep, maybe fail, then return the JSON text the model would send.
+        """
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms))
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        time.sleep(delay / 1000.0)
+        if fail:
+            raise FakeClaudeError("injected failure")
+        score = (zlib.crc32(prompt.encode("utf-8")) % 1001) / 1000.0
+        return json.dumps({"score": score})
+
+
+def _prompt_text(messages) -> str:
+    return "".join(str(m.get("content", "")) for m in messages or ())
+
+
+class FakeAnthropicClient:
+    """
+    client.messages.create(model=..., messages=[...], ...) -> object with
+    .content[0].text, like the SDK.
+    """
+
+    api_key = "fake"
+
+    def __init__(self, fake: Optional[FakeClaude] = None) -> None:
+        self.fake = fake or FakeClaude()
+        self.messages = SimpleNamespace(create=self._create)
+
+    def _create(self, messages=None, timeout: Optional[float] = None, **_) -> SimpleNamespace:
+        text = self.fake.reply(_prompt_text(messages))
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+
+
+class FakeClaudeServer:
+    """
+    Threaded HTTP server answering POST /v1/messages in the Messages API
+    format (500 with an api_error body on injected failures).
+    """
+
+    def __init__(self, fake: Optional[FakeClaude] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.fake = fake or FakeClaude()
+        fake = self.fake
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("content-length") or 0))
+                try:
+                    req = json.loads(body or b"{}")
+                    text = fake.reply(_prompt_text(req.get("messages")))
+                except FakeClaudeError as e:
+                    self._send(500, {"type": "error", "error": {"type": "api_error", "message": str(e)}})
+                    return
+                except ValueError:
+                    self._send(400, {"type": "error", "error": {"type": "invalid_request_error",
+                                                                "message": "invalid JSON"}})
+                    return
+                self._send(200, {
+                    "id": f"msg_fake_{fake.calls}",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": req.get("model", FAKE_MODEL),
+                    "content": [{"type": "text", "text": text}],
+                    "stop_reason": "end_turn",
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": len(body) // 4, "output_tokens": 8},
+                })
+
+            def _send(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeClaudeServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-claude", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
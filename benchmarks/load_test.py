@@ -0,0 +1,597 @@
+"""
+Load test for the API: replays a request mix with N concurrent clients and
+writes throughput, p50/p95/p99 latency and error rate per route as JSON,
+checked against latency SLOs.
+
+Targets (--target)
+    asgi        the app in this process, through httpx's ASGI transport
+    mangum      the Lambda handler in this process (API Gateway HTTP API
+                v2 events, one event loop per worker thread)
+    spawn       start run_api.py on a free port for the duration of the run
+    http://...  an API that is already running
+
+Claude is replaced by a local fake (benchmarks/fake_claude.py) with a
+configurable latency and failure rate: installed in-process for asgi and
+mangum, served over HTTP (ANTHROPIC_BASE_URL) for spawn, or for a server you
+start yourself with --fake-claude-port. --engine naive skips Claude.
+
+Request mix (--mix): JSONL, one request per line,
+
+    {"route": "signal_combined", "method": "GET", "path": "/signal",
+     "params": {"asset": "BTC-USD", "mode": "combined"}, "weight": 2}
+
+("json" for request bodies; route defaults to "METHOD path"). Without
+--mix, a synthetic mix of /signal price_only and combined, /signal/explain
+and /sentiment/score is used (SYNTHETIC_WEIGHTS).
+
+Every distinct request of the mix (except sentiment scoring, see
+WARMUP_SKIP_PATHS) is sent once before measuring; --warmup 0 measures cold
+caches as well.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlencode
+
+import numpy as np
+
+# Make project root importable
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from fake_claude import FakeAnthropicClient, FakeClaude, FakeClaudeServer
+from synthetic import make_headlines
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+DEFAULT_ASSETS = ("BTC-USD", "ETH-USD")
+DEFAULT_INTERVALS = ("1h", "4h", "1d")
+SYNTHETIC_TEXTS = 2_000
+SYNTHETIC_WEIGHTS = {
+    "signal_price_only": 40,
+    "signal_combined": 25,
+    "signal_explain": 15,
+    "sentiment_score": 20,
+}
+# scores are cached per text: warming these up would make every later
+# request a cache hit and hide the engine's latency
+WARMUP_SKIP_PATHS = ("/sentiment/score",)
+REQUEST_TIMEOUT_SECONDS = 60.0
+SPAWN_STARTUP_SECONDS = 60.0
+
+# route -> limits; "*" applies to every route without its own entry.
+# Warm-cache latencies on one core with the default fake Claude (150 ms).
+DEFAULT_SLOS: Dict[str, Dict[str, float]] = {
+    "signal_price_only": {"p95_ms": 250, "p99_ms": 500, "error_rate": 0.01},
+    "signal_combined": {"p95_ms": 500, "p99_ms": 1000, "error_rate": 0.01},
+    "signal_explain": {"p95_ms": 500, "p99_ms": 1000, "error_rate": 0.01},
+    "sentiment_score": {"p95_ms": 400, "p99_ms": 800, "error_rate": 0.01},
+    "*": {"p95_ms": 1000, "error_rate": 0.01},
+}
+
+
+@dataclass
+class ReplayRequest:
+    route: str
+    method: str
+    path: str
+    params: Dict[str, str] = field(default_factory=dict)
+    json: Optional[dict] = None
+    weight: float = 1.0
+
+
+@dataclass
+class Sample:
+    route: str
+    status: int          # 0 = no response (connection error, timeout)
+    seconds: float
+    error: Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.status == 0 or self.status >= 400
+
+
+# ================================================
+#  REQUEST MIX
+# ================================================
+
+def load_mix(path: str) -> List[ReplayRequest]:
+    """
+    Recorded requests from a JSONL file (see the module docstring).
+    """
+    mix = []
+    with open(path) as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+                method = raw.get("method", "GET").upper()
+                mix.append(ReplayRequest(
+                    route=raw.get("route") or f"{method} {raw['path']}",
+                    method=method,
+                    path=raw["path"],
+                    params={k: str(v) for k, v in (raw.get("params") or {}).items()},
+                    json=raw.get("json"),
+                    weight=float(raw.get("weight", 1.0)),
+                ))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{lineno}: not a request line ({e!r})") from None
+    if not mix:
+        raise ValueError(f"No requests in {path}")
+    return mix
+
+
+def synthetic_mix(
+    assets: Sequence[str] = DEFAULT_ASSETS,
+    intervals: Sequence[str] = DEFAULT_INTERVALS,
+    n_texts: int = SYNTHETIC_TEXTS,
+    seed: int = 0,
+) -> List[ReplayRequest]:
+    """
+    SYNTHETIC_WEIGHTS spread evenly over assets x intervals (and texts).
+    """
+    mix = []
+    combos = [(a, i) for a in assets for i in intervals]
+    for route, mode in (("signal_price_only", "price_only"), ("signal_combined", "combined")):
+        for asset, interval in combos:
+            mix.append(ReplayRequest(route, "GET", "/signal",
+                                     params={"asset": asset, "mode": mode, "interval": interval},
+                                     weight=SYNTHETIC_WEIGHTS[route] / len(combos)))
+    for asset, interval in combos:
+        for mode in ("price_only", "combined"):
+            mix.append(ReplayRequest("signal_explain", "POST", "/signal/explain",
+                                     json={"asset": asset, "mode": mode, "interval": interval},
+                                     weight=SYNTHETIC_WEIGHTS["signal_explain"] / (2 * len(combos))))
+    texts = make_headlines(n_texts, assets=assets, seed=seed)
+    for asset, text in zip(texts["asset"], texts["text"]):
+        mix.append(ReplayRequest("sentiment_score", "POST", "/sentiment/score",
+                                 json={"text": text, "asset": asset},
+                                 weight=SYNTHETIC_WEIGHTS["sentiment_score"] / n_texts))
+    return mix
+
+
+# ================================================
+#  TARGETS
+# ================================================
+
+Sender = Callable[[ReplayRequest], Awaitable[int]]
+
+
+def _require_httpx() -> None:
+    if httpx is None:
+        raise ImportError("httpx is required for the asgi and HTTP targets. Run: pip install httpx")
+
+
+def _http_sender(client) -> Sender:
+    async def send(req: ReplayRequest) -> int:
+        resp = await client.request(req.method, req.path, params=req.params or None, json=req.json)
+        await resp.aread()
+        return resp.status_code
+    return send
+
+
+def _apigw_event(req: ReplayRequest) -> dict:
+    """
+    API Gateway HTTP API (payload v2) event for a request.
+    """
+    headers = {"host": "loadtest.local", "user-agent": "intellpulse-load-test"}
+    body = None
+    if req.json is not None:
+        body = json.dumps(req.json)
+        headers["content-type"] = "application/json"
+    now = time.time()
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": req.path,
+        "rawQueryString": urlencode(req.params or {}),
+        "headers": headers,
+        "requestContext": {
+            "accountId": "000000000000",
+            "apiId": "loadtest",
+            "domainName": "loadtest.local",
+            "http": {
+                "method": req.method,
+                "path": req.path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": headers["user-agent"],
+            },
+            "requestId": f"{now:.6f}",
+            "stage": "$default",
+            "time": datetime.now(timezone.utc).strftime("%d/%b/%Y:%H:%M:%S +0000"),
+            "timeEpoch": int(now * 1000),
+        },
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+def _mangum_sender(handler, pool: ThreadPoolExecutor) -> Sender:
+    async def send(req: ReplayRequest) -> int:
+        loop = asyncio.get_running_loop()
+        resp = await loop.run_in_executor(pool, handler, _apigw_event(req), None)
+        return int(resp["statusCode"])
+    return send
+
+
+def _thread_event_loop() -> None:
+    # Mangum runs each event on the calling thread's event loop
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _spawn_api(env: Dict[str, str], workers: int) -> tuple:
+    """
+    Start run_api.py on a free port; returns (process, base URL) once
+    /health answers.
+    """
+    _require_httpx()
+    port = _free_port()
+    env = {
+        **os.environ,
+        **env,
+        "INTELLPULSE_HOST": "127.0.0.1",
+        "INTELLPULSE_PORT": str(port),
+        "INTELLPULSE_WORKERS": str(workers),
+        "INTELLPULSE_RELOAD": "false",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(PROJECT_ROOT, "run_api.py")],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + SPAWN_STARTUP_SECONDS
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"run_api.py exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return proc, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"run_api.py did not answer on {url} within {SPAWN_STARTUP_SECONDS:.0f} s")
+
+
+# ================================================
+#  RUNNER
+# ================================================
+
+async def run_load(
+    send: Sender,
+    mix: Sequence[ReplayRequest],
+    concurrency: int,
+    duration: Optional[float] = None,
+    total: Optional[int] = None,
+    seed: int = 0,
+) -> tuple:
+    """
+    Closed loop: `concurrency` clients each send a request drawn from the
+    mix (by weight) as soon as their previous one returns, until
+    `duration` seconds passed or `total` requests were sent.
+    Returns (samples, elapsed seconds).
+    """
+    if duration is None and total is None:
+        raise ValueError("run_load needs a duration or a request count")
+    rng = random.Random(seed)
+    weights = [r.weight for r in mix]
+    samples: List[Sample] = []
+    sent = 0
+    start = time.perf_counter()
+    stop_at = None if duration is None else start + duration
+
+    async def client() -> None:
+        nonlocal sent
+        while True:
+            if (total is not None and sent >= total) or (stop_at is not None and time.perf_counter() >= stop_at):
+                return
+            sent += 1
+            req = rng.choices(mix, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                status, error = await asyncio.wait_for(send(req), REQUEST_TIMEOUT_SECONDS), None
+            except Exception as e:
+                status, error = 0, repr(e)[:200]
+            samples.append(Sample(req.route, status, time.perf_counter() - t0, error))
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+async def warm_up(send: Sender, mix: Sequence[ReplayRequest], concurrency: int) -> int:
+    """
+    Send every distinct request once (not measured), except those on
+    WARMUP_SKIP_PATHS. Returns the count.
+    """
+    distinct = list({
+        json.dumps([r.method, r.path, r.params, r.json], sort_keys=True): r
+        for r in mix if r.path not in WARMUP_SKIP_PATHS
+    }.values())
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(req: ReplayRequest) -> None:
+        async with sem:
+            try:
+                await asyncio.wait_for(send(req), REQUEST_TIMEOUT_SECONDS)
+            except Exception:
+                pass
+
+    await asyncio.gather(*(one(r) for r in distinct))
+    return len(distinct)
+
+
+def _route_stats(samples: Sequence[Sample], elapsed: float) -> dict:
+    ms = np.array([s.seconds for s in samples]) * 1000.0
+    errors = sum(s.failed for s in samples)
+    statuses: Dict[str, int] = defaultdict(int)
+    for s in samples:
+        statuses[str(s.status)] += 1
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples),
+        "throughput_rps": len(samples) / elapsed if elapsed > 0 else None,
+        "latency_ms": {
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "mean": float(ms.mean()),
+            "max": float(ms.max()),
+        },
+        "status": dict(sorted(statuses.items())),
+        "sample_errors": sorted({s.error for s in samples if s.error})[:5],
+    }
+
+
+def summarize(samples: Sequence[Sample], elapsed: float) -> dict:
+    """
+    Per-route stats plus "all" over every request.
+    """
+    by_route: Dict[str, List[Sample]] = defaultdict(list)
+    for s in samples:
+        by_route[s.route].append(s)
+    out = {"all": _route_stats(samples, elapsed)} if samples else {}
+    out.update({route: _route_stats(rs, elapsed) for route, rs in sorted(by_route.items())})
+    return out
+
+
+def check_slos(routes: dict, slos: Dict[str, Dict[str, float]]) -> List[str]:
+    """
+    Violations of p50_ms / p95_ms / p99_ms / error_rate / min_rps limits.
+    """
+    violations = []
+    for route, stats in routes.items():
+        if route == "all":
+            continue
+        limits = slos.get(route, slos.get("*", {}))
+        for key, limit in limits.items():
+            if key.endswith("_ms"):
+                value = stats["latency_ms"][key[:-3]]
+                bad = value > limit
+            elif key == "error_rate":
+                value = stats["error_rate"]
+                bad = value > limit
+            elif key == "min_rps":
+                value = stats["throughput_rps"] or 0.0
+                bad = value < limit
+            else:
+                raise ValueError(f"Unknown SLO '{key}' for route '{route}'")
+            if bad:
+                violations.append(f"{route}: {key} {value:.4g} (limit {limit:g})")
+    return violations
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+async def _run(args, mix: List[ReplayRequest], fake: Optional[FakeClaude]) -> tuple:
+    """
+    Set up the target, warm up, measure. Returns (samples, elapsed seconds).
+    """
+    target = args.target
+    if target in ("asgi", "mangum"):
+        # in-process: point the app at the repo's data and the fake engine
+        os.environ.setdefault("PRICE_DATA_DIR", os.path.join(PROJECT_ROOT, "data"))
+        os.environ.setdefault("SENTIMENT_CSV_PATH", os.path.join(PROJECT_ROOT, "data", "sentiment_sample.csv"))
+        os.environ["SENTIMENT_ENGINE"] = args.engine
+        from src.features.sentiment_features import set_anthropic_client
+
+        set_anthropic_client(FakeAnthropicClient(fake) if fake else None)
+
+    proc = None
+    pool = None
+    client = None
+    try:
+        if target == "asgi":
+            _require_httpx()
+            from src.api.app import app
+
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            client = httpx.AsyncClient(transport=transport, base_url="http://loadtest.local",
+                                       timeout=REQUEST_TIMEOUT_SECONDS)
+            send = _http_sender(client)
+        elif target == "mangum":
+            from src.api.app import handler
+
+            pool = ThreadPoolExecutor(args.concurrency, thread_name_prefix="lambda",
+                                      initializer=_thread_event_loop)
+            send = _mangum_sender(handler, pool)
+        else:
+            url = target
+            if target == "spawn":
+                env = {"SENTIMENT_ENGINE": args.engine}
+                if fake is not None:
+                    env.update({"ANTHROPIC_BASE_URL": args.fake_claude_url, "ANTHROPIC_API_KEY": "fake"})
+                proc, url = await asyncio.to_thread(_spawn_api, env, args.workers)
+            _require_httpx()
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            client = httpx.AsyncClient(base_url=url, timeout=REQUEST_TIMEOUT_SECONDS, limits=limits)
+            send = _http_sender(client)
+
+        if args.warmup:
+            n = await warm_up(send, mix, args.concurrency)
+            print(f"   Warmed up with {n} distinct requests")
+        samples, elapsed = await run_load(send, mix, args.concurrency, duration=args.duration,
+                                          total=args.requests, seed=args.seed)
+    finally:
+        if client is not None:
+            await client.aclose()
+        if pool is not None:
+            pool.shutdown(wait=False)
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+    return samples, elapsed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a request mix against the API and report latency SLOs.")
+    parser.add_argument("--target", default="asgi",
+                        help="asgi | mangum | spawn | http://HOST:PORT (default: asgi)")
+    parser.add_argument("--mix", default=None, help="recorded requests (JSONL); default: synthetic mix")
+    parser.add_argument("--assets", default=",".join(DEFAULT_ASSETS), help="synthetic mix assets")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to measure")
+    parser.add_argument("--requests", type=int, default=None,
+                        help="stop after this many requests instead of --duration")
+    parser.add_argument("--warmup", type=int, choices=(0, 1), default=1,
+                        help="send every distinct request once before measuring (default 1)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --target spawn")
+    parser.add_argument("--engine", choices=("claude", "naive"), default="claude",
+                        help="sentiment engine; claude uses the local fake")
+    parser.add_argument("--fake-claude-latency-ms", type=float, default=150.0)
+    parser.add_argument("--fake-claude-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--fake-claude-error-rate", type=float, default=0.0)
+    parser.add_argument("--fake-claude-port", type=int, default=None,
+                        help="also serve the fake over HTTP on this port (for a server you start "
+                             "with ANTHROPIC_BASE_URL=http://127.0.0.1:PORT)")
+    parser.add_argument("--slo", default=None, help="SLO JSON ({route: {p95_ms, p99_ms, error_rate, min_rps}})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None,
+                        help="report JSON path (default: benchmarks/results/load_<utc>_<commit>.json)")
+    args = parser.parse_args(argv)
+
+    if args.concurrency <= 0:
+        parser.error("--concurrency must be positive")
+    if args.requests is not None:
+        args.duration = None
+    if not (args.target in ("asgi", "mangum", "spawn") or args.target.startswith(("http://", "https://"))):
+        parser.error(f"unknown target '{args.target}'")
+
+    mix = load_mix(args.mix) if args.mix else synthetic_mix(
+        [a.strip() for a in args.assets.split(",") if a.strip()], seed=args.seed
+    )
+    slos = DEFAULT_SLOS
+    if args.slo:
+        with open(args.slo) as f:
+            slos = json.load(f)
+
+    fake = server = None
+    if args.engine == "claude":
+        fake = FakeClaude(args.fake_claude_latency_ms, args.fake_claude_jitter_ms,
+                          args.fake_claude_error_rate, seed=args.seed)
+        if args.target == "spawn" or args.fake_claude_port is not None:
+            server = FakeClaudeServer(fake, port=args.fake_claude_port or 0).start()
+    args.fake_claude_url = server.url if server else None
+
+    print("\n🔥 Intellpulse load test")
+    print(f"   Target: {args.target}")
+    print(f"   Mix: {args.mix or 'synthetic'} ({len(mix)} requests, {len({r.route for r in mix})} routes)")
+    print(f"   Concurrency: {args.concurrency}")
+    print(f"   {'Requests: ' + str(args.requests) if args.requests else f'Duration: {args.duration:g} s'}")
+    if fake is not None:
+        print(f"   Fake Claude: {fake.latency_ms:g} ms, error rate {fake.error_rate:g}"
+              f"{' at ' + server.url if server else ''}")
+
+    try:
+        samples, elapsed = asyncio.run(_run(args, mix, fake))
+    finally:
+        if server is not None:
+            server.stop()
+
+    routes = summarize(samples, elapsed)
+    violations = check_slos(routes, slos)
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "target": args.target,
+        "workers": args.workers if args.target == "spawn" else None,
+        "mix": args.mix or "synthetic",
+        "concurrency": args.concurrency,
+        "elapsed_s": elapsed,
+        "engine": args.engine,
+        "fake_claude": None if fake is None else {**fake.settings(), "calls": fake.calls, "errors": fake.errors},
+        "routes": routes,
+        "slo": {"targets": slos, "violations": violations, "passed": not violations},
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR,
+        f"load_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{commit}.json",
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print()
+    for route, stats in routes.items():
+        lat = stats["latency_ms"]
+        print(f"{route:20s} {stats['requests']:>7,d} req  {stats['throughput_rps']:8.1f} req/s  "
+              f"p50={lat['p50']:8.1f}  p95={lat['p95']:8.1f}  p99={lat['p99']:8.1f} ms  "
+              f"errors={stats['error_rate']:.2%}")
+    print(f"\n✅ Saved report to {output}")
+    if fake is not None and fake.calls == 0 and "sentiment_score" in routes:
+        print("⚠️  The fake Claude engine got no calls (cached scores only, or the anthropic SDK "
+              "is missing where the API runs): sentiment latencies are for the lexicon fallback")
+
+    if violations:
+        print("\n❌ SLO violations:")
+        for line in violations:
+            print("   " + line)
+        return 1
+    print("All routes within SLO")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
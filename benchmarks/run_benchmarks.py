@@ -0,0 +1,278 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+# Make project root importable
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from synthetic import make_headlines, make_ohlcv, make_signal_panel, make_ticks, write_yahoo_csv
+from src.utils.data_loader import load_price_data
+from src.features.price_features import build_price_feature_set
+from src.models.signal_engine import RULE_SIGNAL_FEATURES, generate_rule_based_signal, generate_combined_signal
+from src.features.sentiment_features import (
+    aggregate_sentiment_to_prices,
+    apply_sentiment_scorer,
+    simple_lexicon_sentiment,
+)
+
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+HEADLINES_PER_BAR = 0.1
+BACKTEST_ASSETS = 1_000
+
+# name -> setup(n_rows, workdir) -> zero-arg callable to time
+BENCHMARKS: Dict[str, Callable[[int, str], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# ================================================
+#  STAGES
+# ================================================
+
+def _price_frame(n: int):
+    return make_ohlcv(n, seed=n)
+
+
+def _headlines(n: int, price):
+    return make_headlines(
+        max(10, int(n * HEADLINES_PER_BAR)),
+        seed=n,
+        start=str(price.index[0]),
+        end=str(price.index[-1]),
+    )
+
+
+@benchmark("load_price_data")
+def bench_load_price_data(n: int, workdir: str):
+    write_yahoo_csv(_price_frame(n), workdir)
+    return lambda: load_price_data(data_dir=workdir, symbol_filter="BTC_USD")
+
+
+@benchmark("build_price_feature_set")
+def bench_build_price_feature_set(n: int, workdir: str):
+    price = _price_frame(n)
+    return lambda: build_price_feature_set(price)
+
+
+@benchmark("rule_signal_features")
+def bench_rule_signal_features(n: int, workdir: str):
+    # only what the rule engine reads: ma_20 and rsi_14 (no ma_10/ma_50/vol_20)
+    price = _price_frame(n)
+    return lambda: build_price_feature_set(price, columns=RULE_SIGNAL_FEATURES)
+
+
+@benchmark("generate_rule_based_signal")
+def bench_generate_rule_based_signal(n: int, workdir: str):
+    feat = build_price_feature_set(_price_frame(n))
+    return lambda: generate_rule_based_signal(feat)
+
+
+@benchmark("generate_combined_signal")
+def bench_generate_combined_signal(n: int, workdir: str):
+    price_sig = generate_rule_based_signal(build_price_feature_set(_price_frame(n)))
+    scored = apply_sentiment_scorer(_headlines(n, price_sig), scorer=simple_lexicon_sentiment)
+    aligned = aggregate_sentiment_to_prices(scored, price_sig)
+    return lambda: generate_combined_signal(price_sig, aligned)
+
+
+@benchmark("apply_sentiment_scorer")
+def bench_apply_sentiment_scorer(n: int, workdir: str):
+    # n headlines, naive engine
+    headlines = make_headlines(n, seed=n)
+    return lambda: apply_sentiment_scorer(headlines, scorer=simple_lexicon_sentiment)
+
+
+@benchmark("aggregate_sentiment_to_prices")
+def bench_aggregate_sentiment_to_prices(n: int, workdir: str):
+    price = _price_frame(n)
+    scored = apply_sentiment_scorer(_headlines(n, price), scorer=simple_lexicon_sentiment)
+    scored = scored.drop_duplicates(subset="timestamp", keep="last")
+    return lambda: aggregate_sentiment_to_prices(scored, price)
+
+
+@benchmark("api_signal")
+def bench_api_signal(n: int, workdir: str):
+    from fastapi.testclient import TestClient
+    from src.api.app import app
+
+    price = _price_frame(n)
+    write_yahoo_csv(price, workdir)
+    sentiment_path = os.path.join(workdir, "sentiment.csv")
+    _headlines(n, price).drop_duplicates(subset="timestamp").to_csv(sentiment_path, index=False)
+
+    os.environ["PRICE_DATA_DIR"] = workdir
+    os.environ["SENTIMENT_CSV_PATH"] = sentiment_path
+    os.environ["SENTIMENT_ENGINE"] = "naive"
+    client = TestClient(app)
+
+    def call():
+        # no-cache: measure the pipeline, not the response memo
+        r = client.get(
+            "/signal",
+            params={"asset": "BTC-USD", "mode": "combined"},
+            headers={"Cache-Control": "no-cache"},
+        )
+        r.raise_for_status()
+        return r
+    return call
+
+
+@benchmark("stream_ticks")
+def bench_stream_ticks(n: int, workdir: str):
+    # n trades replayed from CSV -> 1h bars -> incremental signal (no store writes)
+    from src.ingestion.ticks import BarBuilder, FileReplaySource, IncrementalSignal, TickStream
+
+    path = os.path.join(workdir, "ticks.csv")
+    make_ticks(n, seed=n).to_csv(path, index=False)
+    return lambda: TickStream(FileReplaySource(path), BarBuilder(3600), signals=IncrementalSignal()).run()
+
+
+@benchmark("backtest_portfolio")
+def bench_backtest_portfolio(n: int, workdir: str):
+    # n bars across a 1,000-asset universe (n // 1,000 hourly rows);
+    # 10 years of hourly bars: --sizes 87600000
+    from src.models.backtest import backtest_portfolio
+
+    assets = min(BACKTEST_ASSETS, n)
+    close, signal = make_signal_panel(max(2, n // assets), assets, seed=n)
+    return lambda: backtest_portfolio(close, signal)
+
+
+# ================================================
+#  RUNNER
+# ================================================
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run(names: List[str], sizes: List[int], repeat: int) -> Dict[str, Dict[str, dict]]:
+    results: Dict[str, Dict[str, dict]] = {}
+    for name in names:
+        results[name] = {}
+        for n in sizes:
+            workdir = tempfile.mkdtemp(prefix=f"bench_{name}_")
+            try:
+                fn = BENCHMARKS[name](n, workdir)
+                fn()  # warm-up (imports, caches, page cache)
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    fn()
+                    timings.append(time.perf_counter() - start)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+            best = min(timings)
+            results[name][str(n)] = {
+                "min_s": best,
+                "median_s": statistics.median(timings),
+                "mean_s": statistics.fmean(timings),
+                "rows_per_s": n / best if best > 0 else None,
+                "repeat": repeat,
+            }
+            print(f"{name:32s} n={n:>10,d}  min={best * 1000:10.2f} ms  "
+                  f"median={statistics.median(timings) * 1000:10.2f} ms")
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Names of (benchmark, size) whose min time grew by more than `threshold`.
+    """
+    regressions = []
+    for name, by_size in current["results"].items():
+        for size, stats in by_size.items():
+            base = baseline.get("results", {}).get(name, {}).get(size)
+            if not base:
+                continue
+            ratio = stats["min_s"] / base["min_s"] if base["min_s"] else 1.0
+            if ratio > 1.0 + threshold:
+                regressions.append(
+                    f"{name} n={size}: {base['min_s'] * 1000:.2f} ms -> "
+                    f"{stats['min_s'] * 1000:.2f} ms (x{ratio:.2f})"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every signal pipeline stage.")
+    parser.add_argument("--bench", default=",".join(BENCHMARKS),
+                        help="comma-separated benchmark names")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated row counts, e.g. 1000,100000,10000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None,
+                        help="result JSON path (default: benchmarks/results/<utc>_<commit>.json)")
+    parser.add_argument("--baseline", default=None,
+                        help="earlier result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown vs baseline before failing (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    names = [b.strip() for b in args.bench.split(",") if b.strip()]
+    unknown = [b for b in names if b not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks {unknown}; available: {list(BENCHMARKS)}")
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "results": run(names, sizes, args.repeat),
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR,
+        f"{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_{commit}.json",
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Saved results to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ Regressions vs {baseline.get('commit', args.baseline)}:")
+            for line in regressions:
+                print("   " + line)
+            return 1
+        print(f"No regressions vs {baseline.get('commit', args.baseline)} "
+              f"(threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
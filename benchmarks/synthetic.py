@@ -0,0 +1,128 @@
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+POSITIVE_WORDS = ["surge", "rally", "approval", "growth", "bullish", "strong", "support"]
+NEGATIVE_WORDS = ["crash", "dump", "concern", "fear", "regulation", "selloff", "ban"]
+FILLER_WORDS = ["bitcoin", "ether", "market", "traders", "price", "volume", "exchange", "today"]
+
+
+def make_ohlcv(
+    n_rows: int,
+    seed: int = 0,
+    start: str = "2015-01-01",
+    freq: str = "h",
+    start_price: float = 30_000.0,
+) -> pd.DataFrame:
+    """
+    Geometric random-walk OHLCV bars shaped like load_price_data() output.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=n_rows, freq=freq, name="timestamp")
+
+    log_ret = rng.normal(0.0, 0.004, n_rows)
+    close = start_price * np.exp(np.cumsum(log_ret))
+    open_ = np.concatenate([[start_price], close[:-1]])
+    spread = np.abs(rng.normal(0.0, 0.002, n_rows)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(0, 5_000_000_000, n_rows)
+
+    return pd.DataFrame(
+        {
+            "adj_close": close,
+            "close": close,
+            "high": high,
+            "low": low,
+            "open": open_,
+            "volume": volume,
+        },
+        index=index,
+    )
+
+
+def make_ticks(
+    n_rows: int,
+    seed: int = 0,
+    start: str = "2015-01-01",
+    mean_gap_ms: int = 200,
+    start_price: float = 30_000.0,
+) -> pd.DataFrame:
+    """
+    Time-ordered trades (epoch-ms 'timestamp', 'price', 'qty') as a
+    FileReplaySource CSV holds them.
+    """
+    rng = np.random.default_rng(seed)
+    t0 = pd.Timestamp(start).value // 1_000_000
+    ts = t0 + np.cumsum(rng.integers(0, 2 * mean_gap_ms, n_rows))
+    price = start_price * np.exp(np.cumsum(rng.normal(0.0, 2e-5, n_rows)))
+    qty = rng.exponential(0.05, n_rows)
+    return pd.DataFrame({"timestamp": ts, "price": price, "qty": qty})
+
+
+def make_signal_panel(
+    n_rows: int,
+    n_assets: int,
+    seed: int = 0,
+    start_price: float = 100.0,
+):
+    """
+    (time x asset) float32 random-walk closes and int8 -1/0/+1 signals,
+    generated in place to keep peak memory near the output size.
+    """
+    rng = np.random.default_rng(seed)
+    close = rng.standard_normal((n_rows, n_assets), dtype=np.float32)
+    close *= 0.005
+    np.cumsum(close, axis=0, out=close)
+    np.exp(close, out=close)
+    close *= start_price
+    signal = rng.integers(-1, 2, (n_rows, n_assets), dtype=np.int8)
+    return close, signal
+
+
+def write_yahoo_csv(df: pd.DataFrame, data_dir: str, symbol: str = "BTC_USD") -> str:
+    """
+    Write bars in the 3-header-row yfinance layout load_price_data() expects.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"{symbol}_20250101_000000.csv")
+    ticker = symbol.replace("_", "-")
+    cols = ["adj_close", "close", "high", "low", "open", "volume"]
+    with open(path, "w") as f:
+        f.write("Price," + ",".join(cols) + "\n")
+        f.write("Ticker," + ",".join([ticker] * len(cols)) + "\n")
+        f.write("timestamp,,,,,,\n")
+        df[cols].to_csv(f, header=False, date_format="%Y-%m-%d %H:%M:%S")
+    return path
+
+
+def make_headlines(
+    n_rows: int,
+    assets: Sequence[str] = ("BTC-USD",),
+    seed: int = 0,
+    start: str = "2015-01-01",
+    end: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Random headlines (timestamp, asset, text) mixing lexicon and filler words,
+    spread uniformly between start and end.
+    """
+    rng = np.random.default_rng(seed)
+    t0 = pd.Timestamp(start, tz="UTC")
+    t1 = pd.Timestamp(end, tz="UTC") if end else t0 + pd.Timedelta(days=365)
+    offsets = np.sort(rng.integers(0, int((t1 - t0).total_seconds()), n_rows))
+
+    vocab = np.array(POSITIVE_WORDS + NEGATIVE_WORDS + FILLER_WORDS * 3)
+    words = vocab[rng.integers(0, len(vocab), (n_rows, 6))]
+    text = [" ".join(row) for row in words]
+
+    return pd.DataFrame(
+        {
+            "timestamp": t0 + pd.to_timedelta(offsets, unit="s"),
+            "asset": np.array(assets)[rng.integers(0, len(assets), n_rows)],
+            "text": text,
+        }
+    )
@@ -0,0 +1,44 @@
+import os
+import sys
+
+# Add project root so we can import src.*
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.features.dedup import DEDUP_EXACT, DEDUP_NEAR, group_duplicates
+
+
+# pairs that must share a score
+SAME = [
+    ("Bitcoin surges past $100K - Reuters", "Bitcoin Surges Past $100k | CoinDesk"),
+    ("Bitcoin +5% after ETF news", "bitcoin +5% after ETF news!"),
+]
+# pairs that differ in meaning and must be scored separately
+DIFFERENT = [
+    ("Bitcoin +5% after ETF news", "Bitcoin -5% after ETF news"),
+    ("Ether −3% as fees fall", "Ether +3% as fees fall"),
+    ("SEC approves spot bitcoin ETF", "SEC rejects spot bitcoin ETF"),
+    ("Bitcoin rises after Fed decision", "Bitcoin falls after Fed decision"),
+    ("Rate cut is expected in March", "Rate cut is not expected in March"),
+    ("Crypto Market Update - Bitcoin rallies", "Crypto Market Update - Bitcoin slumps"),
+]
+
+
+def check_pairs() -> None:
+    for mode in (DEDUP_EXACT, DEDUP_NEAR):
+        for a, b in SAME:
+            labels = group_duplicates([a, b], mode=mode).labels
+            assert labels[0] == labels[1], (mode, a, b)
+        for a, b in DIFFERENT:
+            labels = group_duplicates([a, b], mode=mode).labels
+            assert labels[0] != labels[1], (mode, a, b)
+        print(f"{mode:6s} {len(SAME)} duplicate pairs merged, {len(DIFFERENT)} distinct pairs kept apart")
+
+
+def main():
+    check_pairs()
+
+
+if __name__ == "__main__":
+    main()
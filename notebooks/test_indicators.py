@@ -0,0 +1,72 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add project root so we can import src.*
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.features.indicators import compute_indicator_arrays
+
+
+def pandas_reference(close: pd.Series, w: int) -> dict:
+    """
+    The rolling indicators written with plain pandas rolling windows.
+    """
+    ret = np.log(close / close.shift(1))
+    delta = close.diff()
+    gain, loss = delta.clip(lower=0.0), -delta.clip(upper=0.0)  # NaN stays NaN
+    rs = gain.rolling(w).mean() / (loss.rolling(w).mean() + 1e-9)
+    ma = close.rolling(w).mean()
+    std0 = close.rolling(w).std(ddof=0)
+    return {
+        f"ma_{w}": ma,
+        f"vol_{w}": ret.rolling(w).std(),
+        f"rsi_{w}": 100.0 - 100.0 / (1.0 + rs),
+        f"zscore_{w}": (close - ma) / close.rolling(w).std(),
+        f"bb_upper_{w}_2": ma + 2 * std0,
+        f"bb_lower_{w}_2": ma - 2 * std0,
+    }
+
+
+def check_nan_gaps(n: int = 2005, w: int = 20, gaps=(0, 500, 501, 1200)) -> None:
+    rng = np.random.default_rng(0)
+    close = pd.Series(30_000 * np.exp(np.cumsum(rng.normal(0, 0.01, n))))
+    close.iloc[list(gaps)] = np.nan
+
+    ours = compute_indicator_arrays(
+        pd.DataFrame({"close": close}),
+        [f"ma_{w}", f"vol_{w}", f"rsi_{w}", f"zscore_{w}", f"bb_{w}_2"],
+    )
+    for name, ref in pandas_reference(close, w).items():
+        ref = ref.to_numpy()
+        same_nans = np.array_equal(np.isnan(ours[name]), np.isnan(ref))
+        close_values = np.allclose(ours[name], ref, rtol=1e-7, atol=1e-9, equal_nan=True)
+        print(f"{name:16s} valid={np.isfinite(ref).sum():5d}  nan mask {'ok' if same_nans else 'DIFF'}"
+              f"  values {'ok' if close_values else 'DIFF'}")
+        assert same_nans and close_values, name
+
+
+def check_invalid_windows() -> None:
+    df = pd.DataFrame({"close": np.linspace(100, 110, 50)})
+    for name in ("ma_0", "ema_0", "rsi_0", "bb_0_2", "macd_12_0_9", "vol_1", "zscore_1"):
+        try:
+            compute_indicator_arrays(df, [name])
+        except ValueError as e:
+            assert "window" in str(e), e
+        else:
+            raise AssertionError(f"{name} was accepted")
+
+
+def main():
+    check_nan_gaps()
+    print("NaN gaps match pandas rolling")
+    check_invalid_windows()
+    print("invalid windows rejected")
+
+
+if __name__ == "__main__":
+    main()
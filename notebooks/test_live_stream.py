@@ -0,0 +1,79 @@
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+# Make project root importable
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.api import app as api
+
+
+SOURCE_CSV = os.path.join(PROJECT_ROOT, "data", "BTC_USD_20251210_114738.csv")
+SENTIMENT_CSV = os.path.join(PROJECT_ROOT, "data", "sentiment_sample.csv")
+HELD_BACK_BARS = 8
+
+
+async def consume(name: str, queue: asyncio.Queue, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            payload = await asyncio.wait_for(queue.get(), timeout=0.5)
+        except asyncio.TimeoutError:
+            continue
+        print(f"[{name}] {payload}")
+
+
+async def main():
+    # Simulate a data dir where bars are appended to the latest snapshot file
+    data_dir = tempfile.mkdtemp(prefix="intellpulse_live_")
+    live_csv = os.path.join(data_dir, os.path.basename(SOURCE_CSV))
+
+    with open(SOURCE_CSV) as f:
+        lines = f.readlines()
+    with open(live_csv, "w") as f:
+        f.writelines(lines[:-HELD_BACK_BARS])
+
+    os.environ["PRICE_DATA_DIR"] = data_dir
+    os.environ["SENTIMENT_CSV_PATH"] = SENTIMENT_CSV
+
+    # Count recomputes to show they don't scale with subscribers
+    computations = {"n": 0}
+    compute = api.broadcaster._compute
+
+    def counting_compute(asset, mode):
+        computations["n"] += 1
+        return compute(asset, mode)
+
+    api.broadcaster._compute = counting_compute
+    api.broadcaster.poll_interval = 0.1
+
+    keys = {("BTC-USD", "combined")}
+    stop = asyncio.Event()
+    queues = [api.broadcaster.subscribe(keys) for _ in range(3)]
+    consumers = [
+        asyncio.create_task(consume(f"client-{i}", q, stop))
+        for i, q in enumerate(queues)
+    ]
+
+    await asyncio.sleep(1.0)
+    for line in lines[-HELD_BACK_BARS:]:
+        with open(live_csv, "a") as f:
+            f.write(line)
+        print("appended bar:", line.split(",")[0])
+        await asyncio.sleep(0.5)
+
+    stop.set()
+    await asyncio.gather(*consumers)
+    for q in queues:
+        api.broadcaster.unsubscribe(q)
+
+    print(f"\n{len(queues)} subscribers, {HELD_BACK_BARS} appended bars, "
+          f"{computations['n']} recomputations")
+    shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add project root so we can import src.*
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.features.price_features import build_price_feature_set
+from src.models import rule_engine
+from src.models.rule_engine import DEFAULT_RULE_SET, _compile, _parse_condition
+from src.models.signal_engine import generate_rule_based_signal
+
+BACKENDS = {"numpy": False}
+if rule_engine.numexpr is not None:
+    BACKENDS["numexpr"] = True
+
+# keywords and numexpr function names as feature names
+CONDITIONS = [
+    ("return > 0", lambda c: c["return"] > 0),
+    ({"not": "return <= 0.001"}, lambda c: ~(c["return"] <= 0.001)),
+    ({"any": ["close > ma_20", "abs < 0.5"]}, lambda c: (c["close"] > c["ma_20"]) | (c["abs"] < 0.5)),
+    ({"all": ["close >= ma_20", "rsi_14 != 50", "-1 < return"]},
+     lambda c: (c["close"] >= c["ma_20"]) & (c["rsi_14"] != 50) & (-1 < c["return"])),
+]
+
+
+def sample_columns(n: int = 1_000) -> dict:
+    rng = np.random.default_rng(0)
+    cols = {
+        "close": 100 + rng.normal(0, 1, n).cumsum(),
+        "ma_20": 100 + rng.normal(0, 1, n).cumsum(),
+        "rsi_14": rng.uniform(0, 100, n).round(),
+        "return": rng.normal(0, 0.01, n),
+        "abs": rng.uniform(0, 1, n),
+    }
+    for arr in cols.values():
+        arr[rng.choice(n, 20, replace=False)] = np.nan
+    return cols
+
+
+def check_backends() -> None:
+    cols = sample_columns()
+    for spec, reference in CONDITIONS:
+        tree = _parse_condition(spec)
+        with np.errstate(invalid="ignore"):
+            expected = reference(cols)
+        for backend, use_numexpr in BACKENDS.items():
+            got = _compile(tree, use_numexpr=use_numexpr)(cols)
+            assert np.array_equal(np.broadcast_to(got, expected.shape), expected), (backend, spec)
+    print(f"{len(CONDITIONS)} conditions agree on backends: {', '.join(BACKENDS)}")
+
+
+def check_default_rule_set() -> None:
+    """
+    The signal path runs DEFAULT_RULE_SET; it must give the original
+    hard-coded MA/RSI signal.
+    """
+    rng = np.random.default_rng(1)
+    close = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.01, 2_000)))
+    feat = build_price_feature_set(pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1.0},
+        index=pd.date_range("2024-01-01", periods=len(close), freq="h"),
+    ))
+    buy = (feat["close"] > feat["ma_20"]) & (feat["rsi_14"] > 55)
+    sell = (feat["close"] < feat["ma_20"]) & (feat["rsi_14"] < 45)
+    expected = np.where(sell, -1, np.where(buy, 1, 0))
+
+    for backend, use_numexpr in BACKENDS.items():
+        rule_set = rule_engine.CompiledRuleSet(
+            name=backend,
+            buy=_compile(_parse_condition(DEFAULT_RULE_SET["buy"]), use_numexpr=use_numexpr),
+            sell=_compile(_parse_condition(DEFAULT_RULE_SET["sell"]), use_numexpr=use_numexpr),
+            columns=frozenset({"close", "ma_20", "rsi_14"}),
+        )
+        got = generate_rule_based_signal(feat, rule_set=rule_set)["signal"].to_numpy()
+        assert np.array_equal(got, expected), backend
+    assert np.array_equal(generate_rule_based_signal(feat)["signal"].to_numpy(), expected)
+    print("DEFAULT_RULE_SET matches the MA/RSI signal")
+
+
+def main():
+    if "numexpr" not in BACKENDS:
+        print("numexpr not installed: checking the NumPy backend only")
+    check_backends()
+    check_default_rule_set()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,41 @@
 import os
 import sys
+import tempfile
 import uvicorn
 
 def main() -> None:
     host = os.getenv("INTELLPULSE_HOST", "127.0.0.1")
     port = int(os.getenv("INTELLPULSE_PORT", "8000"))
-    reload_ = os.getenv("INTELLPULSE_RELOAD", "true").lower() in ("1", "true", "yes", "y")
+    workers = int(os.getenv("INTELLPULSE_WORKERS", "1"))
+    # uvicorn can't reload with several workers
+    reload_ = workers == 1 and os.getenv("INTELLPULSE_RELOAD", "true").lower() in ("1", "true", "yes", "y")
 
     app_path = os.getenv("INTELLPULSE_APP", "src.api.app:app")
     docs_url = f"http://{host}:{port}/docs"
 
+    if workers > 1 and not os.getenv("INTELLPULSE_SHARED_CACHE_DIR"):
+        # share one copy of the price/feature arrays between workers
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        os.environ["INTELLPULSE_SHARED_CACHE_DIR"] = os.path.join(base, "intellpulse")
+
     print("\n🚀 Starting Intellpulse API")
     print(f"   App: {app_path}")
     print(f"   Host: {host}")
     print(f"   Port: {port}")
+    print(f"   Workers: {workers}")
     print(f"   Reload: {reload_}")
+    if os.getenv("INTELLPULSE_SHARED_CACHE_DIR"):
+        print(f"   Shared cache: {os.environ['INTELLPULSE_SHARED_CACHE_DIR']}")
     print(f"   Docs: {docs_url}\n")
 
+    if workers > 1:
+        # materialize snapshots once here; workers only attach to them
+        from src.api.app import warm_shared_store
+        warmed = warm_shared_store()
+        print(f"   Pre-warmed {len(warmed)} assets\n")
+
     try:
-        uvicorn.run(app_path, host=host, port=port, reload=reload_, log_level="info")
+        uvicorn.run(app_path, host=host, port=port, reload=reload_, workers=workers, log_level="info")
     except Exception as e:
         print(f"❌ Failed to start Uvicorn: {e}", file=sys.stderr)
         raise
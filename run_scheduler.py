@@ -0,0 +1,76 @@
+import argparse
+import logging
+import os
+import sys
+
+from src.ingestion.scheduler import InputWatcher, Scheduler, parse_jobs
+from src.utils.log import get_logger, log_event
+
+
+logger = get_logger("scheduler")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run price ingestion on a schedule and recompute signals when inputs change."
+    )
+    parser.add_argument("--data-dir", default=os.getenv("PRICE_DATA_DIR", "data"))
+    parser.add_argument("--sentiment", default=os.getenv("SENTIMENT_CSV_PATH", "data/sentiment_sample.csv"))
+    parser.add_argument("--results-dir", default=os.getenv("SIGNAL_RESULTS_DIR", "data/signals"),
+                        help="where /signal payloads are published for the API")
+    parser.add_argument("--jobs", default=os.getenv("SCHEDULER_JOBS", ""),
+                        help='ingestion jobs, e.g. "yahoo:BTC-USD=3600,binance:BTCUSDT=300" (empty = watch only)')
+    parser.add_argument("--intervals", default=os.getenv("SCHEDULER_INTERVALS", "1h"),
+                        help="comma-separated signal intervals to precompute")
+    parser.add_argument("--poll", type=float, default=float(os.getenv("SCHEDULER_POLL_SECONDS", "5")))
+    parser.add_argument("--once", action="store_true", help="run a single cycle and exit")
+    args = parser.parse_args()
+
+    # the API module reads its configuration from the environment at import
+    os.environ["PRICE_DATA_DIR"] = args.data_dir
+    os.environ["SENTIMENT_CSV_PATH"] = args.sentiment
+    os.environ["SIGNAL_RESULTS_DIR"] = args.results_dir
+    from src.api.app import publish_signals
+
+    intervals = tuple(i.strip() for i in args.intervals.split(",") if i.strip())
+    watcher = InputWatcher(args.data_dir, args.sentiment)
+
+    def recompute(price_assets, sentiment_assets) -> set:
+        # new prices: every mode; new headlines only: combined mode
+        work = [(a, ("price_only", "combined")) for a in sorted(price_assets)]
+        work += [(a, ("combined",)) for a in sorted(sentiment_assets - price_assets)
+                 if a in watcher.price_assets]
+        failed = set()
+        for asset, modes in work:
+            try:
+                publish_signals([asset], modes=modes, intervals=intervals)
+            except Exception as e:
+                log_event(logger, logging.WARNING, "scheduler.publish_failed", asset=asset, error=repr(e))
+                failed.add(asset)
+        return failed  # retried on the next cycle
+
+    scheduler = Scheduler(
+        watcher,
+        on_change=recompute,
+        jobs=parse_jobs(args.jobs, args.data_dir),
+        poll_seconds=args.poll,
+    )
+
+    print("\n⏱  Starting Intellpulse scheduler")
+    print(f"   Data dir: {args.data_dir}")
+    print(f"   Sentiment: {args.sentiment}")
+    print(f"   Results: {args.results_dir}")
+    print(f"   Jobs: {[f'{j.source}:{j.symbol}/{j.every_seconds:g}s' for j in scheduler.jobs]}")
+    print(f"   Poll: {args.poll:g}s\n")
+
+    if args.once:
+        scheduler.run_once()
+        return
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        print("Stopped.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import logging
+import os
+import sys
+
+import pandas as pd
+
+from src.ingestion.ticks import (
+    DEFAULT_BATCH_SIZE,
+    BarBuilder,
+    IncrementalSignal,
+    PriceCsvSink,
+    TickStream,
+    parse_source,
+)
+from src.utils.data_loader import load_price_data
+from src.utils.log import get_logger, log_event
+
+
+logger = get_logger("stream")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Build OHLCV bars from a trade stream, append them to the price store and update signals."
+    )
+    parser.add_argument("--source", required=True,
+                        help="file:PATH (trades CSV replay) or tcp:HOST:PORT (ts_ms,price,qty lines)")
+    parser.add_argument("--symbol", required=True, help="price store symbol, e.g. BTC_USD")
+    parser.add_argument("--data-dir", default=os.getenv("PRICE_DATA_DIR", "data"))
+    parser.add_argument("--interval", default="1h", help="bar size (pandas timedelta, e.g. 1h, 15min)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--no-store", action="store_true", help="don't write bars to the price store")
+    args = parser.parse_args()
+
+    interval_seconds = pd.Timedelta(args.interval).total_seconds()
+    try:
+        history = load_price_data(data_dir=args.data_dir, symbol_filter=args.symbol)
+    except FileNotFoundError:
+        history = None
+
+    def on_signal(rows: pd.DataFrame) -> None:
+        last = rows.iloc[-1]
+        log_event(logger, logging.INFO, "stream.signal", symbol=args.symbol,
+                  timestamp=str(rows.index[-1]), close=float(last["close"]), signal=int(last["signal"]))
+
+    stream = TickStream(
+        parse_source(args.source, batch_size=args.batch_size),
+        BarBuilder(interval_seconds),
+        sink=None if args.no_store else PriceCsvSink(args.data_dir, args.symbol, history=history),
+        signals=IncrementalSignal(history),
+        on_signal=on_signal,
+    )
+
+    print("\n📈 Starting Intellpulse tick stream")
+    print(f"   Source: {args.source}")
+    print(f"   Symbol: {args.symbol} @ {args.interval}")
+    print(f"   Data dir: {args.data_dir}{' (not written)' if args.no_store else ''}\n")
+
+    try:
+        stats = stream.run()
+    except KeyboardInterrupt:
+        print("Stopped.", file=sys.stderr)
+        return
+    print(f"✅ {stats.ticks} ticks -> {stats.bars} bars, {stats.signals} signals "
+          f"({stats.ticks_per_second:,.0f} ticks/s)")
+    if stream.sink is not None and stream.sink.path:
+        print(f"   Wrote {stream.sink.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,68 @@
 from __future__ import annotations
 from mangum import Mangum
 
+import asyncio
+import json
 import os
-from typing import Literal, Optional
+import re
+from typing import Any, AsyncIterator, Iterable, List, Literal, Optional, Sequence
 
-from fastapi import FastAPI
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
-from src.utils.data_loader import load_price_data
-from src.features.price_features import build_price_feature_set
-from src.models.signal_engine import generate_rule_based_signal, generate_combined_signal
+from src.utils.data_loader import load_price_data, price_data_version
+from src.utils.shared_store import SharedFrameStore
+from src.features.resampling import BASE_INTERVAL, resample_cache
+from src.models.pipeline import SignalComputation, compute_signal, price_signal_frame
+from src.models.panel import scan_universe, universe_assets
 from src.ingestion.sentiment_ingestion import load_sentiment_csv
 from src.features.sentiment_features import (
-    apply_sentiment_scorer,
-    aggregate_sentiment_to_prices,
+    claude_breaker,
     get_sentiment_scorer,
+    score_texts_with_engines,
+    ScoringStats,
 )
+from src.api.streaming import (
+    DuplexStreamingResponse,
+    is_ndjson_content_type,
+    iter_batches,
+    iter_json_array,
+    iter_ndjson,
+)
+from src.api.caching import ResponseMemo, etag_matches, make_etag, wants_fresh
+from src.api.live import SignalBroadcaster
+from src.api.results import SignalResultStore
+from src.api.middleware import TimingMiddleware
+from src.utils.config import get_sentiment_engine
+from src.utils.profiling import render_metrics
+from src.api.serialization import (
+    ARROW_STREAM_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    compress_body,
+    frame_to_arrow_ipc,
+    frame_to_columns,
+    iter_ndjson_rows,
+    pick_content_encoding,
+)
+
+BULK_SCORE_BATCH_SIZE = int(os.getenv("BULK_SCORE_BATCH_SIZE", "64"))
+HISTORY_DEFAULT_LIMIT = 500
+HISTORY_MAX_LIMIT = 5000
+STREAM_POLL_SECONDS = float(os.getenv("SIGNAL_STREAM_POLL_SECONDS", "5"))
+STREAM_KEEPALIVE_SECONDS = 15.0
+# max-age for /signal responses; 0 = clients/CDNs revalidate every time (cheap 304s)
+SIGNAL_CACHE_MAX_AGE = int(os.getenv("SIGNAL_CACHE_MAX_AGE", "0"))
+SIGNAL_MEMO_SIZE = int(os.getenv("SIGNAL_MEMO_SIZE", "256"))
+# When set, price pipelines are materialized once into this directory and
+# mmap'd read-only by every worker (use a tmpfs such as /dev/shm)
+SHARED_CACHE_DIR = os.getenv("INTELLPULSE_SHARED_CACHE_DIR")
+# Where the scheduler daemon (run_scheduler.py) publishes precomputed /signal payloads
+SIGNAL_RESULTS_DIR = os.getenv("SIGNAL_RESULTS_DIR")
+
+Interval = Literal["1h", "2h", "4h", "6h", "12h", "1d"]
 
 app = FastAPI(title="Intellpulse API", version="0.2.0")
 
@@ -27,7 +74,9 @@ app.add_middleware(
     allow_credentials=False,       # must be False when allow_origins=["*"]
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", "X-Profile-Id"],
 )
+app.add_middleware(TimingMiddleware)
 
 
 
@@ -42,21 +91,281 @@ def _signal_to_text(sig: int) -> str:
     return "HOLD"
 
 
-def _load_price_pipeline(asset: str):
-    symbol_filter = asset.replace("-", "_")  # BTC-USD -> BTC_USD
-    price = load_price_data(symbol_filter=symbol_filter)
-    feat = build_price_feature_set(price)
-    price_sig = generate_rule_based_signal(feat)
+def _price_data_dir() -> str:
+    return os.getenv("PRICE_DATA_DIR", "data")
+
+
+def _sentiment_csv_path() -> str:
+    return os.getenv("SENTIMENT_CSV_PATH", "data/sentiment_sample.csv")
+
+
+shared_store = SharedFrameStore(SHARED_CACHE_DIR) if SHARED_CACHE_DIR else None
+
+_SYMBOL_RX = re.compile(r"^[A-Z0-9_]+$")
+
+
+def _asset_symbol(asset: str) -> str:
+    """
+    Price store symbol for a user-supplied asset (BTC-USD -> BTC_USD).
+    Checked before anything touches the filesystem: the symbol names price
+    files and shared-store directories.
+    """
+    symbol = asset.replace("-", "_")
+    if not _SYMBOL_RX.match(symbol):
+        raise HTTPException(status_code=400, detail=f"Invalid asset '{asset}'")
+    if asset not in universe_assets(_price_data_dir()):
+        raise HTTPException(status_code=404, detail=f"No price data for asset '{asset}'")
+    return symbol
+
+
+def _build_price_pipeline(
+    data_dir: str,
+    symbol_filter: str,
+    interval: str,
+    tail: Optional[int] = None,
+):
+    # version read before the data: a file replaced in between only costs a recompute
+    version = price_data_version(data_dir, symbol_filter)
+    price = load_price_data(data_dir=data_dir, symbol_filter=symbol_filter)
+    price = resample_cache.get(os.path.join(data_dir, symbol_filter), price, interval, version=version)
+    return price_signal_frame(price, tail=tail, cache_key=f"{symbol_filter}@{interval}", version=version)
+
+
+def _load_price_pipeline(asset: str, interval: str = BASE_INTERVAL, tail: Optional[int] = None):
+    """
+    Price features + 'signal' for an asset; with `tail`, at least the last
+    `tail` bars (only their warm-up window is featurized). With a shared
+    store the frame is a read-only mapping of the snapshot for the current
+    price file version.
+    """
+    symbol_filter = _asset_symbol(asset)
+    data_dir = _price_data_dir()
+    if shared_store is not None:
+        return shared_store.get(
+            f"{symbol_filter}@{interval}",
+            price_data_version(data_dir, symbol_filter),
+            lambda: _build_price_pipeline(data_dir, symbol_filter, interval),
+        )
+
+    price_sig = _build_price_pipeline(data_dir, symbol_filter, interval, tail)
+    if tail is not None and len(price_sig) < tail:
+        # gaps inside the warm-up window: fall back to the full history
+        price_sig = _build_price_pipeline(data_dir, symbol_filter, interval)
     return price_sig
 
 
-def _load_aligned_sentiment(asset: str, price_df):
-    path = os.getenv("SENTIMENT_CSV_PATH", "data/sentiment_sample.csv")
-    sent_raw = load_sentiment_csv(path, asset_filter=asset)
-    scorer = get_sentiment_scorer()  # naive or claude (env-controlled)
-    sent_scored = apply_sentiment_scorer(sent_raw, scorer=scorer)
-    sent_aligned = aggregate_sentiment_to_prices(sent_scored, price_df)
-    return sent_aligned
+def warm_shared_store(intervals: tuple = (BASE_INTERVAL,)) -> List[str]:
+    """
+    Materialize every asset in the data dir into the shared store (run once
+    in the parent before workers start). Returns the assets warmed.
+    """
+    if shared_store is None:
+        return []
+    assets = universe_assets(_price_data_dir())
+    for asset in assets:
+        for interval in intervals:
+            _load_price_pipeline(asset, interval)
+    return assets
+
+
+def _signal_computation(
+    asset: str,
+    mode: str,
+    interval: str = BASE_INTERVAL,
+    tail: Optional[int] = 1,
+) -> SignalComputation:
+    """
+    Run the pipeline once for an asset. tail=1 (the default) computes just
+    what the latest bar needs; tail=None computes the full history.
+    """
+    price_sig = _load_price_pipeline(asset, interval, tail)
+    sent_raw = None
+    if mode == "combined":
+        sent_raw = load_sentiment_csv(_sentiment_csv_path(), asset_filter=asset)
+    # scorer: naive or claude (env-controlled)
+    return compute_signal(asset, mode, interval, price_sig, sent_raw, get_sentiment_scorer(), tail)
+
+
+def _parse_bound(value: Optional[str], name: str) -> Optional[pd.Timestamp]:
+    """
+    Parse a start/end query value; aware timestamps are converted to naive UTC
+    to match the price index.
+    """
+    if value is None:
+        return None
+    try:
+        ts = pd.Timestamp(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid '{name}' timestamp: {value}")
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts
+
+
+def _input_version(asset: str, mode: str) -> tuple:
+    """
+    Change token for the inputs of a signal: price files, plus the sentiment
+    file in combined mode. Only stats files.
+    """
+    version: tuple = price_data_version(_price_data_dir(), _asset_symbol(asset))
+    if mode == "combined":
+        st = os.stat(_sentiment_csv_path())
+        version += ((_sentiment_csv_path(), st.st_mtime_ns, st.st_size),)
+    return version
+
+
+def _content_version(asset: str, mode: str, interval: str) -> tuple:
+    """
+    Everything a signal/explain response depends on: input file versions,
+    interval, mode and (in combined mode) the configured sentiment engine.
+    """
+    engine = get_sentiment_engine().value if mode == "combined" else None
+    return _input_version(asset, mode), interval, mode, engine
+
+
+def _is_degraded(sentiment_engine: Optional[str]) -> bool:
+    # scores partly from a fallback engine: valid now, but not for this version
+    return sentiment_engine not in (None, get_sentiment_engine().value)
+
+
+def _cache_headers(etag: str) -> dict:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={SIGNAL_CACHE_MAX_AGE}, must-revalidate",
+    }
+
+
+response_memo = ResponseMemo(SIGNAL_MEMO_SIZE)
+result_store = SignalResultStore(SIGNAL_RESULTS_DIR) if SIGNAL_RESULTS_DIR else None
+
+
+def _compute_signal_response(
+    asset: str,
+    mode: str,
+    interval: str = BASE_INTERVAL,
+) -> "SignalResponse":
+    comp = _signal_computation(asset, mode, interval)
+    return SignalResponse(
+        asset=asset,
+        mode=mode,
+        interval=interval,
+        latest_timestamp=comp.latest_timestamp.isoformat(),
+        latest_signal=comp.signal,
+        latest_signal_text=_signal_to_text(comp.signal),
+        # no headline yet at the latest bar -> null rather than NaN
+        latest_sentiment=comp.sentiment,
+        sentiment_engine=comp.sentiment_engine,
+    )
+
+
+def publish_signals(
+    assets: Iterable[str],
+    modes: Sequence[str] = ("price_only", "combined"),
+    intervals: Sequence[str] = (BASE_INTERVAL,),
+) -> int:
+    """
+    Recompute /signal for the given assets and publish the payloads to the
+    result store (called by the scheduler when their inputs change).
+    Degraded results are not published. Returns how many were published.
+    """
+    if result_store is None:
+        raise ValueError("publish_signals needs SIGNAL_RESULTS_DIR")
+    published = 0
+    for asset in assets:
+        for mode in modes:
+            for interval in intervals:
+                version = _content_version(asset, mode, interval)
+                result = _compute_signal_response(asset, mode, interval)
+                if _is_degraded(result.sentiment_engine):
+                    continue
+                result_store.publish(asset, mode, interval, version, result.model_dump())
+                published += 1
+    return published
+
+
+def _stream_change_key(payload: dict) -> tuple:
+    # only a change in the latest signal or sentiment is worth a message
+    return payload["latest_signal"], payload["latest_sentiment"]
+
+
+broadcaster = SignalBroadcaster(
+    compute=lambda asset, mode: _compute_signal_response(asset, mode).model_dump(),
+    version=_input_version,
+    change_key=_stream_change_key,
+    poll_interval=STREAM_POLL_SECONDS,
+)
+
+
+async def _signal_event_stream(keys: set) -> AsyncIterator[str]:
+    """
+    Server-sent events for the subscribed (asset, mode) keys, with a
+    keep-alive comment when nothing changes.
+    """
+    queue = broadcaster.subscribe(keys)
+    try:
+        while True:
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            event = "error" if "error" in payload else "signal"
+            yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+def _bulk_item_text(item: Any) -> Optional[str]:
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict) and isinstance(item.get("text"), str):
+        return item["text"]
+    return None
+
+
+async def _score_bulk_stream(request: Request) -> AsyncIterator[bytes]:
+    """
+    Read items from the request body, score them batch by batch and
+    emit one NDJSON line per item as soon as its batch is done.
+    """
+    if is_ndjson_content_type(request.headers.get("content-type")):
+        items = iter_ndjson(request.stream())
+    else:
+        items = iter_json_array(request.stream())
+
+    scorer = get_sentiment_scorer()
+    stats = ScoringStats()  # one summary for the whole stream
+    index = 0
+
+    try:
+        async for batch in iter_batches(items, BULK_SCORE_BATCH_SIZE):
+            texts = [_bulk_item_text(item) for item in batch]
+            valid = [t for t in texts if t and t.strip()]
+            # the deadline bounds one batch, not the stream: long streams
+            # would otherwise degrade to the lexicon while Claude is healthy
+            stats.reset_deadline()
+            scores, engines = await run_in_threadpool(score_texts_with_engines, valid, scorer, stats)
+            scored = zip(scores, engines)
+
+            lines = []
+            for item, text in zip(batch, texts):
+                row: dict = {"index": index}
+                if isinstance(item, dict) and "id" in item:
+                    row["id"] = item["id"]
+                if text and text.strip():
+                    row["score"], row["engine"] = next(scored)
+                else:
+                    row["error"] = "item must be a non-empty string or an object with a 'text' field"
+                lines.append(json.dumps(row))
+                index += 1
+            yield ("\n".join(lines) + "\n").encode()
+    except ValueError as e:
+        # body errors can only be reported in-band once streaming has started;
+        # iter_batches has flushed the items before the bad one, so `index`
+        # is the failing item's
+        yield (json.dumps({"index": index, "error": str(e)}) + "\n").encode()
+    finally:
+        stats.log()
 
 
 # -------------------------
@@ -75,15 +384,33 @@ class SentimentScoreResponse(BaseModel):
 class SignalResponse(BaseModel):
     asset: str
     mode: str
+    interval: str = BASE_INTERVAL
     latest_timestamp: str
     latest_signal: int
     latest_signal_text: Literal["BUY", "HOLD", "SELL"]
     latest_sentiment: Optional[float] = None
+    # engine(s) that scored the headlines, e.g. "claude+naive" when degraded
+    sentiment_engine: Optional[str] = None
+
+
+class ScanItem(BaseModel):
+    asset: str
+    latest_timestamp: str
+    latest_signal: int
+    latest_signal_text: Literal["BUY", "HOLD", "SELL"]
+    latest_sentiment: Optional[float] = None
+    ranks: dict
+
+
+class ScanResponse(BaseModel):
+    mode: str
+    results: List[ScanItem]
 
 
 class ExplainRequest(BaseModel):
     asset: str = "BTC-USD"
     mode: Literal["price_only", "combined"] = "combined"
+    interval: Interval = BASE_INTERVAL
 
 
 class ExplainResponse(BaseModel):
@@ -95,75 +422,264 @@ class ExplainResponse(BaseModel):
 # -------------------------
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "claude_circuit": claude_breaker.state}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Prometheus-style stage and request latency histograms
+    (populated when INTELLPULSE_METRICS=1).
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
 @app.post("/sentiment/score", response_model=SentimentScoreResponse)
 def sentiment_score(req: SentimentScoreRequest):
-    scorer = get_sentiment_scorer()
-    score = float(scorer(req.text))
-    score = max(0.0, min(1.0, score))
-    return SentimentScoreResponse(score=score, engine=os.getenv("SENTIMENT_ENGINE", "naive"))
+    scores, engines = score_texts_with_engines([req.text], get_sentiment_scorer())
+    return SentimentScoreResponse(score=scores[0], engine=engines[0])
+
+
+@app.post("/sentiment/score/bulk")
+async def sentiment_score_bulk(request: Request):
+    """
+    Score many texts in one call.
+
+    Body: a JSON array, or NDJSON when Content-Type is application/x-ndjson.
+    Items are strings or objects with a 'text' field (and optional 'id').
+    Response: NDJSON, one {"index", "id"?, "score", "engine"} line per item,
+    streamed back in input order as each batch finishes.
+    """
+    return DuplexStreamingResponse(
+        _score_bulk_stream(request),
+        media_type="application/x-ndjson",
+    )
 
 
 @app.get("/signal", response_model=SignalResponse)
 def get_signal(
+    request: Request,
+    response: Response,
     asset: str = "BTC-USD",
     mode: Literal["price_only", "combined"] = "combined",
+    interval: Interval = BASE_INTERVAL,
 ):
-    price_sig = _load_price_pipeline(asset)
-
-    latest_ts = price_sig.index[-1]
-    latest_signal = int(price_sig["signal"].iloc[-1])
-    latest_sentiment: Optional[float] = None
-
-    if mode == "combined":
-        sent_aligned = _load_aligned_sentiment(asset, price_sig)
-        combined = generate_combined_signal(price_sig, sent_aligned)
-        latest_signal = int(combined["signal_combined"].iloc[-1])
-        latest_sentiment = float(combined["sentiment_score"].iloc[-1])
-
-    return SignalResponse(
-        asset=asset,
+    """
+    Latest signal. Sends ETag/Cache-Control derived from the input versions;
+    If-None-Match answers 304 without running the pipeline, and results are
+    memoized per version ('Cache-Control: no-cache' forces a recompute).
+    With SIGNAL_RESULTS_DIR, payloads the scheduler published for the
+    current version are served without computing.
+    """
+    version = _content_version(asset, mode, interval)
+    etag = make_etag("signal", asset, version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=_cache_headers(etag))
+
+    key = ("signal", asset, version)
+    fresh = wants_fresh(request.headers.get("cache-control"))
+    result = None if fresh else response_memo.get(key)
+    if result is None and result_store is not None and not fresh:
+        payload = result_store.load(asset, mode, interval, version)
+        if payload is not None:
+            result = SignalResponse(**payload)
+            response_memo.put(key, result)
+    if result is None:
+        result = _compute_signal_response(asset, mode, interval)
+        if _is_degraded(result.sentiment_engine):
+            response.headers["Cache-Control"] = "no-store"
+            return result
+        # inputs changed while computing -> result belongs to a newer version
+        if _content_version(asset, mode, interval) == version:
+            response_memo.put(key, result)
+
+    response.headers.update(_cache_headers(etag))
+    return result
+
+
+@app.get("/signal/scan", response_model=ScanResponse)
+def scan_signals(
+    assets: Optional[str] = None,
+    mode: Literal["price_only", "combined"] = "combined",
+):
+    """
+    Latest signal for many assets (comma-separated, default: every asset in
+    the data dir) computed as one (time x asset) panel, with cross-sectional
+    percentile ranks of return, RSI and volatility.
+    """
+    names = [a.strip() for a in assets.split(",") if a.strip()] if assets else universe_assets(_price_data_dir())
+    if not names:
+        raise HTTPException(status_code=400, detail="No assets given")
+    for name in names:
+        _asset_symbol(name)
+
+    result = scan_universe(
+        names,
         mode=mode,
-        latest_timestamp=latest_ts.isoformat(),
-        latest_signal=latest_signal,
-        latest_signal_text=_signal_to_text(latest_signal),
-        latest_sentiment=latest_sentiment,
+        data_dir=_price_data_dir(),
+        sentiment_path=_sentiment_csv_path(),
+    )
+    signal_col = "signal_combined" if mode == "combined" else "signal"
+
+    items = []
+    for asset, row in result.latest().iterrows():
+        sig = int(row[signal_col])
+        sentiment = row.get("sentiment_score")
+        ranks = {
+            name[len("rank_"):]: None if pd.isna(value) else float(value)
+            for name, value in row.items()
+            if name.startswith("rank_")
+        }
+        items.append(ScanItem(
+            asset=asset,
+            latest_timestamp=row["timestamp"].isoformat(),
+            latest_signal=sig,
+            latest_signal_text=_signal_to_text(sig),
+            latest_sentiment=None if sentiment is None or pd.isna(sentiment) else float(sentiment),
+            ranks=ranks,
+        ))
+    return ScanResponse(mode=mode, results=items)
+
+
+@app.get("/signal/stream")
+async def stream_signals(
+    assets: str = "BTC-USD",
+    mode: Literal["price_only", "combined"] = "combined",
+):
+    """
+    Server-sent events with the /signal payload for each comma-separated
+    asset. A 'signal' event is sent on subscribe and then only when the
+    latest signal or sentiment changes; one shared recompute loop runs per
+    asset regardless of how many clients are subscribed.
+    """
+    keys = {(a.strip(), mode) for a in assets.split(",") if a.strip()}
+    if not keys:
+        raise HTTPException(status_code=400, detail="No assets given")
+    for asset, _ in keys:
+        _asset_symbol(asset)
+    return StreamingResponse(
+        _signal_event_stream(keys),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
-@app.post("/signal/explain", response_model=ExplainResponse)
-def explain_signal(req: ExplainRequest):
-    # Pull the same “latest” values used by /signal
-    price_sig = _load_price_pipeline(req.asset)
-    latest_ts = price_sig.index[-1]
-    price_signal = int(price_sig["signal"].iloc[-1])
-
+@app.get("/signal/history")
+def get_signal_history(
+    request: Request,
+    asset: str = "BTC-USD",
+    mode: Literal["price_only", "combined"] = "combined",
+    interval: Interval = BASE_INTERVAL,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(HISTORY_DEFAULT_LIMIT, ge=1, le=HISTORY_MAX_LIMIT),
+    format: Literal["json", "ndjson", "arrow"] = "json",
+):
+    """
+    Signal, feature and sentiment series for an asset, optionally limited to
+    [start, end] and a comma-separated list of columns, paginated by offset/limit.
+
+    format=json   -> {"asset", "mode", "total", "offset", "limit", "next_offset",
+                      "columns": {"timestamp": [...], "<col>": [...]}}
+    format=ndjson -> one object per bar
+    format=arrow  -> Arrow IPC stream (requires pyarrow)
+
+    JSON and NDJSON bodies are gzip/brotli compressed per Accept-Encoding.
+    Pagination is also reported in X-Total-Count / X-Next-Offset headers.
+    """
+    frame = _signal_computation(asset, mode, interval, tail=None).frame
+
+    start_ts = _parse_bound(start, "start")
+    end_ts = _parse_bound(end, "end")
+    if start_ts is not None or end_ts is not None:
+        frame = frame.loc[start_ts:end_ts]
+
+    if columns:
+        wanted = [c.strip() for c in columns.split(",") if c.strip()]
+        missing = [c for c in wanted if c not in frame.columns]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Unknown columns: {missing}")
+        frame = frame[wanted]
+
+    total = len(frame)
+    page = frame.iloc[offset:offset + limit]
+    next_offset = offset + limit if offset + limit < total else None
+
+    headers = {"X-Total-Count": str(total)}
+    if next_offset is not None:
+        headers["X-Next-Offset"] = str(next_offset)
+
+    if format == "arrow":
+        try:
+            body = frame_to_arrow_ipc(page)
+        except ImportError as e:
+            raise HTTPException(status_code=406, detail=str(e))
+        return Response(content=body, media_type=ARROW_STREAM_MEDIA_TYPE, headers=headers)
+
+    if format == "ndjson":
+        body = b"".join(iter_ndjson_rows(page))
+        media_type = NDJSON_MEDIA_TYPE
+    else:
+        body = json.dumps({
+            "asset": asset,
+            "mode": mode,
+            "interval": interval,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "next_offset": next_offset,
+            "columns": frame_to_columns(page),
+        }).encode()
+        media_type = "application/json"
+
+    encoding = pick_content_encoding(request.headers.get("accept-encoding"))
+    headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=compress_body(body, encoding), media_type=media_type, headers=headers)
+
+
+def _compute_explain_response(comp: SignalComputation) -> ExplainResponse:
+    # Same “latest” values as /signal
     explanation_parts = [
-        f"Asset: {req.asset}",
-        f"Timestamp (latest bar): {latest_ts.isoformat()}",
-        f"Price-model signal: {_signal_to_text(price_signal)} ({price_signal})",
+        f"Asset: {comp.asset}",
+        f"Interval: {comp.interval}",
+        f"Timestamp (latest bar): {comp.latest_timestamp.isoformat()}",
+        f"Price-model signal: {_signal_to_text(comp.price_signal)} ({comp.price_signal})",
     ]
 
-    if req.mode == "combined":
-        sent_aligned = _load_aligned_sentiment(req.asset, price_sig)
-        combined = generate_combined_signal(price_sig, sent_aligned)
-        combined_signal = int(combined["signal_combined"].iloc[-1])
-        sentiment = float(combined["sentiment_score"].iloc[-1])
-
+    if comp.mode == "combined":
+        sentiment = "n/a" if comp.sentiment is None else f"{comp.sentiment:.2f}"
         explanation_parts += [
-            f"Sentiment score (aligned): {sentiment:.2f} (0..1)",
-            f"Combined signal: {_signal_to_text(combined_signal)} ({combined_signal})",
+            f"Sentiment score (aligned): {sentiment} (0..1)",
+            f"Combined signal: {_signal_to_text(comp.signal)} ({comp.signal})",
             "Logic: combined signal adjusts the price-model signal using recent sentiment strength.",
         ]
     else:
         explanation_parts += [
             "Mode: price_only",
             "Logic: signal is derived strictly from price features (no sentiment adjustment).",
-        ] 
+        ]
 
     return ExplainResponse(explanation="\n".join(explanation_parts))
 
+
+@app.post("/signal/explain", response_model=ExplainResponse)
+def explain_signal(req: ExplainRequest):
+    version = _content_version(req.asset, req.mode, req.interval)
+    key = ("explain", req.asset, version)
+    result = response_memo.get(key)
+    if result is None:
+        comp = _signal_computation(req.asset, req.mode, req.interval)
+        result = _compute_explain_response(comp)
+        if _is_degraded(comp.sentiment_engine):
+            return result
+        if _content_version(req.asset, req.mode, req.interval) == version:
+            response_memo.put(key, result)
+    return result
+
+
 handler = Mangum(app)
 
@@ -0,0 +1,117 @@
+import asyncio
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+
+StreamKey = Tuple[str, str]  # (asset, mode)
+
+
+class SignalBroadcaster:
+    """
+    Fan-out of live signal updates.
+
+    One background loop runs per (asset, mode) that has at least one
+    subscriber. Each tick it asks `version(asset, mode)` for a cheap input
+    token (file mtimes etc.) and only when that changes runs
+    `compute(asset, mode)` in the threadpool. A message is published only when
+    the value returned by `change_key(payload)` differs from the last one, so
+    the cost per update is one computation regardless of subscriber count.
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[str, str], Dict[str, Any]],
+        version: Callable[[str, str], Hashable],
+        change_key: Callable[[Dict[str, Any]], Hashable],
+        poll_interval: float = 5.0,
+        queue_size: int = 16,
+    ) -> None:
+        self._compute = compute
+        self._version = version
+        self._change_key = change_key
+        self.poll_interval = poll_interval
+        self._queue_size = queue_size
+
+        self._subscribers: Dict[StreamKey, Set[asyncio.Queue]] = {}
+        self._tasks: Dict[StreamKey, asyncio.Task] = {}
+        self._latest: Dict[StreamKey, Dict[str, Any]] = {}
+
+    # -------------------------
+    # Subscription
+    # -------------------------
+    def subscribe(self, keys: Set[StreamKey]) -> asyncio.Queue:
+        """
+        Register a queue for the given keys and start any missing loops.
+        The last known payload for each key is delivered immediately.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        for key in keys:
+            self._subscribers.setdefault(key, set()).add(queue)
+            if key in self._latest:
+                self._offer(queue, self._latest[key])
+            if key not in self._tasks:
+                self._tasks[key] = asyncio.create_task(self._run(key))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """
+        Drop a queue; loops with no remaining subscribers are cancelled.
+        """
+        for key in list(self._subscribers):
+            subs = self._subscribers[key]
+            subs.discard(queue)
+            if not subs:
+                del self._subscribers[key]
+                task = self._tasks.pop(key, None)
+                if task is not None:
+                    task.cancel()
+                self._latest.pop(key, None)
+
+    def subscriber_count(self, key: StreamKey) -> int:
+        return len(self._subscribers.get(key, ()))
+
+    # -------------------------
+    # Background loop
+    # -------------------------
+    async def _run(self, key: StreamKey) -> None:
+        asset, mode = key
+        last_version: Optional[Hashable] = None
+        last_change: Optional[Hashable] = None
+        last_error: Optional[str] = None
+
+        while True:
+            try:
+                version = await run_in_threadpool(self._version, asset, mode)
+                if version != last_version:
+                    payload = await run_in_threadpool(self._compute, asset, mode)
+                    last_version = version
+                    last_error = None
+                    change = self._change_key(payload)
+                    if change != last_change:
+                        last_change = change
+                        self._publish(key, payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # keep the loop alive; retry on next tick, report each new error once
+                if repr(e) != last_error:
+                    last_error = repr(e)
+                    self._publish(key, {"asset": asset, "mode": mode, "error": last_error})
+            await asyncio.sleep(self.poll_interval)
+
+    def _publish(self, key: StreamKey, payload: Dict[str, Any]) -> None:
+        if "error" not in payload:
+            self._latest[key] = payload
+        for queue in self._subscribers.get(key, ()):
+            self._offer(queue, payload)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, payload: Dict[str, Any]) -> None:
+        # slow consumer: drop the oldest message rather than block the loop
+        if queue.full():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(payload)
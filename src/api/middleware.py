@@ -0,0 +1,66 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.profiling import (
+    INSTRUMENTATION_ACTIVE,
+    METRICS_ENABLED,
+    PROFILE_HEADER,
+    PROFILING_ENABLED,
+    SERVER_TIMING_ENABLED,
+    RequestTimings,
+    current_timings,
+    dump_profile,
+    registry,
+)
+
+
+UNMATCHED_ROUTE = "unmatched"  # histogram label for requests no route matched
+
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware: request latency histogram, Server-Timing header
+    and opt-in per-request profiling. A no-op pass-through when every
+    instrumentation flag is off.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not INSTRUMENTATION_ACTIVE:
+            await self.app(scope, receive, send)
+            return
+
+        profile = PROFILING_ENABLED and any(
+            k == PROFILE_HEADER.encode() and v not in (b"", b"0")
+            for k, v in scope.get("headers", [])
+        )
+        req = RequestTimings(profile=profile)
+        token = current_timings.set(req)
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                if SERVER_TIMING_ENABLED:
+                    total = (time.perf_counter() - start) * 1000
+                    value = req.server_timing()
+                    value = f"{value}, total;dur={total:.2f}" if value else f"total;dur={total:.2f}"
+                    headers.append((b"server-timing", value.encode()))
+                if req.profiler is not None:
+                    headers.append((b"x-profile-id", dump_profile(req.profiler).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_timings.reset(token)
+            if METRICS_ENABLED or SERVER_TIMING_ENABLED:
+                # route templates only: raw paths of unmatched requests would
+                # let clients create a new series per URL
+                route = scope.get("route")
+                path = getattr(route, "path", None) or UNMATCHED_ROUTE
+                registry.observe("intellpulse_request_seconds", "route", path, time.perf_counter() - start)
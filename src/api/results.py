@@ -0,0 +1,40 @@
+import json
+import os
+import uuid
+from typing import Hashable, Optional
+
+from src.utils.shared_store import version_tag
+
+
+class SignalResultStore:
+    """
+    Precomputed /signal payloads published by the scheduler daemon, one
+    JSON file per (asset, mode, interval) tagged with the input version
+    they were computed from. The API serves a payload only while that
+    version is still current.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, asset: str, mode: str, interval: str) -> str:
+        return os.path.join(self.root, asset, f"{mode}_{interval}.json")
+
+    def publish(self, asset: str, mode: str, interval: str, version: Hashable, payload: dict) -> None:
+        path = self._path(asset, mode, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": version_tag(version), "payload": payload}, f)
+        os.replace(tmp, path)  # readers see the old or the new file, never half of one
+
+    def load(self, asset: str, mode: str, interval: str, version: Hashable) -> Optional[dict]:
+        try:
+            with open(self._path(asset, mode, interval)) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if entry.get("version") != version_tag(version):
+            return None
+        return entry["payload"]
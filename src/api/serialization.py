@@ -0,0 +1,140 @@
+import gzip
+import io
+import json
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+# ================================================
+#  COLUMN EXTRACTION
+# ================================================
+
+def _timestamps_iso(index: pd.Index) -> List[str]:
+    """
+    ISO-8601 strings for a DatetimeIndex, formatted in one vectorized call.
+    """
+    values = pd.DatetimeIndex(index).tz_localize(None).values
+    return np.datetime_as_string(values, unit="s").tolist()
+
+
+def _column_values(series: pd.Series) -> list:
+    """
+    Plain Python list for a numeric column, with NaN mapped to None.
+    """
+    arr = series.to_numpy()
+    if arr.dtype.kind == "f":
+        mask = np.isnan(arr)
+        if mask.any():
+            out = arr.astype(object)
+            out[mask] = None
+            return out.tolist()
+    return arr.tolist()
+
+
+def frame_to_columns(df: pd.DataFrame) -> Dict[str, list]:
+    """
+    Columnar dict: {"timestamp": [...], "<col>": [...], ...}.
+
+    Much cheaper than DataFrame.to_json(orient="records") for large frames:
+    one tolist() per column instead of one dict per row.
+    """
+    columns: Dict[str, list] = {"timestamp": _timestamps_iso(df.index)}
+    for col in df.columns:
+        columns[col] = _column_values(df[col])
+    return columns
+
+
+# ================================================
+#  ENCODINGS
+# ================================================
+
+def iter_ndjson_rows(df: pd.DataFrame, chunk_rows: int = 1000) -> Iterator[bytes]:
+    """
+    Yield NDJSON lines (one object per bar) in chunks of `chunk_rows`.
+    """
+    for start in range(0, len(df), chunk_rows):
+        cols = frame_to_columns(df.iloc[start:start + chunk_rows])
+        names = list(cols)
+        lines = [json.dumps(dict(zip(names, row))) for row in zip(*cols.values())]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def frame_to_arrow_ipc(df: pd.DataFrame) -> bytes:
+    """
+    Serialize a frame (index as 'timestamp') to an Arrow IPC stream.
+    """
+    if pa is None:
+        raise ImportError("pyarrow not installed. Run: pip install pyarrow")
+
+    arrays = [pa.array(pd.DatetimeIndex(df.index).tz_localize(None).values)]
+    names = ["timestamp"]
+    for col in df.columns:
+        arrays.append(pa.array(df[col].to_numpy()))
+        names.append(col)
+    batch = pa.RecordBatch.from_arrays(arrays, names=names)
+
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue()
+
+
+# ================================================
+#  COMPRESSION
+# ================================================
+
+def _q_value(params: List[str]) -> float:
+    """
+    q parameter of one Accept-Encoding entry (1 if absent, 0 if malformed).
+    """
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value.strip())
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def pick_content_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Choose 'br' or 'gzip' from an Accept-Encoding header (br only if available).
+    Entries with q=0 (in any spelling: 'q=0.0', '; q=0') are refusals.
+    """
+    if not accept_encoding:
+        return None
+    offered = set()
+    for part in accept_encoding.split(","):
+        coding, *params = part.split(";")
+        if _q_value(params) > 0:
+            offered.add(coding.strip().lower())
+    if "br" in offered and brotli is not None:
+        return "br"
+    if "gzip" in offered:
+        return "gzip"
+    return None
+
+
+def compress_body(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=5)
+    return body
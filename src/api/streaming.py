@@ -0,0 +1,146 @@
+import codecs
+import json
+from typing import Any, AsyncIterator, List
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def is_ndjson_content_type(content_type: str | None) -> bool:
+    """
+    True if the Content-Type header announces newline-delimited JSON.
+    """
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in NDJSON_MEDIA_TYPES
+
+
+async def _iter_text(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Decode a byte stream as UTF-8 without splitting multi-byte characters.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _decode_line(line: str, lineno: int) -> Any:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Malformed JSON on line {lineno} of request body: {e.msg}") from None
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """
+    Yield one decoded JSON value per non-blank line of an NDJSON byte stream.
+    Only the current partial line is buffered. A malformed line raises
+    ValueError naming its (1-based) line number.
+    """
+    buf = ""
+    lineno = 0
+    async for text in _iter_text(chunks):
+        buf += text
+        *lines, buf = buf.split("\n")
+        for line in lines:
+            lineno += 1
+            if line.strip():
+                yield _decode_line(line, lineno)
+    if buf.strip():
+        yield _decode_line(buf, lineno + 1)
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """
+    Yield the elements of a top-level JSON array as they arrive.
+    Only the element currently being received is buffered.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    opened = False
+    closed = False
+    stream = _iter_text(chunks).__aiter__()
+    exhausted = False
+
+    while not closed:
+        # skip whitespace / separators in what we already have
+        while pos < len(buf) and (buf[pos].isspace() or (opened and buf[pos] == ",")):
+            pos += 1
+
+        if pos < len(buf):
+            if not opened:
+                if buf[pos] != "[":
+                    raise ValueError("Request body must be a JSON array or NDJSON stream")
+                opened = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                closed = True
+                continue
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise ValueError("Malformed JSON array in request body")
+                value, end = None, None
+            # a value ending exactly at the buffer edge may still be incomplete
+            if end is not None and (end < len(buf) or exhausted):
+                yield value
+                buf, pos = buf[end:], 0
+                continue
+
+        if exhausted:
+            raise ValueError("Unterminated JSON array in request body")
+        try:
+            buf = buf[pos:] + await stream.__anext__()
+            pos = 0
+        except StopAsyncIteration:
+            exhausted = True
+
+
+async def iter_batches(items: AsyncIterator[Any], size: int) -> AsyncIterator[List[Any]]:
+    """
+    Group an async iterator into lists of at most `size` items.
+
+    If the source fails with ValueError (a malformed body), the items read
+    before it are yielded as a last batch and the error is raised after.
+    """
+    batch: List[Any] = []
+    try:
+        async for item in items:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    except ValueError:
+        if batch:
+            yield batch
+        raise
+    if batch:
+        yield batch
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator is allowed to keep reading the
+    request body while the response is being sent.
+
+    The stock StreamingResponse (ASGI spec < 2.4) consumes `receive` to watch
+    for disconnects, which would swallow request body chunks. Here the body
+    iterator owns `receive`; a client disconnect surfaces from request.stream().
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
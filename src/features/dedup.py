@@ -0,0 +1,308 @@
+"""
+Duplicate and near-duplicate grouping of headlines before scoring.
+
+News feeds repeat one story across outlets with trivial edits ("Bitcoin
+surges past $100K - Reuters" / "Bitcoin Surges Past $100k | CoinDesk").
+group_duplicates() assigns every text a group so that only one
+representative per group has to be scored:
+
+    exact   texts equal after normalize_text() (case, punctuation, URLs and
+            a trailing " - Reuters" / " | CoinDesk" outlet tag removed; only
+            outlets in SOURCE_TAGS are stripped; the sign of a number is
+            kept, so "+5%" and "-5%" differ)
+    near    additionally, texts whose character 4-gram Jaccard similarity
+            with a group's representative is >= threshold and that use the
+            same negation and direction words (POLARITY_WORDS) and signed
+            numbers: "SEC approves ETF" and "SEC rejects ETF" are close in
+            4-grams but never merged.
+            Opt-in: near duplicates share one score, so a miss is a wrong score.
+
+Near duplicates are found with MinHash signatures and an LSH index
+(bands x rows of the signature); LSH candidates are confirmed with the
+exact Jaccard similarity of their 4-gram sets, and texts are compared with
+group representatives only, so groups don't drift through chains of
+slightly different texts.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+DEDUP_OFF = "off"
+DEDUP_EXACT = "exact"
+DEDUP_NEAR = "near"
+DEDUP_MODES = (DEDUP_OFF, DEDUP_EXACT, DEDUP_NEAR)
+
+NEAR_DUP_THRESHOLD = 0.8
+NUM_PERM = 120
+# 20 bands x 6 rows: a pair at Jaccard 0.8 becomes a candidate with p = 0.998,
+# at 0.5 with p = 0.27 and at 0.3 with p = 0.015
+LSH_BANDS = 20
+# candidates are checked exactly in order of signature agreement (a Jaccard
+# estimate), skipping those estimated this far below the threshold, and at
+# most MAX_EXACT_CHECKS of them per text
+ESTIMATE_SLACK = 0.1
+MAX_EXACT_CHECKS = 4
+# a band value shared by this many groups carries little signal (templated
+# text): stop indexing more groups under it, the other bands still match
+MAX_BUCKET_SIZE = 32
+
+SHINGLE = 4
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# outlet names stripped from a trailing " - Outlet" / " | Outlet" tag, in
+# normalized form (see normalize_text); anything else after a dash is part
+# of the headline
+SOURCE_TAGS = frozenset({
+    "reuters", "bloomberg", "coindesk", "cointelegraph", "the block", "decrypt",
+    "cnbc", "cnn", "bbc", "bbc news", "forbes", "fortune", "yahoo finance",
+    "marketwatch", "barrons", "wsj", "the wall street journal", "financial times",
+    "ft", "associated press", "ap", "afp", "business insider", "investing com",
+    "benzinga", "seeking alpha", "the motley fool", "bitcoin magazine",
+    "crypto news", "cryptoslate", "u today", "dl news", "axios", "techcrunch",
+    "the guardian", "the economist", "fox business", "nasdaq", "fxstreet",
+})
+MAX_SOURCE_TAG_TOKENS = 3
+
+# near duplicates must agree on these: differing negation or direction
+# words flip the meaning while barely changing the 4-grams
+NEGATION_WORDS = frozenset({
+    "not", "no", "never", "none", "without", "cannot", "cant", "isnt", "arent",
+    "wasnt", "werent", "wont", "dont", "doesnt", "didnt", "hasnt", "havent",
+    "fails", "failed", "denies", "denied", "unlikely",
+})
+DIRECTION_WORDS = frozenset({
+    "up", "down", "rise", "rises", "rising", "rose", "fall", "falls", "falling", "fell",
+    "gain", "gains", "gained", "loss", "losses", "lose", "loses", "lost",
+    "rally", "rallies", "rallied", "surge", "surges", "surged", "soar", "soars", "soared",
+    "jump", "jumps", "jumped", "climb", "climbs", "climbed", "drop", "drops", "dropped",
+    "slump", "slumps", "slumped", "plunge", "plunges", "plunged", "crash", "crashes",
+    "crashed", "tumble", "tumbles", "tumbled", "sink", "sinks", "sank", "dump", "dumps",
+    "higher", "lower", "high", "low", "above", "below", "over", "under",
+    "bull", "bullish", "bear", "bearish", "buy", "buys", "sell", "sells", "selloff",
+    "inflow", "inflows", "outflow", "outflows", "beat", "beats", "miss", "misses",
+    "approve", "approves", "approved", "approval", "reject", "rejects", "rejected",
+    "rejection", "ban", "bans", "banned", "lift", "lifts", "lifted",
+    "upgrade", "upgrades", "upgraded", "downgrade", "downgrades", "downgraded",
+    "increase", "increases", "increased", "decrease", "decreases", "decreased",
+    "cut", "cuts", "hike", "hikes", "hiked", "strong", "stronger", "weak", "weaker",
+    "positive", "negative", "record", "win", "wins", "won",
+})
+POLARITY_WORDS = NEGATION_WORDS | DIRECTION_WORDS
+
+_URL_RX = re.compile(r"https?://\S+|www\.\S+")
+_SOURCE_TAG_RX = re.compile(r"\s+[-|–—]\s+([^-|–—]+)$")
+# words, and numbers with their sign when it leads the token ("+5%", "-$3",
+# "−2.1" but not the dash in "5-10")
+_TOKEN_RX = re.compile(r"(?<![\w.])[+\-\u2212](?=\$?\d)[\w$%]+|[\w$%]+")
+
+
+def _words(text: str) -> str:
+    tokens = _TOKEN_RX.findall(text.lower().replace("'", ""))
+    return " ".join(tokens).replace("\u2212", "-")
+
+
+def _is_source_tag(tag: str) -> bool:
+    name = _words(tag)
+    return len(name.split()) <= MAX_SOURCE_TAG_TOKENS and name in SOURCE_TAGS
+
+
+def normalize_text(text) -> str:
+    """
+    Canonical form used for grouping (never for scoring).
+    """
+    if not isinstance(text, str):
+        return ""
+    text = unicodedata.normalize("NFKC", text)
+    text = _URL_RX.sub(" ", text).strip()
+    m = _SOURCE_TAG_RX.search(text)
+    if m and _is_source_tag(m.group(1)):
+        text = text[:m.start()]
+    return _words(text)
+
+
+def polarity_key(normalized: str) -> frozenset:
+    """
+    Negation and direction words and signed numbers of a normalized text
+    (see POLARITY_WORDS).
+    """
+    return frozenset(w for w in normalized.split() if w in POLARITY_WORDS or w[0] in "+-")
+
+
+@dataclass
+class DuplicateGroups:
+    """
+    labels[i] is the group of text i; representatives[g] is the index of
+    the first text of group g (the one that gets scored).
+    """
+
+    labels: np.ndarray
+    representatives: List[int]
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+
+    @property
+    def rows(self) -> int:
+        return len(self.labels)
+
+    @property
+    def groups(self) -> int:
+        return len(self.representatives)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """
+        Share of rows that reuse another row's score.
+        """
+        return 1.0 - self.groups / self.rows if self.rows else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "rows": self.rows,
+            "groups": self.groups,
+            "exact_duplicates": self.exact_duplicates,
+            "near_duplicates": self.near_duplicates,
+            "dedup_ratio": round(self.dedup_ratio, 4),
+        }
+
+
+# ================================================
+#  MINHASH
+# ================================================
+
+def _shingle_sets(texts: Sequence[str]) -> List[np.ndarray]:
+    """
+    Sorted unique character 4-grams per text, each packed into a uint32
+    (exact ids on the UTF-8 bytes, no hashing). Texts shorter than a
+    shingle are one shingle of their padded bytes.
+    """
+    out = []
+    for text in texts:
+        raw = text.encode("utf-8")
+        if len(raw) < SHINGLE:
+            raw = raw.ljust(SHINGLE, b" ")
+        b = np.frombuffer(raw, dtype=np.uint8).astype(np.uint32)
+        grams = (b[:-3] << 24) | (b[1:-2] << 16) | (b[2:-1] << 8) | b[3:]
+        out.append(np.unique(grams))
+    return out
+
+
+def minhash_signatures(shingles: Sequence[np.ndarray], num_perm: int = NUM_PERM, seed: int = 1) -> np.ndarray:
+    """
+    (len(shingles) x num_perm) MinHash signatures with universal hashes
+    (a * x + b) mod 2**61 - 1, computed for all texts at once.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)
+    b = rng.integers(0, 1 << 31, num_perm, dtype=np.uint64)
+
+    lengths = np.fromiter((len(s) for s in shingles), dtype=np.int64, count=len(shingles))
+    flat = np.concatenate(shingles).astype(np.uint64)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    sig = np.empty((len(shingles), num_perm), dtype=np.uint64)
+    for k in range(num_perm):
+        # a, x < 2**32 so a * x + b fits in uint64
+        h = (a[k] * flat + b[k]) % np.uint64(_MERSENNE_PRIME)
+        sig[:, k] = np.minimum.reduceat(h, starts)
+    return sig
+
+
+def _jaccard(x: np.ndarray, y: np.ndarray) -> float:
+    inter = len(np.intersect1d(x, y, assume_unique=True))
+    return inter / (len(x) + len(y) - inter)
+
+
+# ================================================
+#  GROUPING
+# ================================================
+
+def group_duplicates(
+    texts: Sequence,
+    mode: str = DEDUP_EXACT,
+    threshold: float = NEAR_DUP_THRESHOLD,
+    num_perm: int = NUM_PERM,
+    bands: int = LSH_BANDS,
+) -> DuplicateGroups:
+    """
+    Group texts for scoring; see the module docstring for the modes.
+    Groups are numbered in order of first appearance.
+    """
+    if mode not in DEDUP_MODES:
+        raise ValueError(f"Unknown dedup mode '{mode}'. Use one of {list(DEDUP_MODES)}")
+    if num_perm % bands:
+        raise ValueError("num_perm must be a multiple of bands")
+
+    n = len(texts)
+    if mode == DEDUP_OFF:
+        return DuplicateGroups(np.arange(n), list(range(n)))
+
+    # exact: one slot per distinct normalized text
+    slot_of: Dict[str, int] = {}
+    first_row: List[int] = []
+    keys: List[str] = []
+    row_slot = np.empty(n, dtype=np.int64)
+    for i, text in enumerate(texts):
+        key = normalize_text(text)
+        slot = slot_of.get(key)
+        if slot is None:
+            slot = slot_of[key] = len(keys)
+            keys.append(key)
+            first_row.append(i)
+        row_slot[i] = slot
+    exact_duplicates = n - len(keys)
+
+    # near: map slots onto representative slots via MinHash LSH
+    slot_group = np.arange(len(keys))
+    if mode == DEDUP_NEAR and len(keys) > 1:
+        shingles = _shingle_sets(keys)
+        polarity = [polarity_key(k) for k in keys]
+        sig = minhash_signatures(shingles, num_perm=num_perm)
+        rows_per_band = num_perm // bands
+        buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        reps = np.empty(len(keys), dtype=np.int64)  # group -> its representative slot
+        n_reps = 0
+
+        for s in range(len(keys)):
+            band_keys = [sig[s, j * rows_per_band:(j + 1) * rows_per_band].tobytes() for j in range(bands)]
+            candidates = set()
+            for j, bk in enumerate(band_keys):
+                candidates.update(buckets[j].get(bk, ()))
+
+            match = -1
+            if candidates:
+                cand = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+                cand_slots = reps[cand]
+                estimate = (sig[cand_slots] == sig[s]).mean(axis=1)
+                for k in np.argsort(-estimate)[:MAX_EXACT_CHECKS]:
+                    if estimate[k] < threshold - ESTIMATE_SLACK:
+                        break
+                    if polarity[cand_slots[k]] != polarity[s]:
+                        continue
+                    if _jaccard(shingles[s], shingles[cand_slots[k]]) >= threshold:
+                        match = int(cand[k])
+                        break
+
+            if match >= 0:
+                slot_group[s] = match
+                continue
+            slot_group[s] = n_reps
+            reps[n_reps] = s
+            n_reps += 1
+            for j, bk in enumerate(band_keys):
+                bucket = buckets[j].setdefault(bk, [])
+                if len(bucket) < MAX_BUCKET_SIZE:
+                    bucket.append(slot_group[s])
+        representatives = [first_row[s] for s in reps[:n_reps]]
+    else:
+        representatives = first_row
+
+    return DuplicateGroups(
+        labels=slot_group[row_slot],
+        representatives=representatives,
+        exact_duplicates=exact_duplicates,
+        near_duplicates=len(keys) - len(representatives),
+    )
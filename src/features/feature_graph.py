@@ -0,0 +1,312 @@
+"""
+Memoized feature DAG with column-level dependencies.
+
+Every feature is a FeatureNode that names its input columns and its
+window (bars of its inputs one output value reads). compute_features()
+resolves the requested columns to their transitive dependencies and
+computes only those, so a consumer that reads ma_20 and rsi_14 never
+pays for ma_50 or vol_20:
+
+    close -> return -> vol_<w>
+    close -> delta -> gain, loss -> rsi_<w>
+    close -> ma_<w>
+
+Parametric names (ma_<w>, vol_<w>, rsi_<w>) are built on demand; any
+other name src.features.indicators understands (ema_12, atr_14,
+bb_upper_20_2, ...) becomes a node over the raw price columns.
+
+Intermediates are memoized per (cache key, input version, frame shape):
+pass the same key/version (e.g. 'BTC_USD@1h' and the price file version)
+and later requests - for other columns, or other modes of the same asset
+- reuse every node already computed for that data. Node arithmetic is
+the same pandas/numpy as src.features.price_features, so values are
+identical to the add_* helpers.
+"""
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.features.indicators import (
+    check_indicator,
+    compute_indicator_arrays,
+    indicator_for_column,
+    indicator_outputs,
+    is_indicator,
+)
+from src.utils.log import get_logger, log_event
+
+
+logger = get_logger("features")
+
+STANDARD_FEATURES = ("return", "ma_10", "ma_20", "ma_50", "vol_20", "rsi_14")
+FEATURE_CACHE_SIZE = 64  # (key, version, frame) entries
+
+
+@dataclass(frozen=True)
+class FeatureNode:
+    """
+    name = fn(*inputs). window: bars of the inputs one value reads
+    (1 = pointwise, None = unbounded, e.g. recursive averages).
+    """
+
+    name: str
+    inputs: Tuple[str, ...]
+    window: Optional[int]
+    fn: Callable[..., np.ndarray]
+
+
+# ================================================
+#  NODE FUNCTIONS (same arithmetic as price_features)
+# ================================================
+
+def _log_return(close: np.ndarray) -> np.ndarray:
+    s = pd.Series(close)
+    return np.log(s / s.shift(1)).to_numpy()
+
+
+def _delta(close: np.ndarray) -> np.ndarray:
+    return pd.Series(close).diff().to_numpy()
+
+
+def _gain(delta: np.ndarray) -> np.ndarray:
+    d = pd.Series(delta)
+    return d.where(d > 0.0, 0.0).to_numpy()
+
+
+def _loss(delta: np.ndarray) -> np.ndarray:
+    d = pd.Series(delta)
+    return (-d.where(d < 0.0, 0.0)).to_numpy()
+
+
+def _rolling_mean(w: int) -> Callable[[np.ndarray], np.ndarray]:
+    return lambda x: pd.Series(x).rolling(window=w).mean().to_numpy()
+
+
+def _rolling_std(w: int) -> Callable[[np.ndarray], np.ndarray]:
+    return lambda x: pd.Series(x).rolling(window=w).std().to_numpy()
+
+
+def _rsi(w: int) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+    def fn(gain: np.ndarray, loss: np.ndarray) -> np.ndarray:
+        avg_gain = pd.Series(gain).rolling(window=w, min_periods=w).mean()
+        avg_loss = pd.Series(loss).rolling(window=w, min_periods=w).mean()
+        rs = avg_gain / (avg_loss + 1e-9)
+        return (100.0 - (100.0 / (1.0 + rs))).to_numpy()
+    return fn
+
+
+def _window_family(
+    inputs: Tuple[str, ...],
+    make_fn: Callable[[int], Callable[..., np.ndarray]],
+) -> Callable[["re.Match[str]"], FeatureNode]:
+    def factory(m: "re.Match[str]") -> FeatureNode:
+        check_indicator(m[0])  # same window rules as the indicator engine
+        w = int(m[1])
+        return FeatureNode(m[0], inputs, w, make_fn(w))
+    return factory
+
+
+def _indicator_node(column: str) -> Optional[FeatureNode]:
+    indicator = indicator_for_column(column)
+    if not is_indicator(indicator) or column not in indicator_outputs(indicator):
+        return None
+    check_indicator(indicator)
+    inputs = ("close", "high", "low") if indicator.startswith("atr_") else ("close",)
+
+    def fn(*arrays: np.ndarray) -> np.ndarray:
+        frame = pd.DataFrame(dict(zip(inputs, arrays)), copy=False)
+        return compute_indicator_arrays(frame, [indicator])[column]
+    return FeatureNode(column, inputs, None, fn)
+
+
+# ================================================
+#  GRAPH
+# ================================================
+
+class FeatureGraph:
+    """
+    Registry of feature nodes: fixed ones (add) and parametric families
+    (add_family: regex -> node factory). Names that resolve to no node are
+    base columns of the input frame.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: Dict[str, FeatureNode] = {}
+        self._families: List[Tuple["re.Pattern[str]", Callable[["re.Match[str]"], FeatureNode]]] = []
+        self._lock = threading.Lock()
+
+    def add(self, node: FeatureNode) -> None:
+        self._nodes[node.name] = node
+
+    def add_family(self, pattern: str, factory: Callable[["re.Match[str]"], FeatureNode]) -> None:
+        self._families.append((re.compile(pattern), factory))
+
+    def node(self, name: str) -> Optional[FeatureNode]:
+        node = self._nodes.get(name)
+        if node is not None:
+            return node
+        for pattern, factory in self._families:
+            m = pattern.match(name)
+            if m:
+                node = factory(m)
+                break
+        else:
+            node = _indicator_node(name)
+        if node is not None:
+            with self._lock:
+                self._nodes[name] = node
+        return node
+
+    def plan(self, outputs: Iterable[str]) -> List[str]:
+        """
+        Derived nodes needed for `outputs`, dependencies first.
+        """
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Feature graph cycle at '{name}'")
+            node = self.node(name)
+            if node is None:
+                state[name] = 2
+                return
+            state[name] = 1
+            for dep in node.inputs:
+                visit(dep)
+            state[name] = 2
+            order.append(name)
+
+        for name in outputs:
+            visit(name)
+        return order
+
+    def lookback(self, name: str) -> Optional[int]:
+        """
+        Bars of base data one value of `name` depends on (None = unbounded).
+        """
+        node = self.node(name)
+        if node is None:
+            return 1
+        if node.window is None:
+            return None
+        deps = [self.lookback(dep) for dep in node.inputs]
+        if any(d is None for d in deps):
+            return None
+        return node.window - 1 + max(deps, default=1)
+
+    def warmup_bars(self, outputs: Iterable[str]) -> Optional[int]:
+        """
+        History needed before every output is defined (None = unbounded).
+        """
+        bars = [self.lookback(name) for name in outputs]
+        if any(b is None for b in bars):
+            return None
+        return max(bars, default=1)
+
+
+def _default_graph() -> FeatureGraph:
+    g = FeatureGraph()
+    g.add(FeatureNode("return", ("close",), 2, _log_return))
+    g.add(FeatureNode("delta", ("close",), 2, _delta))
+    g.add(FeatureNode("gain", ("delta",), 1, _gain))
+    g.add(FeatureNode("loss", ("delta",), 1, _loss))
+    g.add_family(r"^ma_(\d+)$", _window_family(("close",), _rolling_mean))
+    g.add_family(r"^vol_(\d+)$", _window_family(("return",), _rolling_std))
+    g.add_family(r"^rsi_(\d+)$", _window_family(("gain", "loss"), _rsi))
+    return g
+
+
+feature_graph = _default_graph()
+
+
+# ================================================
+#  MEMO
+# ================================================
+
+class FeatureCache:
+    """
+    LRU of computed node arrays per (key, version, frame guard). The guard
+    (length, first and last index) keeps differently sliced frames of the
+    same data (full history vs. a tail window) apart. Arrays are read-only.
+    """
+
+    def __init__(self, maxsize: int = FEATURE_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Dict[str, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def entry(self, key: Hashable) -> Dict[str, np.ndarray]:
+        with self._lock:
+            memo = self._entries.get(key)
+            if memo is None:
+                memo = self._entries[key] = {}
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            return memo
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+feature_cache = FeatureCache()
+
+
+def _frame_guard(df: pd.DataFrame) -> tuple:
+    if df.empty:
+        return (0,)
+    return (len(df), df.index[0], df.index[-1])
+
+
+def compute_features(
+    df: pd.DataFrame,
+    outputs: Sequence[str],
+    cache_key: Optional[Hashable] = None,
+    version: Optional[Hashable] = None,
+    graph: FeatureGraph = feature_graph,
+    cache: FeatureCache = feature_cache,
+) -> Dict[str, np.ndarray]:
+    """
+    Arrays for `outputs` (aligned with df), computing only their
+    dependencies. With cache_key, nodes are memoized under
+    (cache_key, version, frame guard) and reused by later calls.
+    """
+    plan = graph.plan(outputs)
+    for name in outputs:
+        if name not in plan and name not in df.columns:
+            raise ValueError(f"Unknown feature or missing column '{name}'")
+
+    memo = {} if cache_key is None else cache.entry((cache_key, version, _frame_guard(df)))
+
+    def value(name: str) -> np.ndarray:
+        if name in memo:
+            return memo[name]
+        if name not in df.columns:
+            raise ValueError(f"Required column '{name}' not found in DataFrame")
+        return df[name].to_numpy()
+
+    computed = []
+    for name in plan:
+        if name in memo:
+            continue
+        node = graph.node(name)
+        arr = np.asarray(node.fn(*[value(dep) for dep in node.inputs]))
+        arr.flags.writeable = False
+        memo[name] = arr
+        computed.append(name)
+
+    log_event(logger, logging.DEBUG, "features.computed",
+              key=None if cache_key is None else str(cache_key),
+              requested=list(outputs), computed=computed, reused=len(plan) - len(computed))
+    return {name: value(name) for name in outputs}
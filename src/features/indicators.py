@@ -0,0 +1,436 @@
+"""
+Fused technical indicator engine.
+
+compute_indicators() takes a list of indicator names and computes them in a
+single pass over contiguous NumPy arrays pulled out of the frame once.
+Building blocks (log returns, true range, gains/losses and their prefix
+sums) are computed at most once per call and shared by every window, so
+asking for ma_5 ... ma_200 costs one cumulative sum plus one subtraction
+per window. The result is assembled into a DataFrame once, at the end.
+
+Supported names (w, fast, slow, sig are integers, k a float):
+    return              log return of close
+    ma_<w>              simple moving average of close
+    ema_<w>             exponential moving average of close (SMA-seeded)
+    vol_<w>             rolling std (ddof=1) of log returns
+    rsi_<w>             RSI with simple rolling means (same as compute_rsi
+                        on gap-free data)
+    rsi_wilder_<w>      RSI with Wilder smoothing
+    atr_<w>             average true range with Wilder smoothing (needs high/low)
+    zscore_<w>          (close - ma_w) / rolling std (ddof=1) of close
+    bb_<w>_<k>          Bollinger bands -> bb_upper_<w>_<k>, bb_lower_<w>_<k>,
+                        bb_width_<w>_<k> (population std, mid band is ma_<w>)
+    macd_<fast>_<slow>_<sig>
+                        -> macd_..., macd_signal_..., macd_hist_...
+
+Windows must be >= 1, and >= 2 for the sample (ddof=1) statistics vol and
+zscore; other values are rejected when the name is parsed.
+
+Missing closes (NaN) follow pandas rolling: a rolling value (ma, vol, rsi,
+zscore, bb) is NaN exactly when its window reads a missing close, and
+valid again once the gap has left the window. Prefix sums are taken over
+NaN-zeroed values next to a prefix count of missing closes, so a gap
+never leaks into later windows.
+"""
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+RSI_EPS = 1e-9  # same guard as compute_rsi
+
+
+# ================================================
+#  ARRAY PRIMITIVES
+# ================================================
+
+def _prefix_sum(x: np.ndarray) -> np.ndarray:
+    """
+    Prefix sums with a leading 0 so that sum(x[i:j]) == c[j] - c[i].
+    NaNs count as 0 (windows over them are masked with _gap_mask).
+    """
+    c = np.empty(len(x) + 1, dtype=np.float64)
+    c[0] = 0.0
+    np.cumsum(np.nan_to_num(x, nan=0.0), out=c[1:])
+    return c
+
+
+def _window_sum(c: np.ndarray, w: int, start: int = 0, gaps: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Rolling sum of window `w` from prefix sums `c`; NaN until `start + w - 1`
+    and wherever `gaps` (see _gap_mask) is True.
+    """
+    n = len(c) - 1
+    out = np.full(n, np.nan)
+    first = start + w - 1
+    if first < n:
+        out[first:] = c[first + 1:] - c[first + 1 - w:n + 1 - w]
+    if gaps is not None:
+        out[gaps] = np.nan
+    return out
+
+
+def _gap_mask(missing_prefix: np.ndarray, span: int) -> np.ndarray:
+    """
+    True at row j if any of the closes j - span + 1 .. j (clipped at 0) is
+    missing, from the prefix count of missing closes.
+    """
+    n = len(missing_prefix) - 1
+    lo = np.maximum(np.arange(1, n + 1) - span, 0)
+    return missing_prefix[1:] - missing_prefix[lo] > 0
+
+
+def _seeded_ewm(x: np.ndarray, alpha: float, w: int, start: int = 0) -> np.ndarray:
+    """
+    Recursive average y[t] = alpha * x[t] + (1 - alpha) * y[t-1], seeded with
+    the mean of the first `w` valid values (x[start:start+w]).
+
+    The recursion runs in pandas' compiled ewm kernel on the raw array.
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    seed_at = start + w - 1
+    if seed_at >= n:
+        return out
+    seq = x[seed_at:].astype(np.float64, copy=True)
+    seq[0] = x[start:start + w].mean()
+    out[seed_at:] = pd.Series(seq).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+
+# ================================================
+#  WORKSPACE (shared intermediates for one call)
+# ================================================
+
+class _Workspace:
+    """
+    Lazily computed, shared intermediates for one compute_indicators call.
+    """
+
+    def __init__(self, df: pd.DataFrame, price_col: str) -> None:
+        self._df = df
+        self.price_col = price_col
+        self.n = len(df)
+        self._cache: Dict[str, np.ndarray] = {}
+        self._close_shift: Optional[float] = None
+
+    def _get(self, key: str, build: Callable[[], np.ndarray]) -> np.ndarray:
+        arr = self._cache.get(key)
+        if arr is None:
+            arr = build()
+            self._cache[key] = arr
+        return arr
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._df.columns:
+            raise ValueError(f"Required column '{name}' not found in DataFrame")
+        return self._get(
+            f"col:{name}",
+            lambda: np.ascontiguousarray(self._df[name].to_numpy(dtype=np.float64)),
+        )
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.column(self.price_col)
+
+    @property
+    def close_shift(self) -> float:
+        # shift before summing squares to limit cancellation on large prices
+        if self._close_shift is None:
+            valid = self.close[~np.isnan(self.close)]
+            self._close_shift = float(valid[0]) if len(valid) else 0.0
+        return self._close_shift
+
+    @property
+    def missing_prefix(self) -> np.ndarray:
+        return self._get("missing_prefix", lambda: _prefix_sum(np.isnan(self.close)))
+
+    def gaps(self, span: int) -> Optional[np.ndarray]:
+        """
+        _gap_mask over `span` closes, or None when no close is missing.
+        """
+        if self.missing_prefix[-1] == 0:
+            return None
+        return self._get(f"gaps:{span}", lambda: _gap_mask(self.missing_prefix, span))
+
+    @property
+    def close_prefix(self) -> np.ndarray:
+        return self._get("close_prefix", lambda: _prefix_sum(self.close - self.close_shift))
+
+    @property
+    def close_sq_prefix(self) -> np.ndarray:
+        return self._get("close_sq_prefix", lambda: _prefix_sum((self.close - self.close_shift) ** 2))
+
+    @property
+    def delta(self) -> np.ndarray:
+        def build():
+            d = np.empty(self.n)
+            d[:1] = np.nan
+            d[1:] = np.diff(self.close)
+            return d
+        return self._get("delta", build)
+
+    @property
+    def log_return(self) -> np.ndarray:
+        def build():
+            r = np.empty(self.n)
+            r[:1] = np.nan
+            r[1:] = np.log(self.close[1:] / self.close[:-1])
+            return r
+        return self._get("log_return", build)
+
+    @property
+    def return_prefix(self) -> np.ndarray:
+        return self._get("return_prefix", lambda: _prefix_sum(self.log_return))
+
+    @property
+    def return_sq_prefix(self) -> np.ndarray:
+        return self._get("return_sq_prefix", lambda: _prefix_sum(self.log_return ** 2))
+
+    @property
+    def gain(self) -> np.ndarray:
+        # first element is 0 (not NaN), matching compute_rsi's where()
+        return self._get("gain", lambda: np.where(self.delta > 0.0, self.delta, 0.0))
+
+    @property
+    def loss(self) -> np.ndarray:
+        return self._get("loss", lambda: np.where(self.delta < 0.0, -self.delta, 0.0))
+
+    @property
+    def gain_prefix(self) -> np.ndarray:
+        return self._get("gain_prefix", lambda: _prefix_sum(self.gain))
+
+    @property
+    def loss_prefix(self) -> np.ndarray:
+        return self._get("loss_prefix", lambda: _prefix_sum(self.loss))
+
+    @property
+    def true_range(self) -> np.ndarray:
+        def build():
+            high, low, close = self.column("high"), self.column("low"), self.close
+            tr = high - low
+            prev = close[:-1]
+            tr[1:] = np.maximum.reduce([tr[1:], np.abs(high[1:] - prev), np.abs(low[1:] - prev)])
+            return tr
+        return self._get("true_range", build)
+
+    # -------------------------
+    # Shared rolling statistics
+    # -------------------------
+    # windows over closes j-w+1..j; returns and deltas at j also read close
+    # j-1, so their windows span w + 1 closes
+    def sma(self, w: int) -> np.ndarray:
+        return self._get(
+            f"sma:{w}",
+            lambda: _window_sum(self.close_prefix, w, gaps=self.gaps(w)) / w + self.close_shift,
+        )
+
+    def close_std(self, w: int, ddof: int) -> np.ndarray:
+        def build():
+            s = _window_sum(self.close_prefix, w, gaps=self.gaps(w))
+            sq = _window_sum(self.close_sq_prefix, w)
+            var = (sq - s * s / w) / (w - ddof)
+            return np.sqrt(np.maximum(var, 0.0))
+        return self._get(f"close_std:{w}:{ddof}", build)
+
+    def ema(self, w: int) -> np.ndarray:
+        return self._get(f"ema:{w}", lambda: _seeded_ewm(self.close, 2.0 / (w + 1), w))
+
+
+# ================================================
+#  INDICATORS
+# ================================================
+
+def _return(ws: _Workspace) -> Dict[str, np.ndarray]:
+    return {"return": ws.log_return}
+
+
+def _ma(ws: _Workspace, w: int) -> Dict[str, np.ndarray]:
+    return {f"ma_{w}": ws.sma(w)}
+
+
+def _ema(ws: _Workspace, w: int) -> Dict[str, np.ndarray]:
+    return {f"ema_{w}": ws.ema(w)}
+
+
+def _vol(ws: _Workspace, w: int) -> Dict[str, np.ndarray]:
+    # returns start at index 1
+    s = _window_sum(ws.return_prefix, w, start=1, gaps=ws.gaps(w + 1))
+    sq = _window_sum(ws.return_sq_prefix, w, start=1)
+    var = (sq - s * s / w) / (w - 1)
+    return {f"vol_{w}": np.sqrt(np.maximum(var, 0.0))}
+
+
+def _rsi(ws: _Workspace, w: int) -> Dict[str, np.ndarray]:
+    gaps = ws.gaps(w + 1)
+    avg_gain = _window_sum(ws.gain_prefix, w, gaps=gaps) / w
+    avg_loss = _window_sum(ws.loss_prefix, w, gaps=gaps) / w
+    rs = avg_gain / (avg_loss + RSI_EPS)
+    return {f"rsi_{w}": 100.0 - 100.0 / (1.0 + rs)}
+
+
+def _rsi_wilder(ws: _Workspace, w: int) -> Dict[str, np.ndarray]:
+    avg_gain = _seeded_ewm(ws.gain, 1.0 / w, w, start=1)
+    avg_loss = _seeded_ewm(ws.loss, 1.0 / w, w, start=1)
+    rs = avg_gain / (avg_loss + RSI_EPS)
+    return {f"rsi_wilder_{w}": 100.0 - 100.0 / (1.0 + rs)}
+
+
+def _atr(ws: _Workspace, w: int) -> Dict[str, np.ndarray]:
+    return {f"atr_{w}": _seeded_ewm(ws.true_range, 1.0 / w, w, start=1)}
+
+
+def _zscore(ws: _Workspace, w: int) -> Dict[str, np.ndarray]:
+    std = ws.close_std(w, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (ws.close - ws.sma(w)) / std
+    return {f"zscore_{w}": z}
+
+
+def _bollinger(ws: _Workspace, w: int, k: float, suffix: str) -> Dict[str, np.ndarray]:
+    mid = ws.sma(w)
+    band = k * ws.close_std(w, ddof=0)
+    upper, lower = mid + band, mid - band
+    with np.errstate(divide="ignore", invalid="ignore"):
+        width = (upper - lower) / mid
+    return {
+        f"bb_upper_{suffix}": upper,
+        f"bb_lower_{suffix}": lower,
+        f"bb_width_{suffix}": width,
+    }
+
+
+def _macd(ws: _Workspace, fast: int, slow: int, sig: int, suffix: str) -> Dict[str, np.ndarray]:
+    macd = ws.ema(fast) - ws.ema(slow)
+    signal = _seeded_ewm(macd, 2.0 / (sig + 1), sig, start=slow - 1)
+    return {
+        f"macd_{suffix}": macd,
+        f"macd_signal_{suffix}": signal,
+        f"macd_hist_{suffix}": macd - signal,
+    }
+
+
+_INT = r"(\d+)"
+_NUM = r"(\d+(?:\.\d+)?)"
+
+# (pattern, builder, min_window) — checked in order, first match wins;
+# every _INT group of the pattern is a window
+_PARSERS: List[Tuple["re.Pattern[str]", Callable[..., Dict[str, np.ndarray]], int]] = [
+    (re.compile(r"^return$"), lambda ws, m: _return(ws), 1),
+    (re.compile(rf"^ma_{_INT}$"), lambda ws, m: _ma(ws, int(m[1])), 1),
+    (re.compile(rf"^ema_{_INT}$"), lambda ws, m: _ema(ws, int(m[1])), 1),
+    (re.compile(rf"^vol_{_INT}$"), lambda ws, m: _vol(ws, int(m[1])), 2),
+    (re.compile(rf"^rsi_wilder_{_INT}$"), lambda ws, m: _rsi_wilder(ws, int(m[1])), 1),
+    (re.compile(rf"^rsi_{_INT}$"), lambda ws, m: _rsi(ws, int(m[1])), 1),
+    (re.compile(rf"^atr_{_INT}$"), lambda ws, m: _atr(ws, int(m[1])), 1),
+    (re.compile(rf"^zscore_{_INT}$"), lambda ws, m: _zscore(ws, int(m[1])), 2),
+    (
+        re.compile(rf"^bb_{_INT}_{_NUM}$"),
+        lambda ws, m: _bollinger(ws, int(m[1]), float(m[2]), f"{m[1]}_{m[2]}"),
+        1,
+    ),
+    (
+        re.compile(rf"^macd_{_INT}_{_INT}_{_INT}$"),
+        lambda ws, m: _macd(ws, int(m[1]), int(m[2]), int(m[3]), f"{m[1]}_{m[2]}_{m[3]}"),
+        1,
+    ),
+]
+
+
+def indicator_outputs(name: str) -> List[str]:
+    """
+    Column names produced by one indicator name (e.g. bb_20_2 -> 3 columns).
+    """
+    m = re.match(rf"^bb_{_INT}_{_NUM}$", name)
+    if m:
+        return [f"bb_{part}_{m[1]}_{m[2]}" for part in ("upper", "lower", "width")]
+    m = re.match(rf"^macd_{_INT}_{_INT}_{_INT}$", name)
+    if m:
+        suffix = f"{m[1]}_{m[2]}_{m[3]}"
+        return [f"macd_{suffix}", f"macd_signal_{suffix}", f"macd_hist_{suffix}"]
+    return [name]
+
+
+def indicator_for_column(column: str) -> str:
+    """
+    Indicator name that produces `column` (inverse of indicator_outputs).
+    """
+    m = re.match(rf"^bb_(?:upper|lower|width)_{_INT}_{_NUM}$", column)
+    if m:
+        return f"bb_{m[1]}_{m[2]}"
+    m = re.match(rf"^macd_(?:signal|hist)_{_INT}_{_INT}_{_INT}$", column)
+    if m:
+        return f"macd_{m[1]}_{m[2]}_{m[3]}"
+    return column
+
+
+def _windows(m: "re.Match[str]") -> List[int]:
+    # window groups come first (bb_<w>_<k>: k is a multiplier, not a window)
+    return [int(g) for g in m.groups()[:m.re.pattern.count(_INT)]]
+
+
+def _resolve(name: str) -> Tuple[Callable[..., Dict[str, np.ndarray]], "re.Match[str]"]:
+    for pattern, builder, min_window in _PARSERS:
+        m = pattern.match(name)
+        if m:
+            for w in _windows(m):
+                if w < min_window:
+                    need = "at least 2 (sample std)" if min_window == 2 else "at least 1"
+                    raise ValueError(f"Invalid indicator '{name}': window {w} must be {need}")
+            return builder, m
+    raise ValueError(f"Unknown indicator '{name}'")
+
+
+def check_indicator(name: str) -> None:
+    """
+    Raise ValueError if `name` is unknown or has an invalid window.
+    """
+    _resolve(name)
+
+
+def is_indicator(name: str) -> bool:
+    """
+    True if compute_indicators understands `name` (its windows may still
+    be invalid, see check_indicator).
+    """
+    return any(pattern.match(name) for pattern, _, _ in _PARSERS)
+
+
+def compute_indicator_arrays(
+    df: pd.DataFrame,
+    names: Iterable[str],
+    price_col: str = "close",
+) -> Dict[str, np.ndarray]:
+    """
+    Compute the requested indicators as a dict of float64 arrays aligned with df.
+    """
+    names = list(dict.fromkeys(names))  # de-dup, keep order
+    resolved = [_resolve(name) for name in names]  # fail fast on bad names
+
+    ws = _Workspace(df, price_col=price_col)
+    out: Dict[str, np.ndarray] = {}
+    for builder, m in resolved:
+        out.update(builder(ws, m))
+    return out
+
+
+def compute_indicators(
+    df: pd.DataFrame,
+    names: Iterable[str],
+    price_col: str = "close",
+) -> pd.DataFrame:
+    """
+    Return a copy of df with the requested indicator columns appended.
+    """
+    arrays = compute_indicator_arrays(df, names, price_col=price_col)
+
+    # one (k, n) block -> a single float64 block in the frame, no per-column blocks
+    block = np.empty((len(arrays), len(df)), dtype=np.float64)
+    for i, arr in enumerate(arrays.values()):
+        block[i] = arr
+    extra = pd.DataFrame(block.T, index=df.index, columns=list(arrays), copy=False)
+
+    base = df.drop(columns=[c for c in arrays if c in df.columns])
+    return pd.concat([base, extra], axis=1)
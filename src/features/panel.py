@@ -0,0 +1,206 @@
+import warnings
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.utils.data_loader import load_price_data
+
+
+PANEL_FIELDS = ("open", "high", "low", "close", "volume")
+PANEL_FEATURES = ("return", "ma_10", "ma_20", "ma_50", "vol_20", "rsi_14")
+
+
+@dataclass
+class PricePanel:
+    """
+    Aligned (time x asset) price arrays.
+
+    fields["close"][t, j] is the close of assets[j] at index[t]; NaN where
+    that asset has no bar at that timestamp. present[t, j] is True where it
+    has one (defaults to the non-NaN closes).
+    """
+
+    index: pd.DatetimeIndex
+    assets: List[str]
+    fields: Dict[str, np.ndarray]
+    present: Optional[np.ndarray] = None
+
+    def __post_init__(self) -> None:
+        if self.present is None:
+            self.present = ~np.isnan(self.fields["close"])
+
+    def frame(self, name: str) -> pd.DataFrame:
+        return pd.DataFrame(self.fields[name], index=self.index, columns=self.assets)
+
+
+def load_price_panel(
+    assets: Sequence[str],
+    data_dir: str = "data",
+) -> PricePanel:
+    """
+    Load the latest price file for each asset ("BTC-USD" style) and align
+    them on the union of timestamps.
+    """
+    if not assets:
+        raise ValueError("load_price_panel needs at least one asset")
+
+    frames = {
+        asset: load_price_data(data_dir=data_dir, symbol_filter=asset.replace("-", "_"))
+        for asset in assets
+    }
+    return align_price_frames(frames)
+
+
+def align_price_frames(frames: Mapping[str, pd.DataFrame]) -> PricePanel:
+    """
+    Align per-asset OHLCV frames (timestamp index) on the union of their
+    timestamps.
+    """
+    if not frames:
+        raise ValueError("align_price_frames needs at least one asset")
+
+    assets = list(frames)
+    index = frames[assets[0]].index
+    for df in frames.values():
+        index = index.union(df.index)
+
+    rows = {asset: index.get_indexer(df.index) for asset, df in frames.items()}
+    present = np.zeros((len(index), len(assets)), dtype=bool)
+    for j, asset in enumerate(assets):
+        present[rows[asset], j] = True
+
+    fields: Dict[str, np.ndarray] = {}
+    for name in PANEL_FIELDS:
+        arr = np.full((len(index), len(assets)), np.nan)
+        for j, asset in enumerate(assets):
+            arr[rows[asset], j] = frames[asset][name].to_numpy(dtype=np.float64)
+        fields[name] = arr
+
+    return PricePanel(index=pd.DatetimeIndex(index), assets=assets, fields=fields, present=present)
+
+
+# ================================================
+#  COLUMN-WISE ROLLING PRIMITIVES
+# ================================================
+
+def _rolling_sums(x: np.ndarray, w: int, shift: np.ndarray):
+    """
+    Rolling sum, sum of squares and valid count over axis 0 via prefix sums.
+    Values are shifted per column first to limit cancellation.
+    """
+    valid = ~np.isnan(x)
+    xs = np.where(valid, x - shift, 0.0)
+
+    def window(a):
+        c = np.zeros((a.shape[0] + 1, a.shape[1]))
+        np.cumsum(a, axis=0, out=c[1:])
+        return c[w:] - c[:-w]
+
+    return window(xs), window(xs * xs), window(valid.astype(np.float64))
+
+
+def _column_shift(x: np.ndarray) -> np.ndarray:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+        shift = np.nanmean(x, axis=0)
+    return np.nan_to_num(shift)
+
+
+def rolling_mean_2d(x: np.ndarray, w: int) -> np.ndarray:
+    """
+    Rolling mean over axis 0; NaN unless all `w` values in the window exist.
+    """
+    out = np.full(x.shape, np.nan)
+    if x.shape[0] < w:
+        return out
+    shift = _column_shift(x)
+    s, _, cnt = _rolling_sums(x, w, shift)
+    out[w - 1:] = np.where(cnt == w, s / w + shift, np.nan)
+    return out
+
+
+def rolling_std_2d(x: np.ndarray, w: int) -> np.ndarray:
+    """
+    Rolling sample std (ddof=1) over axis 0, same NaN rule as rolling_mean_2d.
+    """
+    out = np.full(x.shape, np.nan)
+    if x.shape[0] < w:
+        return out
+    shift = _column_shift(x)
+    s, sq, cnt = _rolling_sums(x, w, shift)
+    var = np.maximum((sq - s * s / w) / (w - 1), 0.0)
+    out[w - 1:] = np.where(cnt == w, np.sqrt(var), np.nan)
+    return out
+
+
+def _pack_rows(present: np.ndarray) -> np.ndarray:
+    """
+    Row order per column that moves each asset's own bars to the top, in
+    time order (take_along_axis / put_along_axis indices).
+    """
+    return np.argsort(~present, axis=0, kind="stable")
+
+
+def cross_sectional_rank(x: np.ndarray) -> np.ndarray:
+    """
+    Percentile rank (0 = lowest, 1 = highest) of each asset within each row.
+    NaN stays NaN; a row with a single valid value ranks it 1.
+    """
+    filled = np.where(np.isnan(x), np.inf, x)
+    order = np.argsort(filled, axis=1, kind="stable")
+    ranks = np.empty_like(order, dtype=np.float64)
+    np.put_along_axis(ranks, order, np.arange(x.shape[1], dtype=np.float64)[None, :], axis=1)
+
+    count = (~np.isnan(x)).sum(axis=1, keepdims=True).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(count > 1, ranks / (count - 1), 1.0)
+    return np.where(np.isnan(x), np.nan, pct)
+
+
+# ================================================
+#  PANEL FEATURES
+# ================================================
+
+def build_panel_features(panel: PricePanel) -> Dict[str, np.ndarray]:
+    """
+    Vectorized equivalent of build_price_feature_set for every asset at once.
+    Returns (time x asset) arrays for PANEL_FEATURES, NaN where the asset
+    has no bar.
+
+    Windows are counted over each asset's own bars, as in the single-asset
+    pipeline: every column is packed to its own bars, computed, and
+    scattered back, so timestamps only other assets trade at (a sparser
+    calendar, a gap in the feed) don't cut an asset's windows.
+    """
+    order = _pack_rows(panel.present)
+    n_bars = panel.present.sum(axis=0)
+    close = np.take_along_axis(panel.fields["close"], order, axis=0)
+    close[np.arange(close.shape[0])[:, None] >= n_bars[None, :]] = np.nan
+    features: Dict[str, np.ndarray] = {}
+
+    prev = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        features["return"] = np.log(close / prev)
+
+    for w in (10, 20, 50):
+        features[f"ma_{w}"] = rolling_mean_2d(close, w)
+
+    features["vol_20"] = rolling_std_2d(features["return"], 20)
+
+    # RSI as in compute_rsi: a missing delta counts as 0 gain / 0 loss
+    delta = close - prev
+    gain = np.where(delta > 0.0, delta, 0.0)
+    loss = np.where(delta < 0.0, -delta, 0.0)
+    avg_gain = rolling_mean_2d(gain, 14)
+    avg_loss = rolling_mean_2d(loss, 14)
+    rs = avg_gain / (avg_loss + 1e-9)
+    features["rsi_14"] = 100.0 - (100.0 / (1.0 + rs))
+
+    for name, packed in features.items():
+        out = np.full(packed.shape, np.nan)
+        np.put_along_axis(out, order, packed, axis=0)
+        out[~panel.present] = np.nan
+        features[name] = out
+    return features
@@ -1,6 +1,12 @@
+from typing import Hashable, Iterable, Optional, Sequence
+
 import pandas as pd
 import numpy as np
 
+from src.features.feature_graph import STANDARD_FEATURES, compute_features, feature_graph
+from src.features.indicators import compute_indicators
+from src.utils.profiling import timed
+
 
 def add_log_returns(df: pd.DataFrame, price_col: str = "close") -> pd.DataFrame:
     df = df.copy()
@@ -57,13 +63,41 @@ def add_rsi(
     return df
 
 
-def build_price_feature_set(df: pd.DataFrame) -> pd.DataFrame:
+# Bars of history the default feature set needs before its first complete
+# row (ma_50): its last n rows only depend on the last n + FEATURE_WARMUP_BARS - 1
+# bars. (EMA-style extra indicators have unbounded memory and aren't covered.)
+FEATURE_WARMUP_BARS = feature_graph.warmup_bars(STANDARD_FEATURES)
+
+
+@timed("build_price_feature_set")
+def build_price_feature_set(
+    df: pd.DataFrame,
+    indicators: Iterable[str] = (),
+    columns: Sequence[str] = STANDARD_FEATURES,
+    cache_key: Optional[Hashable] = None,
+    version: Optional[Hashable] = None,
+) -> pd.DataFrame:
     """
     Apply all standard price-based features in one go.
+    Extra `indicators` (names from src.features.indicators, e.g. "ema_12",
+    "macd_12_26_9", "atr_14") are added in one fused pass.
+    Compact (float32) input gives float32 features.
+
+    `columns` narrows the standard set to what the caller reads: only their
+    dependencies are computed (see src.features.feature_graph), and rows
+    are dropped only where those are undefined. With cache_key/version the
+    intermediates are memoized and shared with later calls on the same data.
     """
-    df = add_log_returns(df)
-    df = add_moving_averages(df)
-    df = add_volatility(df)
-    df = add_rsi(df)
+    input_columns = set(df.columns)
+    arrays = compute_features(df, list(columns), cache_key=cache_key, version=version)
+    df = df.copy()
+    for name, arr in arrays.items():
+        df[name] = np.array(arr)  # memoized arrays are read-only
+    if indicators:
+        df = compute_indicators(df, indicators)
+    if df["close"].dtype == np.float32:
+        # compact input: store features as float32 too (see src.utils.compact)
+        added = [c for c in df.columns if c not in input_columns and df[c].dtype == np.float64]
+        df[added] = df[added].astype(np.float32)
     df = df.dropna()
     return df
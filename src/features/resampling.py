@@ -0,0 +1,137 @@
+import threading
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+BASE_INTERVAL = "1h"
+
+# API interval -> pandas offset alias. Buckets are anchored to the epoch so
+# boundaries don't move when the start of the base series changes.
+INTERVAL_RULES: Dict[str, str] = {
+    "1h": "1h",
+    "2h": "2h",
+    "4h": "4h",
+    "6h": "6h",
+    "12h": "12h",
+    "1d": "1D",
+}
+
+OHLCV_AGG = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "adj_close": "last",
+    "volume": "sum",
+}
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Aggregate base OHLCV bars into `interval` bars labelled by bucket start.
+    Columns not in OHLCV_AGG are dropped; empty buckets are removed.
+    """
+    if interval not in INTERVAL_RULES:
+        raise ValueError(f"Unsupported interval '{interval}'. Use one of {list(INTERVAL_RULES)}")
+
+    agg = {col: how for col, how in OHLCV_AGG.items() if col in df.columns}
+    out = df.resample(INTERVAL_RULES[interval], origin="epoch", label="left", closed="left").agg(agg)
+    out = out.dropna(subset=["close"])
+    return out[[c for c in df.columns if c in agg]]
+
+
+def _first_difference(old: pd.DataFrame, new: pd.DataFrame) -> int:
+    """
+    Position of the first row where `old` and `new` differ (timestamp or
+    values; NaN equals NaN), or the length of the shorter one if it is a
+    prefix of the other.
+    """
+    cols = [c for c in old.columns if c in OHLCV_AGG]
+    if cols != [c for c in new.columns if c in OHLCV_AGG]:
+        return 0
+    n = min(len(old), len(new))
+    a = old[cols].to_numpy()[:n]
+    b = new[cols].to_numpy()[:n]
+    same = (old.index[:n] == new.index[:n]) & ((a == b) | (pd.isna(a) & pd.isna(b))).all(axis=1)
+    diff = np.flatnonzero(~same)
+    return int(diff[0]) if len(diff) else n
+
+
+class ResampleCache:
+    """
+    Cache of resampled bars per (key, interval).
+
+    Entries are tagged with the version of the base data (e.g.
+    price_data_version): the same version returns the cached bars as is.
+    For a new version the new base is compared with the one the bars were
+    built from, and only the buckets from the first added or revised base
+    row onward are re-aggregated (a grown series, a revised last partial
+    bar); a change in the first bar rebuilds the interval in full.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (key, interval) -> (version, base, bars)
+        self._entries: Dict[Tuple[str, str], Tuple[Hashable, pd.DataFrame, pd.DataFrame]] = {}
+
+    def get(
+        self,
+        key: str,
+        base: pd.DataFrame,
+        interval: str,
+        version: Optional[Hashable] = None,
+    ) -> pd.DataFrame:
+        if interval == BASE_INTERVAL:
+            return base
+        if base.empty:
+            return resample_ohlcv(base, interval)
+
+        cache_key = (key, interval)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+
+        bars = None
+        if entry is not None:
+            cached_version, cached_base, cached = entry
+            if version is not None and version == cached_version:
+                return cached
+            bars = self._update(cached, cached_base, base, interval)
+
+        if bars is None:
+            bars = resample_ohlcv(base, interval)
+
+        with self._lock:
+            self._entries[cache_key] = (version, base, bars)
+        return bars
+
+    @staticmethod
+    def _update(
+        cached: pd.DataFrame,
+        old: pd.DataFrame,
+        base: pd.DataFrame,
+        interval: str,
+    ) -> Optional[pd.DataFrame]:
+        """
+        cached (built from old) brought up to date with base, or None if
+        nothing can be reused.
+        """
+        pos = _first_difference(old, base)
+        if pos == 0:
+            return None
+        changed = [frame.index[pos] for frame in (old, base) if pos < len(frame)]
+        if not changed:
+            return cached
+        # every bucket before the first changed row holds the same rows as before
+        bucket_start = min(changed).floor(INTERVAL_RULES[interval])
+        tail = resample_ohlcv(base.loc[bucket_start:], interval)
+        head = cached.loc[cached.index < bucket_start]
+        return pd.concat([head, tail])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+resample_cache = ResampleCache()
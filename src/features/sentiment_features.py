@@ -1,8 +1,20 @@
 import json
-from typing import Callable, Optional
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
+from src.features.dedup import DEDUP_EXACT, DEDUP_MODES, DEDUP_OFF, group_duplicates
+from src.utils.circuit_breaker import CircuitBreaker
+from src.utils.compact import index_to_datetime
+from src.utils.log import get_logger, log_event
+from src.utils.profiling import LATENCY_BUCKETS, timed
 from src.utils.config import (
     SentimentEngine,
     get_sentiment_engine,
@@ -15,6 +27,142 @@ except ImportError:
     anthropic = None
 
 
+logger = get_logger("sentiment")
+
+# Upper bound on the time one request spends scoring with Claude; past it,
+# remaining texts are scored in degraded mode (stays under the 30 s Lambda limit)
+SCORING_DEADLINE_SECONDS = float(os.getenv("SENTIMENT_SCORING_DEADLINE_SECONDS", "20"))
+# Timeout for a single Claude call (capped by what is left of the deadline)
+CLAUDE_TIMEOUT_SECONDS = float(os.getenv("CLAUDE_TIMEOUT_SECONDS", "5"))
+CLAUDE_SCORE_CACHE_SIZE = int(os.getenv("CLAUDE_SCORE_CACHE_SIZE", "10000"))
+
+CLAUDE_MODEL = "claude-3-haiku-latest"
+
+# Duplicate collapsing before scoring with a remote engine: off | exact | near
+# (see src.features.dedup; near is opt-in). The local lexicon always scores
+# every row.
+SENTIMENT_DEDUP = os.getenv("SENTIMENT_DEDUP", DEDUP_EXACT).lower()
+if SENTIMENT_DEDUP not in DEDUP_MODES:
+    SENTIMENT_DEDUP = DEDUP_EXACT
+
+
+# ================================================
+#  PER-REQUEST SCORING STATS
+# ================================================
+
+class ScoringStats:
+    """
+    Aggregate of every text scored in one request: count, per-text latency
+    histogram, which engine produced each score and how many scores were
+    degraded (Claude unavailable, deadline hit or unparseable answer).
+    `rows` counts the texts asked for; with deduplication `count` (texts
+    actually scored) can be lower.
+
+    Also carries the request's scoring deadline; reset_deadline() starts a
+    fresh one (streamed bulk scoring gives each batch its own).
+    """
+
+    def __init__(self, deadline_seconds: Optional[float] = SCORING_DEADLINE_SECONDS) -> None:
+        self.count = 0
+        self.rows = 0
+        self.fallbacks = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last = +Inf
+        self.engines: Dict[str, int] = {}
+        self.deadline = None
+        self.reset_deadline(deadline_seconds)
+        self.last_engine: Optional[str] = None
+
+    def reset_deadline(self, deadline_seconds: Optional[float] = SCORING_DEADLINE_SECONDS) -> None:
+        self.deadline = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+
+    def remaining(self) -> Optional[float]:
+        """
+        Seconds left before the scoring deadline (None = no deadline).
+        """
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def observe(self, seconds: float, engine: str, count: int = 1) -> None:
+        """
+        Record `count` texts scored in `seconds` in total (count > 1: a batch
+        timed as a whole, each text gets the mean latency).
+        """
+        if count <= 0:
+            return
+        per_text = seconds / count
+        self.count += count
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, per_text)
+        self.engines[engine] = self.engines.get(engine, 0) + count
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if per_text <= bound:
+                self.buckets[i] += count
+                return
+        self.buckets[-1] += count
+
+    def engine_label(self) -> Optional[str]:
+        """
+        Engine(s) that produced the scores, e.g. 'claude' or 'claude+naive'.
+        """
+        return "+".join(sorted(self.engines)) or None
+
+    def summary(self) -> dict:
+        bounds = [str(b) for b in LATENCY_BUCKETS] + ["+Inf"]
+        return {
+            "engines": self.engines,
+            "count": self.count,
+            "rows": self.rows,
+            "dedup_ratio": round(1.0 - self.count / self.rows, 4) if self.rows else 0.0,
+            "fallbacks": self.fallbacks,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "mean_ms": round(self.total_seconds * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "latency_le_s": {b: n for b, n in zip(bounds, self.buckets) if n},
+        }
+
+    def log(self) -> None:
+        if self.count:
+            log_event(logger, logging.INFO, "sentiment.scoring", **self.summary())
+
+
+current_scoring_stats: ContextVar[Optional[ScoringStats]] = ContextVar(
+    "intellpulse_scoring_stats", default=None
+)
+
+
+@contextmanager
+def scoring_stats(stats: Optional[ScoringStats] = None) -> Iterator[ScoringStats]:
+    """
+    Collect scoring stats for everything scored inside the block and log
+    one 'sentiment.scoring' event at the end. Nested blocks share the
+    outermost collector, so a request logs once however often it scores.
+
+    Passing `stats` accumulates into a collector the caller owns (e.g. one
+    that spans several threadpool batches); the caller then calls stats.log().
+    """
+    outer = current_scoring_stats.get()
+    if outer is not None and stats is None:
+        yield outer
+        return
+
+    owned = stats is None
+    stats = stats or ScoringStats()
+    token = current_scoring_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_scoring_stats.reset(token)
+        if owned:
+            stats.log()
+
+
+def _record_engine(engine: str) -> None:
+    stats = current_scoring_stats.get()
+    if stats is not None:
+        stats.last_engine = engine
+
+
 # ================================================
 #  SIMPLE LOCAL (NAIVE) LEXICON SENTIMENT
 # ================================================
@@ -45,27 +193,120 @@ def simple_lexicon_sentiment(text: str) -> float:
 #  CLAUDE SENTIMENT (ANTHROPIC API)
 # ================================================
 
+claude_breaker = CircuitBreaker(
+    "claude",
+    failure_rate=float(os.getenv("CLAUDE_BREAKER_FAILURE_RATE", "0.5")),
+    min_calls=int(os.getenv("CLAUDE_BREAKER_MIN_CALLS", "5")),
+    window_seconds=float(os.getenv("CLAUDE_BREAKER_WINDOW_SECONDS", "60")),
+    cooldown_seconds=float(os.getenv("CLAUDE_BREAKER_COOLDOWN_SECONDS", "30")),
+)
+
+
+class _ScoreCache:
+    """
+    Bounded LRU of Claude scores by text, used first on every call and as
+    the degraded-mode source when Claude can't be asked.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, float]" = OrderedDict()
+
+    def get(self, text: str) -> Optional[float]:
+        with self._lock:
+            score = self._data.get(text)
+            if score is not None:
+                self._data.move_to_end(text)
+            return score
+
+    def put(self, text: str, score: float) -> None:
+        with self._lock:
+            self._data[text] = score
+            self._data.move_to_end(text)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+claude_score_cache = _ScoreCache(CLAUDE_SCORE_CACHE_SIZE)
+_client_lock = threading.Lock()
+_client = None
+_client_override = None
+
+
+def set_anthropic_client(client) -> None:
+    """
+    Send Claude calls to `client` (anything with messages.create, e.g. the
+    local fake used by benchmarks/load_test.py) instead of the SDK client.
+    None goes back to the SDK.
+    """
+    global _client_override
+    with _client_lock:
+        _client_override = client
+
+
 def _get_anthropic_client():
-    """Create Anthropic client using ANTHROPIC_API_KEY."""
+    """Create (once) the Anthropic client using ANTHROPIC_API_KEY."""
+    global _client
+    if _client_override is not None:
+        return _client_override
     if anthropic is None:
         raise ImportError("anthropic library not installed. Run: pip install anthropic")
 
     key = anthropic_api_key()
     if not key:
         raise EnvironmentError("ANTHROPIC_API_KEY not set.")
-    return anthropic.Anthropic(api_key=key)
+    with _client_lock:
+        if _client is None or _client.api_key != key:
+            # no SDK retries: the breaker and the deadline decide when to give up
+            _client = anthropic.Anthropic(api_key=key, max_retries=0)
+        return _client
+
+
+def _degraded_score(text: str, reason: str) -> float:
+    """
+    Score without Claude. Texts with a cached Claude score never get here,
+    so this is the local lexicon.
+    """
+    stats = current_scoring_stats.get()
+    if stats is not None:
+        stats.fallbacks += 1
+    log_event(logger, logging.DEBUG, "sentiment.claude.fallback", reason=reason)
+
+    return simple_lexicon_sentiment(text)
 
 
 def claude_sentiment_scorer(text: str) -> float:
-    """Call Claude to score sentiment in [0, 1]."""
+    """
+    Call Claude to score sentiment in [0, 1].
+
+    Bounded latency: when the breaker is open, the request's scoring
+    deadline has passed or the call fails, the score comes from
+    _degraded_score and the engine is reported as 'naive'.
+    """
     if not isinstance(text, str) or not text.strip():
         return 0.5
 
+    cached = claude_score_cache.get(text)
+    if cached is not None:
+        _record_engine(SentimentEngine.CLAUDE.value)
+        return cached
+
+    _record_engine(SentimentEngine.NAIVE.value)
+
     try:
         client = _get_anthropic_client()
-    except Exception:
-        print("CLAUDE DEBUG: client init failed, falling back to 0.5")
-        return 0.5
+    except Exception as e:
+        return _degraded_score(text, f"client init failed: {e!r}")
+
+    stats = current_scoring_stats.get()
+    remaining = stats.remaining() if stats is not None else None
+    if remaining is not None and remaining <= 0:
+        return _degraded_score(text, "scoring deadline exceeded")
+    if not claude_breaker.allow():
+        return _degraded_score(text, "circuit open")
+
+    timeout = CLAUDE_TIMEOUT_SECONDS if remaining is None else min(CLAUDE_TIMEOUT_SECONDS, remaining)
 
     prompt = f"""
 You are a financial sentiment classifier.
@@ -78,35 +319,41 @@ Respond ONLY with JSON:
 """
 
     try:
-        print("CLAUDE DEBUG: sending prompt:", text[:60], "...")
+        log_event(logger, logging.DEBUG, "sentiment.claude.request", text=text[:60])
         response = client.messages.create(
-            model="claude-3-haiku-latest",
+            model=CLAUDE_MODEL,
             max_tokens=64,
             temperature=0.0,
             messages=[
                 {"role": "user", "content": prompt}
             ],
+            timeout=timeout,
         )
+    except Exception as e:
+        claude_breaker.record_failure()
+        return _degraded_score(text, f"API error: {e!r}")
+    claude_breaker.record_success()
 
-        content = response.content
-        if not content:
-            print("CLAUDE DEBUG: empty content, falling back to 0.5")
-            return 0.5
+    content = response.content
+    if not content:
+        return _degraded_score(text, "empty content")
 
-        text_out = content[0].text.strip()
-        print("CLAUDE DEBUG: raw response:", text_out)
+    text_out = content[0].text.strip()
+    log_event(logger, logging.DEBUG, "sentiment.claude.response", raw=text_out)
 
+    try:
         try:
             obj = json.loads(text_out)
             score = float(obj.get("score", 0.5))
         except Exception:
             score = float(text_out.strip())
+    except Exception:
+        return _degraded_score(text, f"unparseable response: {text_out[:60]!r}")
 
-        return max(0.0, min(1.0, score))
-
-    except Exception as e:
-        print("CLAUDE DEBUG: API error:", repr(e))
-        return 0.5
+    score = max(0.0, min(1.0, score))
+    claude_score_cache.put(text, score)
+    _record_engine(SentimentEngine.CLAUDE.value)
+    return score
 
 
 # ================================================
@@ -120,7 +367,7 @@ def get_sentiment_scorer(
     Return a scorer function based on config/env.
     """
     engine = override_engine or get_sentiment_engine()
-    print("DEBUG — Using sentiment engine:", engine)
+    log_event(logger, logging.DEBUG, "sentiment.engine", engine=engine.value)
 
     if engine == SentimentEngine.CLAUDE:
         return claude_sentiment_scorer
@@ -128,17 +375,98 @@ def get_sentiment_scorer(
     return simple_lexicon_sentiment
 
 
+# ================================================
+#  BATCH SCORING
+# ================================================
+
+def _engine_name(scorer_fn: Callable[[str], float]) -> str:
+    if scorer_fn is simple_lexicon_sentiment:
+        return SentimentEngine.NAIVE.value
+    if scorer_fn is claude_sentiment_scorer:
+        return SentimentEngine.CLAUDE.value
+    return getattr(scorer_fn, "__name__", type(scorer_fn).__name__)
+
+
+def score_texts_with_engines(
+    texts: Iterable[str],
+    scorer: Optional[Callable[[str], float]] = None,
+    stats: Optional[ScoringStats] = None,
+    dedup: Optional[str] = None,
+) -> Tuple[List[float], List[str]]:
+    """
+    Score a batch of texts with a single scorer lookup.
+    Returns clamped [0, 1] scores and the engine that actually produced
+    each one (a Claude scorer can degrade to 'naive' text by text).
+    Timings go to the request's ScoringStats (or to `stats` when given):
+    per text for remote engines, one batch timing for the local lexicon.
+
+    Duplicates are collapsed first (`dedup`, default SENTIMENT_DEDUP for
+    remote engines, off for the local lexicon): one representative per
+    group is scored and its score and engine are fanned out to the group.
+    """
+    texts = list(texts)
+    scorer_fn = scorer or get_sentiment_scorer()
+    default_engine = _engine_name(scorer_fn)
+    if dedup is None:
+        dedup = DEDUP_OFF if scorer_fn is simple_lexicon_sentiment else SENTIMENT_DEDUP
+
+    if scorer_fn is simple_lexicon_sentiment and dedup == DEDUP_OFF:
+        # local and cheap: time the batch once instead of every text
+        with scoring_stats(stats) as stats:
+            stats.rows += len(texts)
+            start = time.perf_counter()
+            scores = [max(0.0, min(1.0, float(scorer_fn(t)))) for t in texts]
+            stats.observe(time.perf_counter() - start, default_engine, count=len(texts))
+        return scores, [default_engine] * len(texts)
+
+    groups = group_duplicates(texts, mode=dedup)
+    if groups.groups < groups.rows:
+        log_event(logger, logging.DEBUG, "sentiment.dedup", engine=default_engine, **groups.summary())
+
+    group_scores: List[float] = []
+    group_engines: List[str] = []
+    with scoring_stats(stats) as stats:
+        stats.rows += len(texts)
+        clock = time.perf_counter
+        for i in groups.representatives:
+            stats.last_engine = None
+            start = clock()
+            score = float(scorer_fn(texts[i]))
+            engine = stats.last_engine or default_engine
+            stats.observe(clock() - start, engine)
+            group_scores.append(max(0.0, min(1.0, score)))
+            group_engines.append(engine)
+
+    labels = groups.labels.tolist()
+    return [group_scores[g] for g in labels], [group_engines[g] for g in labels]
+
+
+def score_texts(
+    texts: Iterable[str],
+    scorer: Optional[Callable[[str], float]] = None,
+    stats: Optional[ScoringStats] = None,
+    dedup: Optional[str] = None,
+) -> List[float]:
+    """
+    Scores only; see score_texts_with_engines.
+    """
+    return score_texts_with_engines(texts, scorer, stats, dedup)[0]
+
+
 # ================================================
 #  APPLY SENTIMENT TO DATAFRAME
 # ================================================
 
+@timed("apply_sentiment_scorer")
 def apply_sentiment_scorer(
     df: pd.DataFrame,
     scorer: Optional[Callable[[str], float]] = None,
+    dedup: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Apply sentiment scoring to a DataFrame.
-    Requires column 'text'.
+    Requires column 'text'. Duplicate headlines are scored once (see
+    score_texts_with_engines for `dedup`).
     """
     if df is None or not isinstance(df, pd.DataFrame):
         raise ValueError("apply_sentiment_scorer received None instead of DataFrame")
@@ -149,7 +477,7 @@ def apply_sentiment_scorer(
     df = df.copy()
     scorer_fn = scorer or get_sentiment_scorer()
 
-    df["sentiment_score"] = df["text"].apply(scorer_fn)
+    df["sentiment_score"] = score_texts(df["text"].tolist(), scorer=scorer_fn, dedup=dedup)
     return df
 
 
@@ -157,6 +485,7 @@ def apply_sentiment_scorer(
 #  ALIGN SENTIMENT WITH PRICE DATA
 # ================================================
 
+@timed("aggregate_sentiment_to_prices")
 def aggregate_sentiment_to_prices(
     sentiment_df: pd.DataFrame,
     price_df: pd.DataFrame,
@@ -183,7 +512,7 @@ def aggregate_sentiment_to_prices(
     else:
         s.index = pd.to_datetime(s.index, utc=True)
 
-    price_index = pd.to_datetime(price_df.index, utc=True)
+    price_index = index_to_datetime(price_df.index, utc=True)  # also epoch-second indexes
 
     s = s.sort_index()
     s = s[["sentiment_score"]]
@@ -193,3 +522,31 @@ def aggregate_sentiment_to_prices(
 
     return aligned
 
+
+def aggregate_sentiment_to_panel(
+    sentiment_df: pd.DataFrame,
+    index: pd.DatetimeIndex,
+    assets: Sequence[str],
+) -> pd.DataFrame:
+    """
+    Panel version of aggregate_sentiment_to_prices: forward-fill each
+    asset's scores onto a shared (naive) price index.
+    Returns a (time x asset) frame; NaN before an asset's first headline.
+    """
+    if sentiment_df is None or sentiment_df.empty:
+        raise ValueError("Sentiment DataFrame is empty.")
+
+    s = sentiment_df.copy()
+    s["timestamp"] = pd.to_datetime(s["timestamp"], utc=True)
+
+    wide = s.pivot_table(
+        index="timestamp",
+        columns="asset",
+        values="sentiment_score",
+        aggfunc="last",
+    )
+    wide = wide.reindex(columns=list(assets)).sort_index().ffill()
+
+    aligned = wide.reindex(pd.to_datetime(index, utc=True), method="ffill")
+    aligned.index = index  # restore naive
+    return aligned
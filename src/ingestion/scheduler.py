@@ -0,0 +1,324 @@
+"""
+Local ingestion scheduler and input watcher.
+
+- IngestionJob: fetch one symbol every N seconds (Yahoo or Binance).
+- InputWatcher: polls the price directory and the sentiment CSV and
+  reports which assets' inputs changed since the last handled poll.
+- Scheduler: runs due jobs, polls the watcher and hands the changed
+  assets to a callback, so recomputation scales with what changed rather
+  than with the size of the universe. A change counts as handled only
+  once the callback succeeded for it; failed assets are reported again
+  on the next poll.
+
+Each ingestion run writes a new timestamped price file; superseded files
+of the symbol are deleted (the newest KEEP_PRICE_FILES are kept), so the
+data directory doesn't grow with every run.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from src.ingestion.sentiment_ingestion import load_sentiment_csv
+from src.utils.log import get_logger, log_event
+
+
+logger = get_logger("scheduler")
+
+PRICE_FILE_RX = re.compile(r"^(.+)_(\d{8})_(\d{6})\.csv$")
+# the previous snapshot survives one run: a reader that picked it as the
+# latest file just before the new one appeared can still open it
+KEEP_PRICE_FILES = 2
+
+
+# ================================================
+#  INGESTION JOBS
+# ================================================
+
+@dataclass
+class IngestionJob:
+    """
+    Fetch `symbol` every `every_seconds`; fetch(symbol) returns the written path.
+    """
+
+    source: str
+    symbol: str
+    every_seconds: float
+    fetch: Callable[[str], str]
+    next_run: float = 0.0
+
+
+def yahoo_fetcher(data_dir: str) -> Callable[[str], str]:
+    def fetch(ticker: str) -> str:
+        from src.ingestion.fetch_prices_yahoo import fetch_price_history, save_to_csv
+        return save_to_csv(fetch_price_history(ticker), ticker, data_dir=data_dir)
+    return fetch
+
+
+def binance_fetcher(data_dir: str) -> Callable[[str], str]:
+    client = None
+
+    def fetch(symbol: str) -> str:
+        nonlocal client
+        from src.ingestion.fetch_prices_binance import fetch_klines, get_binance_client
+        from src.ingestion.ticks import PriceCsvSink
+        if client is None:
+            client = get_binance_client()
+        # fetch_prices_binance.save_to_csv writes a plain one-header CSV that
+        # load_price_data can't read; write the store layout instead
+        sink = PriceCsvSink(data_dir, symbol)
+        sink.write(fetch_klines(client, symbol=symbol))
+        if sink.path is None:
+            raise ValueError(f"Binance returned no klines for {symbol}")
+        return sink.path
+    return fetch
+
+
+def prune_price_files(path: str, keep: int = KEEP_PRICE_FILES) -> List[str]:
+    """
+    Delete all but the newest `keep` price files of the symbol `path` (a
+    SYMBOL_YYYYMMDD_HHMMSS.csv file) belongs to. Returns the deleted paths.
+    """
+    data_dir, name = os.path.split(path)
+    m = PRICE_FILE_RX.match(name)
+    if not m:
+        return []
+    symbol = m.group(1)
+    files = []
+    with os.scandir(data_dir or ".") as it:
+        for entry in it:
+            fm = PRICE_FILE_RX.match(entry.name)
+            if fm and fm.group(1) == symbol:
+                files.append(entry.name)
+    files.sort()  # same symbol -> names sort by their YYYYMMDD_HHMMSS stamp
+    removed = []
+    for old in files[:-keep] if keep > 0 else files:
+        old_path = os.path.join(data_dir, old)
+        try:
+            os.remove(old_path)
+        except FileNotFoundError:
+            continue
+        removed.append(old_path)
+    return removed
+
+
+FETCHERS: Dict[str, Callable[[str], Callable[[str], str]]] = {
+    "yahoo": yahoo_fetcher,
+    "binance": binance_fetcher,
+}
+
+
+def parse_jobs(spec: str, data_dir: str) -> List[IngestionJob]:
+    """
+    Jobs from "source:SYMBOL=seconds,...", e.g.
+    "yahoo:BTC-USD=3600,yahoo:ETH-USD=900,binance:BTCUSDT=300".
+    """
+    jobs = []
+    fetchers: Dict[str, Callable[[str], str]] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        m = re.match(r"^(\w+):([^=]+)=(\d+(?:\.\d+)?)$", part)
+        if not m:
+            raise ValueError(f"Invalid job spec {part!r}; expected source:SYMBOL=seconds")
+        source, symbol, seconds = m.group(1), m.group(2), float(m.group(3))
+        if source not in FETCHERS:
+            raise ValueError(f"Unknown ingestion source '{source}'. Use one of {list(FETCHERS)}")
+        if source not in fetchers:
+            fetchers[source] = FETCHERS[source](data_dir)
+        jobs.append(IngestionJob(source, symbol, seconds, fetchers[source]))
+    return jobs
+
+
+# ================================================
+#  INPUT WATCHER
+# ================================================
+
+class InputWatcher:
+    """
+    Polling change detector (portable; no inotify dependency).
+
+    Prices: the latest SYMBOL_YYYYMMDD_HHMMSS.csv per symbol, compared by
+    (path, mtime_ns, size); only that file is stat'ed per symbol.
+    Sentiment: when the CSV's stat changes, its rows are hashed per asset,
+    so only assets whose headlines changed are reported.
+
+    poll() doesn't move the baseline: the state it saw is kept pending until
+    commit(), so changes whose handling failed are reported again.
+    """
+
+    def __init__(self, data_dir: str, sentiment_path: Optional[str] = None) -> None:
+        self.data_dir = data_dir
+        self.sentiment_path = sentiment_path
+        self._prices: Dict[str, Tuple[str, int, int]] = {}
+        self._sentiment_stat: Optional[Tuple[int, int]] = None
+        self._sentiment_hashes: Dict[str, int] = {}
+        self._pending: Optional[tuple] = None
+
+    def _latest_price_files(self) -> Dict[str, str]:
+        latest: Dict[str, os.DirEntry] = {}
+        with os.scandir(self.data_dir) as it:
+            for entry in it:
+                m = PRICE_FILE_RX.match(entry.name)
+                if not m:
+                    continue
+                best = latest.get(m.group(1))
+                # same symbol prefix -> names sort by their YYYYMMDD_HHMMSS stamp
+                if best is None or entry.name > best.name:
+                    latest[m.group(1)] = entry
+        return {symbol: entry.path for symbol, entry in latest.items()}
+
+    @property
+    def price_assets(self) -> Set[str]:
+        """
+        Assets with a price file as of the last poll.
+        """
+        prices = self._pending[0] if self._pending is not None else self._prices
+        return {symbol.replace("_", "-") for symbol in prices}
+
+    def _price_changes(self) -> Tuple[Dict[str, Tuple[str, int, int]], Set[str]]:
+        changed = set()
+        current: Dict[str, Tuple[str, int, int]] = {}
+        for symbol, path in self._latest_price_files().items():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:  # replaced between scan and stat
+                continue
+            current[symbol] = (path, st.st_mtime_ns, st.st_size)
+            if self._prices.get(symbol) != current[symbol]:
+                changed.add(symbol.replace("_", "-"))
+        return current, changed
+
+    def _sentiment_changes(self) -> Tuple[Optional[Tuple[int, int]], Dict[str, int], Set[str]]:
+        if not self.sentiment_path:
+            return self._sentiment_stat, self._sentiment_hashes, set()
+        try:
+            st = os.stat(self.sentiment_path)
+        except FileNotFoundError:
+            return self._sentiment_stat, self._sentiment_hashes, set()
+        stat = (st.st_mtime_ns, st.st_size)
+        if stat == self._sentiment_stat:
+            return stat, self._sentiment_hashes, set()
+
+        df = load_sentiment_csv(self.sentiment_path)
+        hashes = {
+            asset: int(pd.util.hash_pandas_object(group[["timestamp", "text"]], index=False).sum())
+            for asset, group in df.groupby("asset")
+        }
+        changed = {a for a in hashes.keys() | self._sentiment_hashes.keys()
+                   if hashes.get(a) != self._sentiment_hashes.get(a)}
+        return stat, hashes, changed
+
+    def poll(self) -> Dict[str, Set[str]]:
+        """
+        {"price": assets, "sentiment": assets} changed since the last
+        commit() (everything present counts as changed before the first).
+        """
+        prices, price_changed = self._price_changes()
+        stat, hashes, sentiment_changed = self._sentiment_changes()
+        self._pending = (prices, stat, hashes)
+        return {"price": price_changed, "sentiment": sentiment_changed}
+
+    def commit(self, failed: Iterable[str] = ()) -> None:
+        """
+        Make the last poll the baseline, except for `failed` assets, which
+        keep their old state and are reported again by the next poll.
+        """
+        if self._pending is None:
+            return
+        prices, stat, hashes = self._pending
+        self._pending = None
+        failed = set(failed)
+
+        for symbol in list(prices):
+            if symbol.replace("_", "-") in failed:
+                if symbol in self._prices:
+                    prices[symbol] = self._prices[symbol]
+                else:
+                    del prices[symbol]
+        self._prices = prices
+
+        retry = failed & (hashes.keys() | self._sentiment_hashes.keys())
+        if retry:
+            hashes = dict(hashes)
+            for asset in retry:
+                if asset in self._sentiment_hashes:
+                    hashes[asset] = self._sentiment_hashes[asset]
+                else:
+                    hashes.pop(asset, None)
+            stat = None  # re-hash on the next poll even if the file is untouched
+        self._sentiment_stat = stat
+        self._sentiment_hashes = hashes
+
+
+# ================================================
+#  SCHEDULER LOOP
+# ================================================
+
+class Scheduler:
+    """
+    Single-threaded loop: run due ingestion jobs, poll for input changes,
+    call on_change(price_assets, sentiment_assets) when anything changed.
+
+    on_change may return the assets it failed on: they (or, if it raises,
+    all changes) stay pending in the watcher and are retried next cycle.
+    """
+
+    def __init__(
+        self,
+        watcher: InputWatcher,
+        on_change: Callable[[Set[str], Set[str]], Optional[Set[str]]],
+        jobs: Iterable[IngestionJob] = (),
+        poll_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.watcher = watcher
+        self.on_change = on_change
+        self.jobs = list(jobs)
+        self.poll_seconds = poll_seconds
+        self._clock = clock
+
+    def _run_due_jobs(self) -> None:
+        for job in self.jobs:
+            now = self._clock()
+            if now < job.next_run:
+                continue
+            job.next_run = now + job.every_seconds
+            try:
+                path = job.fetch(job.symbol)
+                removed = prune_price_files(path)
+                log_event(logger, logging.INFO, "scheduler.ingested",
+                          source=job.source, symbol=job.symbol, path=path, pruned=len(removed))
+            except Exception as e:  # keep the daemon alive; retry next interval
+                log_event(logger, logging.WARNING, "scheduler.ingest_failed",
+                          source=job.source, symbol=job.symbol, error=repr(e))
+
+    def run_once(self) -> Dict[str, Set[str]]:
+        self._run_due_jobs()
+        changes = self.watcher.poll()
+        failed: Set[str] = set()
+        if changes["price"] or changes["sentiment"]:
+            start = time.perf_counter()
+            failed = set(self.on_change(changes["price"], changes["sentiment"]) or ())
+            log_event(logger, logging.INFO, "scheduler.recomputed",
+                      price=sorted(changes["price"]), sentiment=sorted(changes["sentiment"]),
+                      failed=sorted(failed), ms=round((time.perf_counter() - start) * 1000, 1))
+        # only now: if on_change raised, the changes are reported again
+        self.watcher.commit(failed)
+        return changes
+
+    def run_forever(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            started = self._clock()
+            try:
+                self.run_once()
+            except Exception as e:
+                log_event(logger, logging.ERROR, "scheduler.cycle_failed", error=repr(e))
+            stop.wait(max(0.0, self.poll_seconds - (self._clock() - started)))
@@ -2,7 +2,10 @@ import os
 import pandas as pd
 from typing import Optional
 
+from src.utils.profiling import timed
 
+
+@timed("load_sentiment_csv")
 def load_sentiment_csv(
     path: str,
     asset_filter: Optional[str] = None,
@@ -0,0 +1,476 @@
+"""
+Tick/trade-level streaming ingestion with on-the-fly bar building.
+
+    source  ->  BarBuilder  ->  PriceCsvSink        (closed bars -> price store)
+                            ->  IncrementalSignal   (features + signal per new bar)
+
+- Sources yield TickBatch arrays (epoch-ms timestamp, price, quantity):
+  FileReplaySource replays a trades CSV, SocketSource reads newline-
+  delimited "ts_ms,price,qty" lines from a local TCP stream (a stand-in
+  for an exchange websocket).
+- BarBuilder aggregates a whole batch at once with ufunc.reduceat, so the
+  per-tick cost is a few array passes rather than Python work, and keeps
+  closed bars in fixed-size preallocated buffers until they are flushed.
+- IncrementalSignal keeps only the trailing FEATURE_WARMUP_BARS - 1 bars
+  and runs the batch feature/signal code on that window plus the new bars,
+  so streamed signals equal what the batch pipeline gives for those bars.
+"""
+import io
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterator, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.features.price_features import FEATURE_WARMUP_BARS
+from src.models.pipeline import price_signal_frame
+from src.utils.log import get_logger, log_event
+
+
+logger = get_logger("stream")
+
+TICK_COLUMNS = ("timestamp", "price", "qty")
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+STORE_COLUMNS = ("adj_close", "close", "high", "low", "open", "volume")  # load_price_data layout
+
+DEFAULT_BATCH_SIZE = 65_536
+DEFAULT_BAR_CAPACITY = 4_096
+
+
+class TickBatch(NamedTuple):
+    ts_ms: np.ndarray   # int64 epoch milliseconds
+    price: np.ndarray   # float64
+    qty: np.ndarray     # float64
+
+    def __len__(self) -> int:
+        return len(self.ts_ms)
+
+
+EMPTY_BATCH = TickBatch(np.empty(0, np.int64), np.empty(0), np.empty(0))
+
+
+def _batch_from_frame(df: pd.DataFrame) -> TickBatch:
+    return TickBatch(
+        df["timestamp"].to_numpy(np.int64),
+        df["price"].to_numpy(np.float64),
+        df["qty"].to_numpy(np.float64),
+    )
+
+
+# ================================================
+#  SOURCES
+# ================================================
+
+class FileReplaySource:
+    """
+    Replay a trades CSV with a "timestamp,price,qty" header (timestamp in
+    epoch milliseconds) as fast as it can be parsed.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Tick file not found: {path}")
+        self.path = path
+        self.batch_size = batch_size
+
+    def __iter__(self) -> Iterator[TickBatch]:
+        reader = pd.read_csv(
+            self.path,
+            usecols=list(TICK_COLUMNS),
+            dtype={"timestamp": np.int64, "price": np.float64, "qty": np.float64},
+            chunksize=self.batch_size,
+        )
+        with reader:
+            for chunk in reader:
+                yield _batch_from_frame(chunk)
+
+
+class SocketSource:
+    """
+    Newline-delimited "ts_ms,price,qty" trades from a TCP socket.
+
+    Complete lines are parsed in blocks of up to `batch_size` bytes'
+    worth; when no data arrives for `idle_seconds` an empty batch is
+    yielded so the consumer can close bars on wall-clock time. Iteration
+    ends when the peer closes the connection.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        idle_seconds: float = 1.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.recv_bytes = max(4096, batch_size * 32)  # ~32 bytes per trade line
+        self.idle_seconds = idle_seconds
+
+    @staticmethod
+    def _parse(block: bytes) -> TickBatch:
+        df = pd.read_csv(
+            io.BytesIO(block),
+            header=None,
+            names=list(TICK_COLUMNS),
+            dtype={"timestamp": np.int64, "price": np.float64, "qty": np.float64},
+        )
+        return _batch_from_frame(df)
+
+    def __iter__(self) -> Iterator[TickBatch]:
+        with socket.create_connection((self.host, self.port)) as sock:
+            sock.settimeout(self.idle_seconds)
+            pending = b""
+            while True:
+                try:
+                    data = sock.recv(self.recv_bytes)
+                except socket.timeout:
+                    yield EMPTY_BATCH
+                    continue
+                if not data:
+                    break
+                pending += data
+                cut = pending.rfind(b"\n") + 1
+                if cut:
+                    block, pending = pending[:cut], pending[cut:]
+                    yield self._parse(block)
+            if pending.strip():
+                yield self._parse(pending)
+
+
+def parse_source(spec: str, batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Source from "file:PATH" or "tcp:HOST:PORT".
+    """
+    kind, _, target = spec.partition(":")
+    if kind == "file" and target:
+        return FileReplaySource(target, batch_size=batch_size)
+    if kind == "tcp" and target:
+        host, _, port = target.rpartition(":")
+        if host and port.isdigit():
+            return SocketSource(host, int(port), batch_size=batch_size)
+    raise ValueError(f"Invalid tick source {spec!r}; expected file:PATH or tcp:HOST:PORT")
+
+
+# ================================================
+#  BAR BUILDER
+# ================================================
+
+class BarBuilder:
+    """
+    Incremental OHLCV bars of `interval_seconds`, labelled by bucket start
+    and anchored to the epoch (same buckets as resample_ohlcv).
+
+    A bar closes when a tick from a later bucket arrives (or on advance()).
+    Closed bars accumulate in preallocated buffers of `capacity` bars;
+    flush() hands them to `on_flush` as a DataFrame, and a full buffer is
+    flushed automatically. Ticks older than the open bar, or in a bucket
+    already closed (also by advance()), are dropped and counted in
+    `late_ticks`.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        capacity: int = DEFAULT_BAR_CAPACITY,
+        on_flush: Optional[Callable[[pd.DataFrame], None]] = None,
+    ) -> None:
+        if interval_seconds <= 0 or capacity <= 0:
+            raise ValueError("interval_seconds and capacity must be positive")
+        self.interval_ms = int(round(interval_seconds * 1000))
+        self.capacity = capacity
+        self.on_flush = on_flush
+
+        self._open_time = np.empty(capacity, dtype=np.int64)  # bucket number
+        self._ohlcv = np.empty((len(BAR_COLUMNS), capacity), dtype=np.float64)
+        self._size = 0
+
+        self._bucket: Optional[int] = None  # the open (still building) bar
+        self._closed_through: Optional[int] = None  # last closed bucket (watermark)
+        self._bar = np.zeros(len(BAR_COLUMNS), dtype=np.float64)
+
+        self.ticks = 0
+        self.late_ticks = 0
+        self.bars_closed = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        Closed bars waiting to be flushed.
+        """
+        return self._size
+
+    def add(self, ts_ms: np.ndarray, price: np.ndarray, qty: np.ndarray) -> None:
+        """
+        Fold a batch of ticks (time-ordered, as exchanges deliver them) into bars.
+        """
+        n = len(ts_ms)
+        if n == 0:
+            return
+        bucket = ts_ms // self.interval_ms
+
+        # drop late ticks: earlier than a bucket already seen, or in a closed one
+        seen = np.maximum.accumulate(bucket)
+        if self._bucket is not None:
+            np.maximum(seen, self._bucket, out=seen)
+        elif self._closed_through is not None:
+            np.maximum(seen, self._closed_through + 1, out=seen)
+        late = bucket < seen
+        if late.any():
+            keep = ~late
+            bucket, price, qty = bucket[keep], price[keep], qty[keep]
+            self.late_ticks += n - len(bucket)
+            if len(bucket) == 0:
+                self.ticks += n
+                return
+        self.ticks += n
+
+        starts = np.flatnonzero(bucket[1:] != bucket[:-1]) + 1
+        starts = np.concatenate(([0], starts))
+        ends = np.append(starts[1:], len(bucket)) - 1
+
+        buckets = bucket[starts]
+        bars = np.empty((len(BAR_COLUMNS), len(starts)), dtype=np.float64)
+        bars[0] = price[starts]
+        bars[1] = np.maximum.reduceat(price, starts)
+        bars[2] = np.minimum.reduceat(price, starts)
+        bars[3] = price[ends]
+        bars[4] = np.add.reduceat(qty, starts)
+
+        if self._bucket is not None:
+            if buckets[0] == self._bucket:
+                # first run continues the open bar
+                bars[0, 0] = self._bar[0]
+                bars[1, 0] = max(bars[1, 0], self._bar[1])
+                bars[2, 0] = min(bars[2, 0], self._bar[2])
+                bars[4, 0] += self._bar[4]
+            else:
+                self._append(np.array([self._bucket]), self._bar[:, None])
+
+        self._append(buckets[:-1], bars[:, :-1])
+        self._bucket = int(buckets[-1])
+        self._bar = bars[:, -1].copy()
+
+    def advance(self, now_ms: int) -> None:
+        """
+        Close the open bar if `now_ms` is past its bucket (quiet markets).
+        """
+        if self._bucket is not None and now_ms // self.interval_ms > self._bucket:
+            self._append(np.array([self._bucket]), self._bar[:, None])
+            self._bucket = None
+
+    def _append(self, buckets: np.ndarray, bars: np.ndarray) -> None:
+        done = 0
+        while done < len(buckets):
+            take = min(len(buckets) - done, self.capacity - self._size)
+            self._open_time[self._size:self._size + take] = buckets[done:done + take]
+            self._ohlcv[:, self._size:self._size + take] = bars[:, done:done + take]
+            self._size += take
+            done += take
+            if self._size == self.capacity:
+                self.flush()
+        self.bars_closed += len(buckets)
+        if len(buckets):
+            self._closed_through = int(buckets[-1])
+
+    def flush(self) -> pd.DataFrame:
+        """
+        Emit closed bars (DatetimeIndex 'timestamp', OHLCV columns) and
+        empty the buffer.
+        """
+        n = self._size
+        index = pd.DatetimeIndex(
+            pd.to_datetime(self._open_time[:n] * self.interval_ms, unit="ms"),
+            name="timestamp",
+        )
+        bars = pd.DataFrame(
+            {col: self._ohlcv[i, :n].copy() for i, col in enumerate(BAR_COLUMNS)},
+            index=index,
+        )
+        self._size = 0
+        if n and self.on_flush is not None:
+            self.on_flush(bars)
+        return bars
+
+
+# ================================================
+#  PRICE STORE SINK
+# ================================================
+
+class PriceCsvSink:
+    """
+    Append closed bars to a SYMBOL_YYYYMMDD_HHMMSS.csv price file in the
+    layout load_price_data() reads.
+
+    The file is created on the first write, seeded with `history`, so it
+    supersedes the previous snapshot as the symbol's latest file; later
+    writes append to it (and change its mtime/size, which is what the
+    scheduler's watcher and the API's version token look at). Streamed
+    bars not newer than the last history bar are skipped, as in
+    IncrementalSignal: a stream joined mid-bar would only have part of it.
+    """
+
+    def __init__(self, data_dir: str, symbol: str, history: Optional[pd.DataFrame] = None) -> None:
+        self.data_dir = data_dir
+        self.symbol = symbol
+        self.history = history
+        self.path: Optional[str] = None
+        self.rows = 0
+        self._last: Optional[pd.Timestamp] = None
+
+    def _create(self) -> None:
+        os.makedirs(self.data_dir, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        self.path = os.path.join(self.data_dir, f"{self.symbol}_{stamp}.csv")
+        ticker = self.symbol.replace("_", "-")
+        with open(self.path, "w") as f:
+            f.write("Price," + ",".join(STORE_COLUMNS) + "\n")
+            f.write("Ticker," + ",".join([ticker] * len(STORE_COLUMNS)) + "\n")
+            f.write("timestamp,,,,,,\n")
+            if self.history is not None and not self.history.empty:
+                self._write_rows(f, self.history)
+        self.history = None
+
+    def _write_rows(self, f, bars: pd.DataFrame) -> None:
+        rows = bars.assign(adj_close=bars.get("adj_close", bars["close"]))
+        rows[list(STORE_COLUMNS)].to_csv(f, header=False, date_format="%Y-%m-%d %H:%M:%S")
+        self.rows += len(rows)
+        self._last = rows.index[-1]
+
+    def write(self, bars: pd.DataFrame) -> None:
+        if bars.empty:
+            return
+        if self.path is None:
+            self._create()
+        if self._last is not None:
+            bars = bars[bars.index > self._last]
+        if bars.empty:
+            return
+        with open(self.path, "a") as f:
+            self._write_rows(f, bars)
+
+
+# ================================================
+#  INCREMENTAL FEATURES / SIGNAL
+# ================================================
+
+class IncrementalSignal:
+    """
+    Features + rule-based signal for streamed bars.
+
+    Holds the last FEATURE_WARMUP_BARS - 1 bars; update() computes only
+    the new bars, through the same price_signal_frame() as the batch
+    path. Rows come back once the window is warm (50 bars of history).
+    """
+
+    def __init__(self, history: Optional[pd.DataFrame] = None) -> None:
+        self.window = FEATURE_WARMUP_BARS - 1
+        self._bars = pd.DataFrame(columns=list(BAR_COLUMNS), dtype=np.float64)
+        if history is not None and not history.empty:
+            self._bars = history[list(BAR_COLUMNS)].iloc[-self.window:]
+
+    def update(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Signal frame rows (features + 'signal') for the bars just closed.
+        """
+        bars = bars[list(BAR_COLUMNS)]
+        if not self._bars.empty:
+            bars = bars[bars.index > self._bars.index[-1]]
+            frame = pd.concat([self._bars, bars])
+        else:
+            frame = bars
+        if bars.empty:
+            return price_signal_frame(frame.iloc[:0])
+        self._bars = frame.iloc[-self.window:]
+        return price_signal_frame(frame, tail=len(bars))
+
+
+# ================================================
+#  STREAM
+# ================================================
+
+@dataclass
+class StreamStats:
+    ticks: int = 0
+    late_ticks: int = 0
+    bars: int = 0
+    signals: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "late_ticks": self.late_ticks,
+            "bars": self.bars,
+            "signals": self.signals,
+            "seconds": round(self.seconds, 3),
+            "ticks_per_second": round(self.ticks_per_second),
+        }
+
+
+class TickStream:
+    """
+    Drive a source through a BarBuilder; after every batch that closed
+    bars, write them to the sink and feed them to the incremental signal,
+    passing the new signal rows to `on_signal`.
+    """
+
+    def __init__(
+        self,
+        source,
+        builder: BarBuilder,
+        sink: Optional[PriceCsvSink] = None,
+        signals: Optional[IncrementalSignal] = None,
+        on_signal: Optional[Callable[[pd.DataFrame], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.source = source
+        self.builder = builder
+        self.sink = sink
+        self.signals = signals
+        self.on_signal = on_signal
+        self._clock = clock
+        self.stats = StreamStats()
+        builder.on_flush = self._handle_bars
+
+    def _handle_bars(self, bars: pd.DataFrame) -> None:
+        self.stats.bars += len(bars)
+        if self.sink is not None:
+            self.sink.write(bars)
+        if self.signals is not None:
+            rows = self.signals.update(bars)
+            self.stats.signals += len(rows)
+            if self.on_signal is not None and not rows.empty:
+                self.on_signal(rows)
+        log_event(logger, logging.DEBUG, "stream.bars",
+                  bars=len(bars), first=str(bars.index[0]), last=str(bars.index[-1]))
+
+    def run(self, stop: Optional[threading.Event] = None) -> StreamStats:
+        start = time.perf_counter()
+        try:
+            for batch in self.source:
+                if len(batch):
+                    self.builder.add(batch.ts_ms, batch.price, batch.qty)
+                else:
+                    self.builder.advance(int(self._clock() * 1000))
+                if self.builder.pending:
+                    self.builder.flush()
+                if stop is not None and stop.is_set():
+                    break
+        finally:
+            self.builder.flush()
+            self.stats.ticks = self.builder.ticks
+            self.stats.late_ticks = self.builder.late_ticks
+            self.stats.seconds = time.perf_counter() - start
+            log_event(logger, logging.INFO, "stream.finished", **self.stats.as_dict())
+        return self.stats
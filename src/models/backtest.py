@@ -0,0 +1,264 @@
+"""
+Portfolio-level vectorized backtest over a (time x asset) signal panel.
+
+At bar t the portfolio earns held[t] . r[t], where r[t] is each asset's
+simple return from t-1 to t and held[t] are the weights set at t-1 from
+that bar's signals; it then rebalances to the target weights for t and
+pays (fee_bps + slippage_bps) on the traded notional |w[t] - w[t-1]|.
+Equity compounds the net portfolio return (unlike summing per-asset log
+returns, this is valid across assets and with costs).
+
+Weights are rebalanced to target every bar (no drift between bars), the
+usual approximation for a vectorized backtest. A bar where an asset has
+no close (NaN) can't be traded: the asset keeps the weight it had, and
+its next return is measured from the last valid close, so the position
+earns the move across the gap without paying to close and reopen.
+
+PortfolioBacktester consumes the panel in time chunks and carries only
+the last close, the last weights and the running equity between them, so
+memory is bounded by the chunk size, not the history length.
+"""
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+SIZING_METHODS = ("equal", "active", "inverse_vol")
+DEFAULT_CHUNK_ROWS = 4_096
+HOURS_PER_YEAR = 24 * 365  # crypto trades around the clock
+
+
+@dataclass
+class BacktestConfig:
+    """
+    - sizing: "equal"       signal * gross_leverage / n_assets
+              "active"      gross_leverage split over assets with a signal
+              "inverse_vol" like "active", weighted by 1 / vol (needs vol)
+    - max_weight: cap on |weight| per asset (None = no cap)
+    - fee_bps, slippage_bps: charged on traded notional, in basis points
+    """
+
+    sizing: str = "equal"
+    gross_leverage: float = 1.0
+    max_weight: Optional[float] = None
+    fee_bps: float = 10.0
+    slippage_bps: float = 5.0
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+    periods_per_year: float = HOURS_PER_YEAR
+
+    def __post_init__(self) -> None:
+        if self.sizing not in SIZING_METHODS:
+            raise ValueError(f"Unknown sizing '{self.sizing}'. Use one of {list(SIZING_METHODS)}")
+        if self.chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+
+    @property
+    def cost_rate(self) -> float:
+        return (self.fee_bps + self.slippage_bps) / 10_000.0
+
+
+@dataclass
+class BacktestResult:
+    """
+    Per-bar portfolio series (length T) plus per-asset totals (length N).
+    """
+
+    returns: np.ndarray         # net of costs
+    gross_returns: np.ndarray
+    costs: np.ndarray
+    turnover: np.ndarray        # sum |w[t] - w[t-1]|
+    exposure: np.ndarray        # sum |w[t]|
+    equity: np.ndarray          # starts from 1.0
+    asset_pnl: np.ndarray       # sum over time of held * r, per asset
+    periods_per_year: float = HOURS_PER_YEAR
+    index: Optional[pd.Index] = None
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "return": self.returns,
+                "gross_return": self.gross_returns,
+                "cost": self.costs,
+                "turnover": self.turnover,
+                "exposure": self.exposure,
+                "equity": self.equity,
+            },
+            index=self.index,
+        )
+
+    def summary(self) -> dict:
+        n = len(self.returns)
+        if n == 0:
+            return {"bars": 0}
+        final = float(self.equity[-1])
+        years = n / self.periods_per_year
+        std = float(self.returns.std())
+        peak = np.maximum.accumulate(np.concatenate(([1.0], self.equity)))[1:]
+        return {
+            "bars": n,
+            "final_equity": final,
+            "total_return": final - 1.0,
+            "cagr": final ** (1.0 / years) - 1.0 if final > 0 else -1.0,
+            "sharpe": float(self.returns.mean()) / std * np.sqrt(self.periods_per_year) if std else 0.0,
+            "max_drawdown": float((self.equity / peak - 1.0).min()),
+            "total_costs": float(self.costs.sum()),
+            "mean_turnover": float(self.turnover.mean()),
+            "mean_exposure": float(self.exposure.mean()),
+        }
+
+
+class PortfolioBacktester:
+    """
+    Chunked backtest: call update(close, signal[, vol]) with consecutive
+    (rows x n_assets) chunks, then result().
+
+    close may be float32 or float64 (NaN = no bar); signal is -1/0/+1.
+    """
+
+    def __init__(self, n_assets: int, config: Optional[BacktestConfig] = None) -> None:
+        self.n_assets = n_assets
+        self.config = config or BacktestConfig()
+        self._last_close = np.full(n_assets, np.nan)
+        self._last_weights = np.zeros(n_assets)
+        self._equity = 1.0
+        self._asset_pnl = np.zeros(n_assets)
+        self._parts = []
+
+    def target_weights(self, signal: np.ndarray, vol: Optional[np.ndarray] = None) -> np.ndarray:
+        cfg = self.config
+        s = np.asarray(signal, dtype=np.float64)
+        if cfg.sizing == "equal":
+            w = s * (cfg.gross_leverage / self.n_assets)
+        else:
+            if cfg.sizing == "inverse_vol":
+                if vol is None:
+                    raise ValueError("inverse_vol sizing requires vol")
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    raw = s / np.asarray(vol, dtype=np.float64)
+                raw[~np.isfinite(raw)] = 0.0
+            else:
+                raw = s
+            total = np.abs(raw).sum(axis=1, keepdims=True)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                w = np.where(total > 0, raw * (cfg.gross_leverage / total), 0.0)
+        if cfg.max_weight is not None:
+            np.clip(w, -cfg.max_weight, cfg.max_weight, out=w)
+        return w
+
+    def update(self, close: np.ndarray, signal: np.ndarray, vol: Optional[np.ndarray] = None) -> None:
+        close = np.asarray(close, dtype=np.float64)
+        if close.ndim != 2 or close.shape[1] != self.n_assets or signal.shape != close.shape:
+            raise ValueError(f"Expected (rows x {self.n_assets}) close and signal chunks")
+        rows = len(close)
+        if rows == 0:
+            return
+
+        trading = ~np.isnan(close)
+        last_close = _ffill(close, trading, self._last_close)
+        prev = np.empty_like(close)
+        prev[0] = self._last_close
+        prev[1:] = last_close[:-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = close / prev - 1.0
+        r[~np.isfinite(r)] = 0.0  # no bar now, or none yet: nothing earned
+
+        # no trading without a bar: keep the weight from the bar before
+        w = _ffill(self.target_weights(signal, vol), trading, self._last_weights)
+        held = np.empty_like(w)
+        held[0] = self._last_weights
+        held[1:] = w[:-1]
+
+        contrib = held * r
+        gross = contrib.sum(axis=1)
+        self._asset_pnl += contrib.sum(axis=0)
+        turnover = np.abs(w - held).sum(axis=1)
+        costs = turnover * self.config.cost_rate
+        net = gross - costs
+        equity = self._equity * np.cumprod(1.0 + net)
+
+        self._parts.append((net, gross, costs, turnover, np.abs(w).sum(axis=1), equity))
+        self._equity = float(equity[-1])
+        self._last_weights = w[-1].copy()
+        self._last_close = last_close[-1].copy()  # NaN only before an asset's first bar
+
+    def result(self, index: Optional[pd.Index] = None) -> BacktestResult:
+        cols = [np.concatenate(c) if c else np.empty(0) for c in zip(*self._parts)] or [np.empty(0)] * 6
+        return BacktestResult(
+            returns=cols[0],
+            gross_returns=cols[1],
+            costs=cols[2],
+            turnover=cols[3],
+            exposure=cols[4],
+            equity=cols[5],
+            asset_pnl=self._asset_pnl.copy(),
+            periods_per_year=self.config.periods_per_year,
+            index=index,
+        )
+
+
+def _ffill(x: np.ndarray, valid: np.ndarray, carry: np.ndarray) -> np.ndarray:
+    """
+    x with each column's invalid rows replaced by its last valid row above
+    (or by carry, the value before the chunk).
+    """
+    if valid.all():
+        return x
+    rows = np.where(valid, np.arange(len(x))[:, None], -1)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = np.take_along_axis(x, np.maximum(rows, 0), axis=0)
+    return np.where(rows >= 0, filled, carry[None, :])
+
+
+def iter_chunks(
+    close: np.ndarray,
+    signal: np.ndarray,
+    vol: Optional[np.ndarray] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterable[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]]:
+    """
+    Row slices (views) of the panel arrays.
+    """
+    for start in range(0, len(close), chunk_rows):
+        stop = start + chunk_rows
+        yield close[start:stop], signal[start:stop], None if vol is None else vol[start:stop]
+
+
+def backtest_portfolio(
+    close: np.ndarray,
+    signal: np.ndarray,
+    config: Optional[BacktestConfig] = None,
+    vol: Optional[np.ndarray] = None,
+    index: Optional[pd.Index] = None,
+) -> BacktestResult:
+    """
+    Backtest (time x asset) close / signal arrays in time chunks of
+    config.chunk_rows.
+    """
+    config = config or BacktestConfig()
+    bt = PortfolioBacktester(close.shape[1], config)
+    for c, s, v in iter_chunks(close, signal, vol, config.chunk_rows):
+        bt.update(c, s, v)
+    return bt.result(index=index)
+
+
+def backtest_panel(
+    result,
+    signal_col: str = "signal_combined",
+    config: Optional[BacktestConfig] = None,
+) -> BacktestResult:
+    """
+    Backtest a scan_universe() PanelResult; inverse_vol sizing uses its vol_20.
+    """
+    if signal_col not in result.signals:
+        raise ValueError(f"Signal '{signal_col}' not in panel (have {list(result.signals)})")
+    config = config or BacktestConfig()
+    vol = result.features.get("vol_20") if config.sizing == "inverse_vol" else None
+    return backtest_portfolio(
+        result.panel.fields["close"],
+        result.signals[signal_col],
+        config=config,
+        vol=vol,
+        index=result.panel.index,
+    )
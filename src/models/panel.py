@@ -0,0 +1,131 @@
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.features.panel import (
+    PANEL_FEATURES,
+    PricePanel,
+    build_panel_features,
+    cross_sectional_rank,
+    load_price_panel,
+)
+from src.features.sentiment_features import (
+    aggregate_sentiment_to_panel,
+    apply_sentiment_scorer,
+    get_sentiment_scorer,
+)
+from src.ingestion.sentiment_ingestion import load_sentiment_csv
+from src.models.signal_engine import (
+    generate_combined_signal_panel,
+    generate_rule_based_signal_panel,
+)
+
+
+DEFAULT_RANK_FIELDS = ("return", "rsi_14", "vol_20")
+
+
+@dataclass
+class PanelResult:
+    """
+    Features, signals and cross-sectional ranks for a universe of assets.
+    Every array is (time x asset), aligned with panel.index / panel.assets.
+    """
+
+    panel: PricePanel
+    features: Dict[str, np.ndarray]
+    signals: Dict[str, np.ndarray]
+    ranks: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def valid_rows(self, j: int) -> np.ndarray:
+        """
+        Rows where every price feature of asset j is defined
+        (the rows build_price_feature_set keeps after dropna()).
+        """
+        mask = ~np.isnan(self.panel.fields["close"][:, j])
+        for name in PANEL_FEATURES:
+            mask &= ~np.isnan(self.features[name][:, j])
+        return mask
+
+    def asset_frame(self, asset: str) -> pd.DataFrame:
+        """
+        Per-asset frame shaped like the single-asset pipeline output.
+        """
+        j = self.panel.assets.index(asset)
+        rows = self.valid_rows(j)
+
+        data = {name: arr[rows, j] for name, arr in self.panel.fields.items()}
+        data.update({name: arr[rows, j] for name, arr in self.features.items()})
+        data.update({name: arr[rows, j] for name, arr in self.signals.items()})
+        data.update({f"rank_{name}": arr[rows, j] for name, arr in self.ranks.items()})
+        return pd.DataFrame(data, index=self.panel.index[rows])
+
+    def latest(self) -> pd.DataFrame:
+        """
+        One row per asset: its last valid bar, signals and ranks.
+        """
+        rows = []
+        for j, asset in enumerate(self.panel.assets):
+            valid = np.flatnonzero(self.valid_rows(j))
+            if not len(valid):
+                continue
+            t = valid[-1]
+            row = {"asset": asset, "timestamp": self.panel.index[t]}
+            row.update({name: arr[t, j].item() for name, arr in self.signals.items()})
+            row.update({f"rank_{name}": arr[t, j].item() for name, arr in self.ranks.items()})
+            rows.append(row)
+        return pd.DataFrame(rows).set_index("asset") if rows else pd.DataFrame()
+
+
+def scan_universe(
+    assets: Sequence[str],
+    mode: str = "combined",
+    data_dir: str = "data",
+    sentiment_path: Optional[str] = None,
+    scorer: Optional[Callable[[str], float]] = None,
+    rank_fields: Sequence[str] = DEFAULT_RANK_FIELDS,
+) -> PanelResult:
+    """
+    Features and signals for many assets in one vectorized pass.
+
+    - mode="price_only": 'signal'
+    - mode="combined":   also 'sentiment_score', 'signal_sentiment', 'signal_combined'
+      (sentiment CSV is loaded and scored once for the whole universe)
+    """
+    panel = load_price_panel(assets, data_dir=data_dir)
+
+    features = build_panel_features(panel)
+    price_signal = generate_rule_based_signal_panel({**panel.fields, **features})
+    signals: Dict[str, np.ndarray] = {"signal": price_signal}
+
+    if mode == "combined":
+        if sentiment_path is None:
+            raise ValueError("combined mode requires sentiment_path")
+        sent_raw = load_sentiment_csv(sentiment_path)
+        sent_raw = sent_raw[sent_raw["asset"].isin(list(assets))]
+        if sent_raw.empty:
+            sentiment = np.full(price_signal.shape, np.nan)
+        else:
+            sent_scored = apply_sentiment_scorer(sent_raw, scorer=scorer or get_sentiment_scorer())
+            sentiment = aggregate_sentiment_to_panel(sent_scored, panel.index, panel.assets).to_numpy()
+        signals["sentiment_score"] = sentiment
+        signals.update(generate_combined_signal_panel(price_signal, sentiment))
+
+    ranks = {name: cross_sectional_rank(features[name]) for name in rank_fields}
+    return PanelResult(panel=panel, features=features, signals=signals, ranks=ranks)
+
+
+def universe_assets(data_dir: str = "data") -> List[str]:
+    """
+    Assets with a SYMBOL_YYYYMMDD_HHMMSS.csv price file in data_dir, e.g. 'BTC-USD'.
+    """
+    rx = re.compile(r"^(.+)_\d{8}_\d{6}\.csv$")
+    found = set()
+    for name in os.listdir(data_dir):
+        m = rx.match(name)
+        if m:
+            found.add(m.group(1).replace("_", "-"))
+    return sorted(found)
@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional, Sequence
+
+import pandas as pd
+
+from src.features.feature_graph import STANDARD_FEATURES, feature_graph
+from src.features.price_features import build_price_feature_set
+from src.features.sentiment_features import (
+    aggregate_sentiment_to_prices,
+    apply_sentiment_scorer,
+    get_sentiment_scorer,
+    scoring_stats,
+)
+from src.models.signal_engine import (
+    RULE_SIGNAL_FEATURES,
+    generate_combined_signal,
+    generate_rule_based_signal,
+)
+
+
+@dataclass
+class SignalComputation:
+    """
+    One run of the signal pipeline for an asset, shared by /signal,
+    /signal/explain and batch consumers.
+
+    frame holds price features + 'signal' (plus 'sentiment_score',
+    'signal_sentiment', 'signal_combined' in combined mode) for the rows
+    that were computed: the last `tail` bars, or the full history.
+    """
+
+    asset: str
+    mode: str
+    interval: str
+    frame: pd.DataFrame
+    sentiment_engine: Optional[str] = None
+
+    @property
+    def latest_timestamp(self) -> pd.Timestamp:
+        return self.frame.index[-1]
+
+    @property
+    def price_signal(self) -> int:
+        return int(self.frame["signal"].iloc[-1])
+
+    @property
+    def signal(self) -> int:
+        """
+        Latest signal for the mode: combined if sentiment was used, else price.
+        """
+        col = "signal_combined" if self.mode == "combined" else "signal"
+        return int(self.frame[col].iloc[-1])
+
+    @property
+    def sentiment(self) -> Optional[float]:
+        """
+        Latest aligned sentiment; None in price_only mode or before the
+        first headline.
+        """
+        if "sentiment_score" not in self.frame.columns:
+            return None
+        value = self.frame["sentiment_score"].iloc[-1]
+        return None if pd.isna(value) else float(value)
+
+
+def price_signal_frame(
+    price: pd.DataFrame,
+    tail: Optional[int] = None,
+    columns: Sequence[str] = STANDARD_FEATURES,
+    cache_key: Optional[Hashable] = None,
+    version: Optional[Hashable] = None,
+) -> pd.DataFrame:
+    """
+    Features + rule-based 'signal' for a price frame. With `tail`, only
+    the last `tail` bars (plus the warm-up window of `columns`) are
+    computed; those rows match the full computation. Consumers that only
+    need the signal can pass columns=RULE_SIGNAL_FEATURES. cache_key/version
+    memoize the feature intermediates (see build_price_feature_set).
+    """
+    columns = tuple(dict.fromkeys((*columns, *RULE_SIGNAL_FEATURES)))
+    if tail is not None:
+        price = price.iloc[-(tail + feature_graph.warmup_bars(columns) - 1):]
+    features = build_price_feature_set(price, columns=columns, cache_key=cache_key, version=version)
+    return generate_rule_based_signal(features)
+
+
+def headlines_for_window(sentiment_df: pd.DataFrame, start: pd.Timestamp) -> pd.DataFrame:
+    """
+    Headlines needed to forward-fill sentiment onto bars from `start` on:
+    everything after it plus the last headline(s) at or before it.
+    """
+    ts = pd.to_datetime(sentiment_df["timestamp"], utc=True)
+    start = pd.Timestamp(start)
+    start = start.tz_localize("UTC") if start.tzinfo is None else start.tz_convert("UTC")
+
+    before = ts[ts <= start]
+    if before.empty:
+        return sentiment_df
+    return sentiment_df[ts >= before.max()]
+
+
+def compute_signal(
+    asset: str,
+    mode: str,
+    interval: str,
+    price_sig: pd.DataFrame,
+    sentiment_df: Optional[pd.DataFrame] = None,
+    scorer: Optional[Callable[[str], float]] = None,
+    tail: Optional[int] = None,
+) -> SignalComputation:
+    """
+    Run the rest of the pipeline on a price-signal frame.
+
+    - price_sig: output of price_signal_frame (or a slice of it)
+    - sentiment_df: raw headlines for the asset (required in combined mode)
+    - tail: keep only the last `tail` bars and score only the headlines
+      they need; None keeps (and scores) the full history
+    """
+    if price_sig.empty:
+        raise ValueError(f"No complete feature rows for {asset} at {interval}")
+    frame = price_sig if tail is None else price_sig.iloc[-tail:]
+    engine = None
+
+    if mode == "combined":
+        if sentiment_df is None:
+            raise ValueError("combined mode requires sentiment_df")
+        if tail is not None:
+            sentiment_df = headlines_for_window(sentiment_df, frame.index[0])
+        with scoring_stats() as stats:
+            scored = apply_sentiment_scorer(sentiment_df, scorer=scorer or get_sentiment_scorer())
+        aligned = aggregate_sentiment_to_prices(scored, frame)
+        frame = generate_combined_signal(frame, aligned)
+        engine = stats.engine_label()
+
+    return SignalComputation(
+        asset=asset,
+        mode=mode,
+        interval=interval,
+        frame=frame,
+        sentiment_engine=engine,
+    )
@@ -0,0 +1,358 @@
+"""
+Declarative signal rules compiled to vectorized expressions.
+
+A rule set is a plain dict (or JSON file):
+
+    {
+      "name": "ma_rsi",
+      "buy":  {"all": ["close > ma_20", "rsi_14 > 55"]},
+      "sell": {"all": ["close < ma_20", "rsi_14 < 45"]},
+      "sentiment": {"buy_above": 0.55, "sell_below": 0.45, "policy": "veto"}
+    }
+
+Conditions are "<operand> <op> <operand>" where an operand is a feature
+column or a number and op is one of > >= < <= == !=. They nest with
+{"all": [...]}, {"any": [...]} and {"not": ...}. When both buy and sell
+hold, sell wins (same as generate_rule_based_signal).
+
+Sentiment policies (how the sentiment signal adjusts the price signal):
+    veto            generate_combined_signal's rule: neutral keeps price,
+                    flat price follows sentiment, disagreement flattens
+    confirm         trade only when price and sentiment agree
+    price_only      ignore sentiment
+    sentiment_only  ignore price
+
+Each rule set is parsed once into an expression tree (cached by its
+canonical JSON) and compiled to a numexpr expression when numexpr is
+installed, or to a NumPy closure otherwise. Columns enter numexpr under
+aliases, so any feature name works (e.g. 'return', a Python keyword).
+
+The signal pipeline (generate_rule_based_signal and the panel scan) runs
+active_rule_set(): the first rule set in the JSON file SIGNAL_RULES_PATH
+points to, or DEFAULT_RULE_SET.
+"""
+import json
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.features.indicators import compute_indicator_arrays, indicator_for_column
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+
+RSI_BUY_LEVEL = 55
+RSI_SELL_LEVEL = 45
+SENTIMENT_BUY_THRESHOLD = 0.55
+SENTIMENT_SELL_THRESHOLD = 0.45
+
+DEFAULT_RULE_SET: Dict[str, Any] = {
+    "name": "default",
+    "buy": {"all": ["close > ma_20", f"rsi_14 > {RSI_BUY_LEVEL}"]},
+    "sell": {"all": ["close < ma_20", f"rsi_14 < {RSI_SELL_LEVEL}"]},
+    "sentiment": {
+        "buy_above": SENTIMENT_BUY_THRESHOLD,
+        "sell_below": SENTIMENT_SELL_THRESHOLD,
+        "policy": "veto",
+    },
+}
+SIGNAL_RULES_PATH = os.getenv("SIGNAL_RULES_PATH")
+
+SENTIMENT_POLICIES = ("veto", "confirm", "price_only", "sentiment_only")
+# raw bar columns; every other column a rule reads is a derived feature
+PRICE_COLUMNS = frozenset({"open", "high", "low", "close", "adj_close", "volume"})
+
+_OPERAND = r"([A-Za-z_][A-Za-z0-9_]*|-?\d+(?:\.\d+)?)"
+_CONDITION_RX = re.compile(rf"^\s*{_OPERAND}\s*(>=|<=|==|!=|>|<)\s*{_OPERAND}\s*$")
+_NUMBER_RX = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+_NP_OPS: Dict[str, Callable[[Any, Any], np.ndarray]] = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+def _combine_signals(signal_price: np.ndarray, signal_sentiment: np.ndarray) -> np.ndarray:
+    """
+    The "veto" policy, shared by the single-asset and panel paths
+    (see generate_combined_signal).
+    """
+    sp, ss = signal_price, signal_sentiment
+    return np.where(ss == 0, sp, np.where(sp == 0, ss, np.where(sp == ss, sp, 0)))
+
+
+# ================================================
+#  PARSING (dict -> expression tree)
+# ================================================
+
+# Tree nodes are tuples:
+#   ("cmp", op, lhs, rhs)  lhs/rhs: ("col", name) | ("num", value)
+#   ("all", (node, ...)) | ("any", (node, ...)) | ("not", node)
+
+def _parse_operand(token: str) -> tuple:
+    if _NUMBER_RX.match(token):
+        return ("num", float(token))
+    return ("col", token)
+
+
+def _parse_condition(spec: Union[str, dict, list]) -> tuple:
+    if isinstance(spec, str):
+        m = _CONDITION_RX.match(spec)
+        if not m:
+            raise ValueError(f"Invalid rule condition: {spec!r}")
+        return ("cmp", m.group(2), _parse_operand(m.group(1)), _parse_operand(m.group(3)))
+
+    if isinstance(spec, list):
+        return ("all", tuple(_parse_condition(s) for s in spec))
+
+    if isinstance(spec, dict) and len(spec) == 1:
+        (key, value), = spec.items()
+        if key in ("all", "any"):
+            if not isinstance(value, list) or not value:
+                raise ValueError(f"'{key}' needs a non-empty list of conditions")
+            return (key, tuple(_parse_condition(s) for s in value))
+        if key == "not":
+            return ("not", _parse_condition(value))
+
+    raise ValueError(f"Invalid rule condition: {spec!r}")
+
+
+def _columns(node: tuple) -> FrozenSet[str]:
+    kind = node[0]
+    if kind == "cmp":
+        return frozenset(arg[1] for arg in node[2:] if arg[0] == "col")
+    if kind == "not":
+        return _columns(node[1])
+    return frozenset().union(*(_columns(child) for child in node[1]))
+
+
+# ================================================
+#  COMPILATION (expression tree -> callable)
+# ================================================
+
+def _numexpr_operand(arg: tuple, aliases: Dict[str, str]) -> str:
+    return aliases[arg[1]] if arg[0] == "col" else repr(arg[1])
+
+
+def _to_numexpr(node: tuple, aliases: Dict[str, str]) -> str:
+    """
+    numexpr source for a tree; columns are written as aliases[name].
+    """
+    kind = node[0]
+    if kind == "cmp":
+        _, op, lhs, rhs = node
+        return f"({_numexpr_operand(lhs, aliases)} {op} {_numexpr_operand(rhs, aliases)})"
+    if kind == "not":
+        return f"(~{_to_numexpr(node[1], aliases)})"
+    joiner = " & " if kind == "all" else " | "
+    return "(" + joiner.join(_to_numexpr(child, aliases) for child in node[1]) + ")"
+
+
+def _to_numpy(node: tuple) -> Callable[[Dict[str, np.ndarray]], np.ndarray]:
+    kind = node[0]
+    if kind == "cmp":
+        _, op, lhs, rhs = node
+        fn = _NP_OPS[op]
+        get_l = (lambda cols, n=lhs[1]: cols[n]) if lhs[0] == "col" else (lambda cols, v=lhs[1]: v)
+        get_r = (lambda cols, n=rhs[1]: cols[n]) if rhs[0] == "col" else (lambda cols, v=rhs[1]: v)
+
+        def compare(cols):
+            with np.errstate(invalid="ignore"):
+                return fn(get_l(cols), get_r(cols))
+        return compare
+
+    if kind == "not":
+        inner = _to_numpy(node[1])
+        return lambda cols: ~inner(cols)
+
+    children = [_to_numpy(child) for child in node[1]]
+    reduce = np.logical_and if kind == "all" else np.logical_or
+
+    def combine(cols):
+        out = children[0](cols)
+        for child in children[1:]:
+            out = reduce(out, child(cols))
+        return out
+    return combine
+
+
+def _compile(node: tuple, use_numexpr: bool = numexpr is not None) -> Callable[[Dict[str, np.ndarray]], np.ndarray]:
+    if use_numexpr:
+        # column names may be keywords ('return') or numexpr functions ('abs')
+        aliases = {name: f"c{i}" for i, name in enumerate(sorted(_columns(node)))}
+        expr = _to_numexpr(node, aliases)
+        return lambda cols: numexpr.evaluate(
+            expr, local_dict={alias: cols[name] for name, alias in aliases.items()}
+        )
+    return _to_numpy(node)
+
+
+@dataclass(frozen=True)
+class CompiledRuleSet:
+    name: str
+    buy: Callable[[Dict[str, np.ndarray]], np.ndarray]
+    sell: Callable[[Dict[str, np.ndarray]], np.ndarray]
+    columns: FrozenSet[str]
+    buy_above: Optional[float] = None
+    sell_below: Optional[float] = None
+    policy: Optional[str] = None
+
+    @property
+    def features(self) -> tuple:
+        """
+        Derived feature columns the rules read (everything but raw bar columns).
+        """
+        return tuple(sorted(self.columns - PRICE_COLUMNS))
+
+    def price_signal(self, cols: Dict[str, np.ndarray], shape) -> np.ndarray:
+        """
+        int8 signal of `shape` (a length, or (time x asset) for a panel);
+        sell wins where both hold.
+        """
+        signal = np.zeros(shape, dtype=np.int8)
+        signal[np.broadcast_to(self.buy(cols), signal.shape)] = 1
+        signal[np.broadcast_to(self.sell(cols), signal.shape)] = -1
+        return signal
+
+    def sentiment_signal(self, sentiment: np.ndarray) -> np.ndarray:
+        """
+        +1 above buy_above, -1 below sell_below; missing counts as neutral (0.5).
+        """
+        if self.policy is None:
+            raise ValueError(f"Rule set '{self.name}' has no sentiment section")
+        s = np.nan_to_num(np.asarray(sentiment, dtype=np.float64), nan=0.5)
+        ss = np.zeros(s.shape, dtype=np.int8)
+        ss[s > self.buy_above] = 1
+        ss[s < self.sell_below] = -1
+        return ss
+
+    def combined_signal(self, price_signal: np.ndarray, sentiment: np.ndarray) -> np.ndarray:
+        return self.combine(price_signal, self.sentiment_signal(sentiment))
+
+    def combine(self, price_signal: np.ndarray, sentiment_signal: np.ndarray) -> np.ndarray:
+        """
+        Apply the sentiment policy to a price signal and a sentiment signal.
+        """
+        sp, ss = price_signal, sentiment_signal
+        if self.policy == "confirm":
+            out = np.where(sp == ss, sp, 0)
+        elif self.policy == "price_only":
+            out = sp
+        elif self.policy == "sentiment_only":
+            out = ss
+        else:  # veto
+            out = _combine_signals(sp, ss)
+        return np.asarray(out, dtype=np.int8)
+
+
+@lru_cache(maxsize=256)
+def _compile_canonical(canonical: str) -> CompiledRuleSet:
+    spec = json.loads(canonical)
+    if "buy" not in spec or "sell" not in spec:
+        raise ValueError("Rule set needs 'buy' and 'sell' conditions")
+
+    buy_tree = _parse_condition(spec["buy"])
+    sell_tree = _parse_condition(spec["sell"])
+
+    sentiment = spec.get("sentiment") or {}
+    policy = sentiment.get("policy", "veto") if sentiment else None
+    if policy is not None and policy not in SENTIMENT_POLICIES:
+        raise ValueError(f"Unknown sentiment policy '{policy}'. Use one of {SENTIMENT_POLICIES}")
+
+    return CompiledRuleSet(
+        name=spec.get("name", "rules"),
+        buy=_compile(buy_tree),
+        sell=_compile(sell_tree),
+        columns=_columns(buy_tree) | _columns(sell_tree),
+        buy_above=float(sentiment.get("buy_above", 0.55)) if sentiment else None,
+        sell_below=float(sentiment.get("sell_below", 0.45)) if sentiment else None,
+        policy=policy,
+    )
+
+
+def compile_rule_set(spec: Dict[str, Any]) -> CompiledRuleSet:
+    """
+    Parse and compile a rule set; identical specs share one compiled object.
+    """
+    return _compile_canonical(json.dumps(spec, sort_keys=True))
+
+
+def load_rule_sets(path: str) -> List[Dict[str, Any]]:
+    """
+    Read one rule set or a list of rule sets from a JSON file.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    return data if isinstance(data, list) else [data]
+
+
+@lru_cache(maxsize=1)
+def active_rule_set() -> CompiledRuleSet:
+    """
+    The rule set the signal pipeline runs: the first one in
+    SIGNAL_RULES_PATH, else DEFAULT_RULE_SET. Combined mode needs its
+    sentiment section.
+    """
+    if SIGNAL_RULES_PATH:
+        rule_sets = load_rule_sets(SIGNAL_RULES_PATH)
+        if not rule_sets:
+            raise ValueError(f"No rule sets in {SIGNAL_RULES_PATH}")
+        return compile_rule_set(rule_sets[0])
+    return compile_rule_set(DEFAULT_RULE_SET)
+
+
+# ================================================
+#  EVALUATION
+# ================================================
+
+def evaluate_rule_sets(
+    df: pd.DataFrame,
+    rule_sets: Sequence[Union[Dict[str, Any], CompiledRuleSet]],
+    sentiment: Optional[Union[pd.Series, np.ndarray]] = None,
+) -> pd.DataFrame:
+    """
+    Evaluate many rule sets against one frame in a single call.
+
+    Columns referenced by any rule set but missing from df are computed
+    once with the indicator engine (so a raw OHLCV frame is enough).
+    Returns 'signal_<name>' per rule set, plus 'signal_combined_<name>' for
+    rule sets with a sentiment section when `sentiment` is given.
+    """
+    compiled = [r if isinstance(r, CompiledRuleSet) else compile_rule_set(r) for r in rule_sets]
+    names = [r.name for r in compiled]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Rule set names must be unique: {names}")
+
+    needed = frozenset().union(*(r.columns for r in compiled))
+    present = [c for c in needed if c in df.columns]
+    missing = [c for c in needed if c not in df.columns]
+
+    cols: Dict[str, np.ndarray] = {
+        c: np.ascontiguousarray(df[c].to_numpy(dtype=np.float64)) for c in present
+    }
+    if missing:
+        computed = compute_indicator_arrays(df, sorted({indicator_for_column(c) for c in missing}))
+        cols.update({c: computed[c] for c in missing})
+
+    sent = None if sentiment is None else np.asarray(sentiment, dtype=np.float64)
+
+    out: Dict[str, np.ndarray] = {}
+    for rule in compiled:
+        price_signal = rule.price_signal(cols, len(df))
+        out[f"signal_{rule.name}"] = price_signal
+        if sent is not None and rule.policy is not None:
+            out[f"signal_combined_{rule.name}"] = rule.combined_signal(price_signal, sent)
+
+    return pd.DataFrame(out, index=df.index)
@@ -1,36 +1,56 @@
+from typing import Dict, Optional
+
+import numpy as np
 import pandas as pd
 
+from src.models.rule_engine import CompiledRuleSet, active_rule_set
+from src.utils.profiling import timed
+
+
+# derived feature columns the rule-based signal reads (besides raw bars)
+RULE_SIGNAL_FEATURES = active_rule_set().features
 
-def generate_rule_based_signal(df: pd.DataFrame) -> pd.DataFrame:
+
+def _rule_columns(source, rule_set: CompiledRuleSet, where: str) -> Dict[str, np.ndarray]:
+    """
+    float64 arrays of the columns the rule set reads, from a DataFrame or
+    a dict of arrays.
     """
-    Very simple rule-based signal using MA and RSI.
+    available = source.columns if isinstance(source, pd.DataFrame) else source
+    for col in sorted(rule_set.columns):
+        if col not in available:
+            raise ValueError(f"Required column '{col}' not found in {where}")
+    return {col: np.asarray(source[col], dtype=np.float64) for col in rule_set.columns}
+
+
+@timed("generate_rule_based_signal")
+def generate_rule_based_signal(
+    df: pd.DataFrame,
+    rule_set: Optional[CompiledRuleSet] = None,
+) -> pd.DataFrame:
+    """
+    Rule-based signal from the active rule set (default: close vs MA-20
+    and RSI-14, see src.models.rule_engine).
     signal:
       +1 = BUY
        0 = HOLD
       -1 = SELL
     """
+    rule_set = rule_set or active_rule_set()
     df = df.copy()
 
-    # Ensure required cols exist
-    required_cols = ["close", "ma_20", "rsi_14"]
-    for col in required_cols:
-        if col not in df.columns:
-            raise ValueError(f"Required column '{col}' not found in DataFrame")
-
-    conditions_buy = (df["close"] > df["ma_20"]) & (df["rsi_14"] > 55)
-    conditions_sell = (df["close"] < df["ma_20"]) & (df["rsi_14"] < 45)
-
-    df["signal"] = 0
-    df.loc[conditions_buy, "signal"] = 1
-    df.loc[conditions_sell, "signal"] = -1
+    cols = _rule_columns(df, rule_set, "DataFrame")
+    df["signal"] = rule_set.price_signal(cols, len(df))
 
     return df
 
 
+@timed("generate_combined_signal")
 def generate_combined_signal(
     price_df: pd.DataFrame,
     sentiment_aligned: pd.DataFrame,
     sentiment_col: str = "sentiment_score",
+    rule_set: Optional[CompiledRuleSet] = None,
 ) -> pd.DataFrame:
     """
     Combine price-based signal with sentiment.
@@ -38,12 +58,12 @@ def generate_combined_signal(
     - price_df: must contain 'signal' column from generate_rule_based_signal
     - sentiment_aligned: index-aligned DataFrame with 'sentiment_score'
 
-    Rules (you can tweak later):
+    Rules (the active rule set's sentiment section; defaults):
       sentiment_score > 0.55 -> sentiment_signal = +1
       sentiment_score < 0.45 -> sentiment_signal = -1
       otherwise              -> sentiment_signal = 0
 
-    Combined:
+    Combined ("veto" policy):
       - If sentiment_signal == 0 -> keep price signal
       - If same sign             -> keep that sign
       - If opposite sign         -> flatten to 0 (stay out)
@@ -56,36 +76,51 @@ def generate_combined_signal(
             f"sentiment_aligned must contain '{sentiment_col}' column"
         )
 
+    rule_set = rule_set or active_rule_set()
     df = price_df.copy()
 
     # Attach sentiment_score
     df[sentiment_col] = sentiment_aligned[sentiment_col]
 
-    # Build sentiment signal
-    s = df[sentiment_col].fillna(0.5)  # neutral if missing
-    sentiment_signal = pd.Series(0, index=df.index, dtype=int)
-    sentiment_signal[s > 0.55] = 1
-    sentiment_signal[s < 0.45] = -1
+    # Build sentiment signal (neutral if missing)
+    sentiment_signal = rule_set.sentiment_signal(df[sentiment_col].to_numpy())
 
     df["signal_price"] = df["signal"]
     df["signal_sentiment"] = sentiment_signal
 
-    combined = []
+    df["signal_combined"] = rule_set.combine(df["signal_price"].to_numpy(), sentiment_signal)
 
-    for sp, ss in zip(df["signal_price"], df["signal_sentiment"]):
-        if ss == 0:
-            # sentiment neutral → trust price
-            combined.append(sp)
-        elif sp == 0:
-            # no price signal → can follow sentiment
-            combined.append(ss)
-        elif sp == ss:
-            # both agree
-            combined.append(sp)
-        else:
-            # disagreement → flatten (risk control)
-            combined.append(0)
+    return df
 
-    df["signal_combined"] = combined
 
-    return df
+def generate_rule_based_signal_panel(
+    features: Dict[str, np.ndarray],
+    rule_set: Optional[CompiledRuleSet] = None,
+) -> np.ndarray:
+    """
+    generate_rule_based_signal for a (time x asset) panel.
+
+    - features: arrays from build_panel_features plus the panel's price fields
+    Returns an int8 (time x asset) array; 0 where features are not yet valid.
+    """
+    rule_set = rule_set or active_rule_set()
+    cols = _rule_columns(features, rule_set, "panel")
+    return rule_set.price_signal(cols, features["close"].shape)
+
+
+def generate_combined_signal_panel(
+    price_signal: np.ndarray,
+    sentiment: np.ndarray,
+    rule_set: Optional[CompiledRuleSet] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    generate_combined_signal for a (time x asset) panel.
+    Missing sentiment counts as neutral (0.5).
+    """
+    rule_set = rule_set or active_rule_set()
+    sentiment_signal = rule_set.sentiment_signal(sentiment)
+
+    return {
+        "signal_sentiment": sentiment_signal,
+        "signal_combined": rule_set.combine(price_signal, sentiment_signal),
+    }
@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Tuple
+
+from src.utils.log import get_logger, log_event
+
+
+logger = get_logger("circuit")
+
+
+class CircuitBreaker:
+    """
+    Per-process circuit breaker driven by the recent error rate.
+
+    closed     calls go through; outcomes are kept for `window_seconds`.
+               Trips to open once at least `min_calls` were made in the
+               window and the failure share reaches `failure_rate`.
+    open       calls are refused (allow() is False) for `cooldown_seconds`.
+    half_open  one probe call is let through; success closes the breaker,
+               failure opens it for another cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window_seconds: float = 60.0,
+        cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._calls: Deque[Tuple[float, bool]] = deque()  # (time, ok)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open(self._clock())
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go upstream now. In half-open state only the
+        first caller gets True until its outcome is recorded.
+        """
+        with self._lock:
+            self._maybe_half_open(self._clock())
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                self._calls.clear()
+                self._transition(self.CLOSED)
+                return
+            self._record(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = self._clock()
+            if self._state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                self._open(now)
+                return
+            if self._state == self.OPEN:
+                return
+            self._record(False)
+            failures = sum(1 for _, ok in self._calls if not ok)
+            if len(self._calls) >= self.min_calls and failures / len(self._calls) >= self.failure_rate:
+                self._open(now)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = self._clock()
+            self._maybe_half_open(now)
+            self._trim(now)
+            failures = sum(1 for _, ok in self._calls if not ok)
+            return {
+                "state": self._state,
+                "calls": len(self._calls),
+                "failures": failures,
+            }
+
+    # -- internals (lock held) --
+
+    def _record(self, ok: bool) -> None:
+        now = self._clock()
+        self._calls.append((now, ok))
+        self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        horizon = now - self.window_seconds
+        while self._calls and self._calls[0][0] < horizon:
+            self._calls.popleft()
+
+    def _open(self, now: float) -> None:
+        self._opened_at = now
+        self._calls.clear()
+        self._transition(self.OPEN)
+
+    def _maybe_half_open(self, now: float) -> None:
+        if self._state == self.OPEN and now - self._opened_at >= self.cooldown_seconds:
+            self._transition(self.HALF_OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state != self._state:
+            log_event(logger, logging.WARNING, "circuit.state",
+                      breaker=self.name, old=self._state, new=state)
+            self._state = state
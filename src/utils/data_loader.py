@@ -5,6 +5,9 @@ from typing import List, Optional
 
 import pandas as pd
 
+from src.utils.compact import to_compact
+from src.utils.profiling import timed
+
 
 def list_data_files(
     data_dir: str = "data",
@@ -55,12 +58,15 @@ def _pick_latest_symbol_file(files: List[str], symbol_filter: Optional[str]) ->
     return best or files[-1]
 
 
+@timed("load_price_data")
 def load_price_data(
     data_dir: str = "data",
     symbol_filter: Optional[str] = None,
+    compact: bool = False,
 ) -> pd.DataFrame:
     """
     Load and clean CSVs generated by our yfinance ingestion.
+    compact=True returns the float32 / epoch-seconds layout of src.utils.compact.
 
     Yahoo Finance crypto format includes:
       Row 1: column categories
@@ -115,4 +121,23 @@ def load_price_data(
     combined = pd.concat(dfs)
     combined = combined[~combined.index.duplicated(keep="last")]
     combined = combined.sort_index()
-    return combined
+    return to_compact(combined) if compact else combined
+
+
+def price_data_version(
+    data_dir: str = "data",
+    symbol_filter: Optional[str] = None,
+) -> tuple:
+    """
+    Cheap change token for what load_price_data would read:
+    (path, mtime_ns, size) of each file, without parsing any CSV.
+    """
+    files = list_data_files(data_dir=data_dir, symbol_filter=symbol_filter)
+    latest_path = _pick_latest_symbol_file(files, symbol_filter=symbol_filter)
+    paths = [latest_path] if (symbol_filter and latest_path) else files
+
+    version = []
+    for path in paths:
+        st = os.stat(path)
+        version.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(version)
@@ -0,0 +1,158 @@
+"""
+Structured, sampled, non-blocking logging.
+
+Records go through a QueueHandler onto a background QueueListener, so the
+calling thread only pays for building the record; formatting and stderr
+I/O happen off the request path.
+
+Environment:
+    INTELLPULSE_LOG_LEVEL     DEBUG | INFO (default) | WARNING | ERROR
+    INTELLPULSE_LOG_FORMAT    json (default) | text
+    INTELLPULSE_LOG_SAMPLING  per-event sample rates, e.g.
+                              "sentiment.claude.response=0.01,sentiment.scoring=0.1"
+
+Usage:
+    logger = get_logger("sentiment")
+    log_event(logger, logging.INFO, "sentiment.scoring", count=120, fallbacks=3)
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+
+ROOT_LOGGER = "intellpulse"
+
+_configure_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _parse_sampling(raw: str) -> Dict[str, float]:
+    rates: Dict[str, float] = {}
+    for part in raw.split(","):
+        if "=" not in part:
+            continue
+        event, _, rate = part.partition("=")
+        try:
+            rates[event.strip()] = max(0.0, min(1.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+SAMPLE_RATES: Dict[str, float] = _parse_sampling(os.getenv("INTELLPULSE_LOG_SAMPLING", ""))
+
+
+# ================================================
+#  HANDLERS / FORMATTERS
+# ================================================
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue the record as-is (fields intact), rendering only the traceback,
+    which can't cross the queue as a live exc_info.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, event and the event fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", record.getMessage()),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    "<ts> <LEVEL> <logger> <event> key=value ..." for local development.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        ts = datetime.fromtimestamp(record.created, tz=timezone.utc).strftime("%H:%M:%S.%f")[:-3]
+        event = getattr(record, "event", record.getMessage())
+        fields = " ".join(f"{k}={v}" for k, v in getattr(record, "fields", {}).items())
+        line = f"{ts} {record.levelname:<7s} {record.name} {event} {fields}".rstrip()
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+# ================================================
+#  SETUP
+# ================================================
+
+def configure_logging(
+    level: Optional[str] = None,
+    fmt: Optional[str] = None,
+) -> None:
+    """
+    Attach the queue handler to the 'intellpulse' logger (idempotent).
+    """
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            return
+
+        level = (level or os.getenv("INTELLPULSE_LOG_LEVEL", "INFO")).upper()
+        fmt = (fmt or os.getenv("INTELLPULSE_LOG_FORMAT", "json")).lower()
+
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+
+        q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(level)
+        root.addHandler(_QueueHandler(q))
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(q, stream, respect_handler_level=False)
+        _listener.start()
+        atexit.register(_listener.stop)  # flush pending records on exit
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger under the 'intellpulse' namespace, configuring logging on first use.
+    """
+    configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields: Any) -> None:
+    """
+    Emit a structured event. Disabled levels and sampled-out events return
+    before a record is built.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    rate = SAMPLE_RATES.get(event)
+    if rate is not None and random.random() >= rate:
+        return
+    if rate is not None:
+        fields["sample_rate"] = rate
+    logger.log(level, event, extra={"event": event, "fields": fields})
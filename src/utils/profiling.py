@@ -0,0 +1,183 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes", "y")
+
+
+# Stage timing / metrics collection (INTELLPULSE_METRICS=1)
+METRICS_ENABLED = _env_flag("INTELLPULSE_METRICS")
+# Server-Timing response header (INTELLPULSE_SERVER_TIMING=1, implies metrics)
+SERVER_TIMING_ENABLED = _env_flag("INTELLPULSE_SERVER_TIMING")
+# Per-request cProfile via the X-Debug-Profile header (INTELLPULSE_PROFILING=1)
+PROFILING_ENABLED = _env_flag("INTELLPULSE_PROFILING")
+
+PROFILE_HEADER = "x-debug-profile"
+PROFILE_DIR = os.getenv("INTELLPULSE_PROFILE_DIR", "/tmp/intellpulse-profiles")
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# When False, @timed functions call straight through with one global lookup
+INSTRUMENTATION_ACTIVE = METRICS_ENABLED or SERVER_TIMING_ENABLED or PROFILING_ENABLED
+
+
+# ================================================
+#  PROCESS-WIDE HISTOGRAMS
+# ================================================
+
+class _Histogram:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+
+class _Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str, str], _Histogram] = {}
+
+    def observe(self, metric: str, label: str, value: str, seconds: float) -> None:
+        key = (metric, label, value)
+        with self._lock:
+            hist = self._series.get(key)
+            if hist is None:
+                hist = self._series[key] = _Histogram()
+            hist.observe(seconds)
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (cumulative buckets).
+        """
+        with self._lock:
+            series = sorted(self._series.items())
+            snapshot = [(key, h.count, h.total, list(h.buckets)) for key, h in series]
+
+        lines: List[str] = []
+        seen = set()
+        for (metric, label, value), count, total, buckets in snapshot:
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, buckets):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{{label}="{value}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{label}="{value}",le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{{{label}="{value}"}} {total:.6f}')
+            lines.append(f'{metric}_count{{{label}="{value}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+registry = _Registry()
+
+
+# ================================================
+#  PER-REQUEST STATE
+# ================================================
+
+class RequestTimings:
+    """
+    Stage durations for one request, plus an optional profiler that runs
+    while any instrumented stage is executing.
+    """
+
+    def __init__(self, profile: bool = False) -> None:
+        self.spans: Dict[str, float] = {}
+        self.profile = profile
+        self.profiler: Optional[cProfile.Profile] = None
+        self._depth = 0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={secs * 1000:.2f}" for name, secs in self.spans.items())
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("intellpulse_request_timings", default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time a pipeline stage into the process histograms and the current
+    request's timings (if any).
+    """
+    req = current_timings.get()
+    own_profiler = False
+    if req is not None and req.profile:
+        if req._depth == 0:
+            if req.profiler is None:
+                req.profiler = cProfile.Profile()
+            req.profiler.enable()
+            own_profiler = True
+        req._depth += 1
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if req is not None and req.profile:
+            req._depth -= 1
+            if own_profiler:
+                req.profiler.disable()
+        if METRICS_ENABLED or SERVER_TIMING_ENABLED:
+            registry.observe("intellpulse_stage_seconds", "stage", name, elapsed)
+        if req is not None:
+            req.add(name, elapsed)
+
+
+def timed(stage: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator: run the function inside span(stage) when instrumentation is on.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not INSTRUMENTATION_ACTIVE:
+                return fn(*args, **kwargs)
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> str:
+    return registry.render()
+
+
+def dump_profile(profiler: cProfile.Profile) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profile_id = uuid.uuid4().hex[:12]
+    base = os.path.join(PROFILE_DIR, profile_id)
+    profiler.dump_stats(base + ".prof")
+
+    text = io.StringIO()
+    pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(40)
+    with open(base + ".txt", "w") as f:
+        f.write(text.getvalue())
+    return profile_id
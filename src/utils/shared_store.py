@@ -0,0 +1,171 @@
+"""
+Shared, read-only snapshots of computed frames for multi-worker servers.
+
+One process materializes a frame into a directory of .npy files (one per
+column, plus the index); every worker maps those files with mmap_mode="r",
+so all workers share the same physical pages. Put the root on a tmpfs
+(e.g. /dev/shm) and the snapshots live in shared memory.
+
+Layout under the store root:
+
+    <key>/<tag>/index.npy, c000.npy, c001.npy, ..., meta.json
+    <key>/CURRENT        name of the live <tag> directory
+    <key>/.lock          serializes builders of <key>
+
+A new snapshot is written to a temp directory, renamed into place, then
+published by atomically replacing CURRENT; readers never see a partial
+snapshot, and readers still mapping an older snapshot keep working.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: builders are not serialized across processes
+    fcntl = None
+
+
+KEEP_SNAPSHOTS = 2  # live snapshot + the previous one
+
+
+def version_tag(version: Hashable) -> str:
+    """
+    Filesystem-safe tag for an input version tuple.
+    """
+    return hashlib.sha1(repr(version).encode()).hexdigest()[:16]
+
+
+def write_snapshot(path: str, df: pd.DataFrame) -> None:
+    """
+    Write df as one .npy per column plus index.npy and meta.json.
+    """
+    os.makedirs(path)
+    columns = []
+    for i, name in enumerate(df.columns):
+        fname = f"c{i:03d}.npy"
+        np.save(os.path.join(path, fname), np.ascontiguousarray(df[name].to_numpy()))
+        columns.append([str(name), fname])
+
+    index = df.index
+    if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+        raise ValueError("write_snapshot expects a naive DatetimeIndex")
+    np.save(os.path.join(path, "index.npy"), index.to_numpy())
+
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({"columns": columns, "index_name": index.name, "rows": len(df)}, f)
+
+
+def read_snapshot(path: str) -> pd.DataFrame:
+    """
+    Map a snapshot read-only. The frame's columns are views of the mapped
+    files (no copy); writing to them raises.
+    """
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+
+    def mapped(fname: str) -> np.ndarray:
+        # plain ndarray view of the mapping (np.memmap subclass would leak into pandas)
+        return np.asarray(np.load(os.path.join(path, fname), mmap_mode="r"))
+
+    index = pd.Index(mapped("index.npy"), name=meta["index_name"])
+    data = {name: mapped(fname) for name, fname in meta["columns"]}
+    # copy=False keeps one block per column, each backed by its mapping
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+class SharedFrameStore:
+    """
+    Snapshot store keyed by name (e.g. 'BTC_USD@1h'). get() returns the
+    mapped frame for the requested input version, building and publishing
+    it first if no process has done so yet.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.realpath(root)
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._attached: Dict[str, Tuple[str, pd.DataFrame]] = {}
+
+    def _key_dir(self, key: str) -> str:
+        path = os.path.realpath(os.path.join(self.root, key))
+        if os.path.dirname(path) != self.root:
+            raise ValueError(f"Invalid store key '{key}'")
+        return path
+
+    def current_tag(self, key: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self._key_dir(key), "CURRENT")) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def _build_lock(self, key: str) -> Iterator[None]:
+        os.makedirs(self._key_dir(key), exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self._key_dir(key), ".lock"), "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def publish(self, key: str, tag: str, df: pd.DataFrame) -> None:
+        """
+        Write a snapshot and atomically make it the current one for key.
+        """
+        key_dir = self._key_dir(key)
+        final = os.path.join(key_dir, tag)
+        if not os.path.isdir(final):
+            tmp = os.path.join(key_dir, f".tmp-{uuid.uuid4().hex}")
+            write_snapshot(tmp, df)
+            try:
+                os.rename(tmp, final)
+            except OSError:  # published meanwhile by a process without the lock
+                shutil.rmtree(tmp, ignore_errors=True)
+
+        pointer = os.path.join(key_dir, f".CURRENT-{uuid.uuid4().hex}")
+        with open(pointer, "w") as f:
+            f.write(tag)
+        os.replace(pointer, os.path.join(key_dir, "CURRENT"))
+        self._prune(key, keep=tag)
+
+    def _prune(self, key: str, keep: str) -> None:
+        key_dir = self._key_dir(key)
+        snapshots = [
+            d for d in os.listdir(key_dir)
+            if not d.startswith(".") and d != "CURRENT" and d != keep
+        ]
+        snapshots.sort(key=lambda d: os.path.getmtime(os.path.join(key_dir, d)), reverse=True)
+        # mapped files stay readable after unlink, so old readers are safe
+        for d in snapshots[KEEP_SNAPSHOTS - 1:]:
+            shutil.rmtree(os.path.join(key_dir, d), ignore_errors=True)
+
+    def get(self, key: str, version: Hashable, build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        tag = version_tag(version)
+        with self._lock:
+            attached = self._attached.get(key)
+        if attached is not None and attached[0] == tag:
+            return attached[1]
+
+        if self.current_tag(key) != tag:
+            with self._build_lock(key):
+                # another worker may have published while we waited
+                if self.current_tag(key) != tag:
+                    self.publish(key, tag, build())
+
+        df = read_snapshot(os.path.join(self._key_dir(key), tag))
+        with self._lock:
+            self._attached[key] = (tag, df)
+        return df